@@ -7,7 +7,8 @@ from theatre.models import (
     Play,
     Performance,
     Reservation,
-    Ticket
+    Ticket,
+    SeatHold
 )
 
 
@@ -18,3 +19,4 @@ admin.site.register(Play)
 admin.site.register(Performance)
 admin.site.register(Reservation)
 admin.site.register(Ticket)
+admin.site.register(SeatHold)
@@ -0,0 +1,151 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.urls import URLPattern
+from rest_framework import exceptions
+from rest_framework.response import Response
+
+ASYNC_READ_ROUTES = (
+    "performance-list",
+    "performance-detail",
+    "play-list",
+    "play-detail",
+)
+
+
+async def aauthenticate(request):
+    """
+    Request._authenticate() with every authenticator run in a thread,
+    where it may look up the user
+    """
+    for authenticator in request.authenticators:
+        try:
+            user_auth = await sync_to_async(authenticator.authenticate)(
+                request
+            )
+        except exceptions.APIException:
+            request._not_authenticated()
+            raise
+
+        if user_auth is not None:
+            request._authenticator = authenticator
+            request.user, request.auth = user_auth
+            return
+
+    request._not_authenticated()
+
+
+class AsyncReadMixin:
+    """
+    alist() and aretrieve() of a viewset served by async_read_view(),
+    list() and retrieve() with the page or object fetched by the async
+    ORM. Querysets must select or prefetch everything the serializer
+    reads, lazy queries are not allowed in async code
+    """
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(
+                queryset, request, view=self
+            )
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(
+            [instance async for instance in queryset], many=True
+        )
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        """get_object() with aget()"""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given "
+                f"query."
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+
+async def _adispatch(self, request, *args, **kwargs):
+    """APIView.dispatch() awaiting authentication and the a<action>()"""
+    self.args = args
+    self.kwargs = kwargs
+    request = self.initialize_request(request, *args, **kwargs)
+    self.request = request
+    self.headers = self.default_response_headers
+
+    try:
+        await aauthenticate(request)
+        self.initial(request, *args, **kwargs)
+        response = await getattr(self, f"a{self.action}")(
+            request, *args, **kwargs
+        )
+    except Exception as exc:
+        response = self.handle_exception(exc)
+
+    self.response = self.finalize_response(request, response, *args, **kwargs)
+    return self.response
+
+
+def async_read_view(sync_view):
+    """
+    Async view serving GET and HEAD of a router route with the viewset's
+    a<action>() methods and every other method with the sync view
+    """
+    viewset_class = sync_view.cls
+    initkwargs = sync_view.initkwargs
+    actions = sync_view.actions
+    other_methods = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return await other_methods(request, *args, **kwargs)
+
+        # As ViewSetMixin.as_view() does before dispatch()
+        self = viewset_class(**initkwargs)
+        self.action_map = {"head": actions["get"], **actions}
+        for method, action in self.action_map.items():
+            setattr(self, method, getattr(self, action))
+        self.setup(request, *args, **kwargs)
+        return await _adispatch(self, request, *args, **kwargs)
+
+    view.__name__ = sync_view.__name__
+    view.__doc__ = sync_view.__doc__
+    view.cls = viewset_class
+    view.initkwargs = initkwargs
+    view.actions = actions
+    view.csrf_exempt = True
+    return view
+
+
+def async_reads(urlpatterns, names=ASYNC_READ_ROUTES):
+    """Router urlpatterns with the named routes served by async views"""
+    return [
+        URLPattern(
+            pattern.pattern,
+            async_read_view(pattern.callback),
+            pattern.default_args,
+            pattern.name,
+        )
+        if pattern.name in names
+        else pattern
+        for pattern in urlpatterns
+    ]
@@ -0,0 +1,143 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+CATALOG_VERSION_KEY = "theatre:catalog:version"
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+catalog_cache_stats = CacheStats()
+
+
+def get_catalog_version():
+    return cache.get_or_set(CATALOG_VERSION_KEY, 1, timeout=None)
+
+
+async def aget_catalog_version():
+    return await cache.aget_or_set(CATALOG_VERSION_KEY, 1, timeout=None)
+
+
+def _bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, 2, timeout=None)
+
+
+def invalidate_catalog_cache():
+    """
+    Drop all cached catalog responses now and once more after commit,
+    so a response cached from not yet committed data does not survive
+    """
+    _bump_catalog_version()
+    transaction.on_commit(_bump_catalog_version)
+
+
+def _request_role(request):
+    if request.user.is_staff:
+        return "staff"
+    if request.user.is_authenticated:
+        return "user"
+    return "anonymous"
+
+
+class CatalogCacheMixin:
+    """Cache list and retrieve responses until a catalog model changes"""
+
+    def _catalog_cache_key(self, request):
+        query = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        raw_key = (
+            f"{request.get_host()}|{request.path}|{query}|"
+            f"{_request_role(request)}"
+        )
+        return "theatre:catalog:" + hashlib.md5(raw_key.encode()).hexdigest()
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        key = self._catalog_cache_key(request)
+        version = get_catalog_version()
+        data = cache.get(key, version=version)
+
+        catalog_cache_stats.record(hit=data is not None)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(
+                key,
+                response.data,
+                timeout=settings.THEATRE_CATALOG_CACHE_TIMEOUT,
+                version=version,
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+    async def _acached_response(self, handler, request, *args, **kwargs):
+        """_cached_response() with an async handler and cache calls"""
+        key = self._catalog_cache_key(request)
+        version = await aget_catalog_version()
+        data = await cache.aget(key, version=version)
+
+        catalog_cache_stats.record(hit=data is not None)
+        if data is not None:
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(
+                key,
+                response.data,
+                timeout=settings.THEATRE_CATALOG_CACHE_TIMEOUT,
+                version=version,
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        return await self._acached_response(
+            super().alist, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self._acached_response(
+            super().aretrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,88 @@
+import hashlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalRetrieveMixin:
+    """
+    Answer retrieve requests with ETag/Last-Modified derived from the
+    latest of last_modified_fields, returning 304 for a matching
+    If-None-Match before any serialization
+    """
+
+    # Timestamp fields of the retrieved object, the latest one is used
+    last_modified_fields = None
+
+    def _last_modified_queryset(self):
+        if not self.last_modified_fields:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} must set last_modified_fields to "
+                "use ConditionalRetrieveMixin"
+            )
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.queryset.model.objects.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).values_list(*self.last_modified_fields)
+
+    def get_last_modified(self):
+        """Return when the requested object changed last or None"""
+        try:
+            stamps = self._last_modified_queryset().first()
+        except (ValueError, TypeError):
+            return None
+
+        return max(stamps) if stamps else None
+
+    async def aget_last_modified(self):
+        """get_last_modified() with the async ORM"""
+        try:
+            stamps = await self._last_modified_queryset().afirst()
+        except (ValueError, TypeError):
+            return None
+
+        return max(stamps) if stamps else None
+
+    @staticmethod
+    def _validators(request, last_modified):
+        """ETag and Last-Modified timestamp, the 304 response if matched"""
+        etag = quote_etag(
+            hashlib.md5(
+                f"{request.path}|{request.accepted_media_type}|"
+                f"{last_modified.isoformat()}".encode()
+            ).hexdigest()
+        )
+        last_modified_timestamp = int(last_modified.timestamp())
+
+        # Last-Modified has a one second resolution, a purchase within
+        # the same second would pass If-Modified-Since, so only the
+        # ETag, which keeps the microseconds, can answer 304
+        response = get_conditional_response(request, etag=etag)
+        return etag, last_modified_timestamp, response
+
+    @staticmethod
+    def _set_validators(response, etag, last_modified_timestamp):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified_timestamp)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag, timestamp, response = self._validators(request, last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return self._set_validators(response, etag, timestamp)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        last_modified = await self.aget_last_modified()
+        if last_modified is None:
+            return await super().aretrieve(request, *args, **kwargs)
+
+        etag, timestamp, response = self._validators(request, last_modified)
+        if response is None:
+            response = await super().aretrieve(request, *args, **kwargs)
+        return self._set_validators(response, etag, timestamp)
@@ -0,0 +1,102 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY_PIN_KEY = "theatre:primary-pin:{}"
+CATALOG_PIN = "catalog"
+
+_read_database = ContextVar("theatre_read_database", default=None)
+
+
+def _pin(scope):
+    if not settings.THEATRE_READ_REPLICAS:
+        return
+    # The replica lag starts once the change is committed
+    transaction.on_commit(
+        lambda: cache.set(
+            PRIMARY_PIN_KEY.format(scope),
+            True,
+            timeout=settings.THEATRE_REPLICA_PIN_SECONDS,
+        )
+    )
+
+
+def pin_user_to_primary(user_id):
+    """Read the user's own writes from the primary for a while"""
+    _pin(f"user:{user_id}")
+
+
+def pin_catalog_to_primary():
+    """
+    Read the catalog from the primary for a while, so responses cached
+    right after a change are not built from a lagging replica
+    """
+    _pin(CATALOG_PIN)
+
+
+def pinned_to_primary(user):
+    scopes = [CATALOG_PIN]
+    if user.is_authenticated:
+        scopes.append(f"user:{user.pk}")
+    return bool(
+        cache.get_many([PRIMARY_PIN_KEY.format(scope) for scope in scopes])
+    )
+
+
+class ReplicaRouter:
+    """
+    Send reads of requests marked by ReplicaReadMixin to their replica,
+    all other reads and every write to the primary
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica are saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.THEATRE_READ_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.THEATRE_READ_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests from one of THEATRE_READ_REPLICAS unless
+    read_from_replica() refuses or the user or the catalog is pinned to
+    the primary after a write
+    """
+
+    _read_database_token = None
+
+    def read_from_replica(self, request):
+        return request.method in SAFE_METHODS
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.THEATRE_READ_REPLICAS
+            and self.read_from_replica(request)
+            and not pinned_to_primary(request.user)
+        ):
+            self._read_database_token = _read_database.set(
+                random.choice(settings.THEATRE_READ_REPLICAS)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._read_database_token is not None:
+            _read_database.reset(self._read_database_token)
+            self._read_database_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,89 @@
+import csv
+from datetime import datetime, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from theatre.models import Ticket
+from theatre.scheduling import start_of_day
+
+EXPORT_CHUNK_SIZE = 2000
+
+RESERVATION_EXPORT_FIELDS = {
+    "reservation_id": "reservation_id",
+    "created_at": "reservation__created_at",
+    "user_email": "reservation__user__email",
+    "ticket_id": "id",
+    "row": "row",
+    "seat": "seat",
+    "performance_id": "performance_id",
+    "show_time": "performance__show_time",
+    "play_title": "performance__play__title",
+    "theatre_hall_name": "performance__theatre_hall__name",
+}
+
+
+def reservation_export_rows(date_from=None, date_to=None):
+    """
+    Tuples of RESERVATION_EXPORT_FIELDS, one per ticket of reservations
+    created within the dates, read through a server-side cursor
+    """
+    tickets = Ticket.objects.all()
+    if date_from:
+        tickets = tickets.filter(
+            reservation__created_at__gte=start_of_day(date_from)
+        )
+    if date_to:
+        tickets = tickets.filter(
+            reservation__created_at__lt=start_of_day(
+                date_to + timedelta(days=1)
+            )
+        )
+
+    return (
+        tickets.order_by("reservation_id", "id")
+        .values_list(*RESERVATION_EXPORT_FIELDS.values())
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def jsonl_lines(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(
+            dict(zip(RESERVATION_EXPORT_FIELDS, row))
+        ) + "\n"
+
+
+class _Echo:
+    """File-like object handing written lines back to the caller"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(RESERVATION_EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in row
+        )
+
+
+def batched(lines, size=EXPORT_CHUNK_SIZE):
+    """Join lines into chunks of size lines to stream fewer, larger writes"""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+EXPORT_OUTPUTS = {
+    "jsonl": (jsonl_lines, "application/jsonl"),
+    "csv": (csv_lines, "text/csv"),
+}
@@ -0,0 +1,355 @@
+import csv
+import io
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from theatre.models import (
+    TheatreHall,
+    Genre,
+    Actor,
+    Play,
+    Performance,
+    Reservation,
+    Ticket
+)
+
+LOAD_DATA_PASSWORD = "loadtest"
+LOAD_DATA_EMAIL_DOMAIN = "load.test"
+
+DEFAULT_VOLUMES = {
+    "halls": 20,
+    "genres": 30,
+    "actors": 2_000,
+    "plays": 1_000,
+    "performances": 20_000,
+    "users": 10_000,
+    "tickets": 1_000_000,
+}
+
+SHOW_SPACING = timedelta(hours=3)
+BOOKING_WINDOW_MINUTES = 60 * 24 * 60
+SHOW_DURATIONS = [timedelta(minutes=minutes) for minutes in (90, 120, 150)]
+
+FIRST_NAMES = [
+    "Anna", "Bohdan", "Daria", "Emma", "Ivan", "Kateryna", "Leo", "Maria",
+    "Mykola", "Olena", "Oliver", "Petro", "Sofia", "Taras", "Yuliia",
+    "George", "Lesya", "Nina", "Roman", "Viktor",
+]
+LAST_NAMES = [
+    "Bondarenko", "Clooney", "Hunter", "Kovalenko", "Kravets", "Lysenko",
+    "Melnyk", "Moroz", "Pitt", "Rudenko", "Shevchenko", "Smith", "Stone",
+    "Tkachenko", "Ukrainka", "Williams",
+]
+WORDS = [
+    "autumn", "bridge", "city", "dream", "evening", "forest", "garden",
+    "harbour", "island", "journey", "king", "letter", "mirror", "night",
+    "orchard", "queen", "river", "song", "storm", "summer", "tower",
+    "winter",
+]
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _tickets_per_performance(rng, capacities, tickets):
+    """
+    Sold seat counts of performances with the given capacities, varying
+    around the mean and adding up to exactly tickets
+    """
+    if tickets > sum(capacities):
+        raise ValueError(
+            f"{tickets} tickets do not fit into {sum(capacities)} seats "
+            f"of the performances"
+        )
+
+    if not capacities:
+        return []
+
+    mean = tickets / len(capacities)
+    sold = [
+        min(capacity, max(0, round(mean * rng.uniform(0.5, 1.5))))
+        for capacity in capacities
+    ]
+    remaining = tickets - sum(sold)
+    for index, capacity in enumerate(capacities):
+        if remaining == 0:
+            break
+        change = (
+            min(remaining, capacity - sold[index])
+            if remaining > 0
+            else max(remaining, -sold[index])
+        )
+        sold[index] += change
+        remaining -= change
+    return sold
+
+
+def _seat_map(seats, capacity):
+    data = bytearray((capacity + 7) // 8)
+    for index in seats:
+        data[index // 8] |= 1 << index % 8
+    return bytes(data)
+
+
+def _copy_rows(model, columns, rows):
+    """
+    Insert rows of column values with COPY, which skips compiling every
+    value through the ORM and is several times faster than bulk_create
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH CSV",
+            buffer,
+        )
+
+
+def _create_reservations(rows):
+    """Ids of reservations created from (user_id, created_at) rows"""
+    if connection.vendor != "postgresql":
+        return [
+            reservation.id
+            for reservation in Reservation.objects.bulk_create(
+                Reservation(user_id=user_id) for user_id, _ in rows
+            )
+        ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+            "FROM generate_series(1, %s)",
+            [Reservation._meta.db_table, len(rows)],
+        )
+        ids = [reservation_id for reservation_id, in cursor.fetchall()]
+    _copy_rows(
+        Reservation,
+        ["id", "user_id", "created_at"],
+        ((reservation_id, *row) for reservation_id, row in zip(ids, rows)),
+    )
+    return ids
+
+
+def _create_tickets(rows):
+    """Create tickets from (performance_id, row, seat, reservation_id)"""
+    columns = ["performance_id", "row", "seat", "reservation_id"]
+    if connection.vendor != "postgresql":
+        Ticket.objects.bulk_create(
+            Ticket(**dict(zip(columns, row))) for row in rows
+        )
+    else:
+        _copy_rows(Ticket, columns, rows)
+
+
+def _reservation_groups(rng, seated, max_tickets_per_reservation):
+    """
+    Split the taken seats of each performance into (performance, places)
+    reservations of one to max_tickets_per_reservation (row, seat) places
+    """
+    for performance, seats in seated:
+        seats_in_row = performance.theatre_hall.seats_in_row
+        places = []
+        for index in seats:
+            row, seat = divmod(index, seats_in_row)
+            places.append((row + 1, seat + 1))
+        while places:
+            size = rng.randint(1, max_tickets_per_reservation)
+            yield performance, places[:size]
+            places = places[size:]
+
+
+def seed_load_data(
+    halls=DEFAULT_VOLUMES["halls"],
+    genres=DEFAULT_VOLUMES["genres"],
+    actors=DEFAULT_VOLUMES["actors"],
+    plays=DEFAULT_VOLUMES["plays"],
+    performances=DEFAULT_VOLUMES["performances"],
+    users=DEFAULT_VOLUMES["users"],
+    tickets=DEFAULT_VOLUMES["tickets"],
+    max_tickets_per_reservation=4,
+    seed=0,
+    batch_size=10_000,
+    start=datetime(2024, 1, 1, 10, tzinfo=timezone.utc),
+    log=None,
+):
+    """
+    Generate halls, catalog, schedule, users, reservations and tickets
+    in batches, with bulk_create and COPY for the largest tables on
+    PostgreSQL; the same seed yields the same data.
+    Performances never overlap in a hall, tickets take distinct seats and
+    seat maps and tickets_sold match the tickets
+    """
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    counts = {}
+
+    with transaction.atomic():
+        hall_objects = TheatreHall.objects.bulk_create(
+            TheatreHall(
+                name=f"Hall {number + 1}",
+                rows=rng.randint(10, 30),
+                seats_in_row=rng.randint(15, 40),
+            )
+            for number in range(halls)
+        )
+        genre_ids = [
+            genre.id
+            for genre in Genre.objects.bulk_create(
+                Genre(name=f"{_sentence(rng, 1)} {number + 1}")
+                for number in range(genres)
+            )
+        ]
+        actor_ids = [
+            actor.id
+            for actor in Actor.objects.bulk_create(
+                (
+                    Actor(
+                        first_name=rng.choice(FIRST_NAMES),
+                        last_name=rng.choice(LAST_NAMES),
+                    )
+                    for _ in range(actors)
+                ),
+                batch_size=batch_size,
+            )
+        ]
+        play_ids = [
+            play.id
+            for play in Play.objects.bulk_create(
+                (
+                    Play(
+                        title=f"{_sentence(rng, 3)} {number + 1}",
+                        description=_sentence(rng, 40),
+                    )
+                    for number in range(plays)
+                ),
+                batch_size=batch_size,
+            )
+        ]
+        Play.genres.through.objects.bulk_create(
+            (
+                Play.genres.through(play_id=play_id, genre_id=genre_id)
+                for play_id in play_ids
+                for genre_id in rng.sample(genre_ids, min(genres, 2))
+            ),
+            batch_size=batch_size,
+        )
+        Play.actors.through.objects.bulk_create(
+            (
+                Play.actors.through(play_id=play_id, actor_id=actor_id)
+                for play_id in play_ids
+                for actor_id in rng.sample(
+                    actor_ids, min(actors, rng.randint(2, 8))
+                )
+            ),
+            batch_size=batch_size,
+        )
+        Play.objects.filter(id__in=play_ids).touch()
+        counts.update(halls=halls, genres=genres, actors=actors, plays=plays)
+        log(f"Catalog: {plays} plays, {actors} actors, {genres} genres")
+
+        password = make_password(LOAD_DATA_PASSWORD)
+        user_ids = [
+            user.id
+            for user in get_user_model().objects.bulk_create(
+                (
+                    get_user_model()(
+                        email=f"user{number + 1}@{LOAD_DATA_EMAIL_DOMAIN}",
+                        password=password,
+                    )
+                    for number in range(users)
+                ),
+                batch_size=batch_size,
+            )
+        ]
+        counts["users"] = users
+        log(f"Users: {users}")
+
+        scheduled = [
+            hall_objects[number % halls] for number in range(performances)
+        ]
+        sold = _tickets_per_performance(
+            rng,
+            [hall.rows * hall.seats_in_row for hall in scheduled],
+            tickets,
+        )
+        reservations = 0
+        created = 0
+        for batch in _batches(enumerate(scheduled), batch_size):
+            objects = []
+            seats_by_performance = []
+            for number, hall in batch:
+                capacity = hall.rows * hall.seats_in_row
+                seats = sorted(rng.sample(range(capacity), sold[number]))
+                seats_by_performance.append(seats)
+                objects.append(
+                    Performance(
+                        play_id=rng.choice(play_ids),
+                        theatre_hall=hall,
+                        show_time=start + SHOW_SPACING * (number // halls),
+                        duration=rng.choice(SHOW_DURATIONS),
+                        seat_map=_seat_map(seats, capacity),
+                        tickets_sold=len(seats),
+                    )
+                )
+            Performance.objects.bulk_create(objects)
+
+            groups = _reservation_groups(
+                rng,
+                zip(objects, seats_by_performance),
+                max_tickets_per_reservation,
+            )
+            for group_batch in _batches(
+                groups, max(1, batch_size // max_tickets_per_reservation)
+            ):
+                reservation_ids = _create_reservations(
+                    [
+                        (
+                            rng.choice(user_ids),
+                            performance.show_time - timedelta(
+                                minutes=rng.randint(
+                                    60, BOOKING_WINDOW_MINUTES
+                                )
+                            ),
+                        )
+                        for performance, _ in group_batch
+                    ]
+                )
+                ticket_rows = [
+                    (performance.id, row, seat, reservation_id)
+                    for reservation_id, (performance, places) in zip(
+                        reservation_ids, group_batch
+                    )
+                    for row, seat in places
+                ]
+                _create_tickets(ticket_rows)
+                reservations += len(group_batch)
+                created += len(ticket_rows)
+            log(
+                f"Performances: {batch[-1][0] + 1}/{performances}, "
+                f"tickets: {created}/{tickets}"
+            )
+        counts.update(
+            performances=performances,
+            reservations=reservations,
+            tickets=created,
+        )
+
+    return counts
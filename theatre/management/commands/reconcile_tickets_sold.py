@@ -0,0 +1,51 @@
+from django.core.management import BaseCommand
+from django.db.models import Count
+
+from theatre.models import Performance, Ticket
+from theatre.seat_map import TakenSeatsCount
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate seat maps and tickets_sold counters of performances "
+        "which drifted from their tickets"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted performances",
+        )
+
+    def handle(self, *args, **options):
+        sold_by_performance = dict(
+            Ticket.objects.values_list("performance_id")
+            .annotate(sold=Count("id"))
+            .order_by()
+        )
+        drifted_ids = [
+            performance_id
+            for performance_id, tickets_sold, seats_taken in (
+                Performance.objects.annotate(
+                    seats_taken=TakenSeatsCount("seat_map")
+                )
+                .values_list("id", "tickets_sold", "seats_taken")
+                .iterator()
+            )
+            if not (
+                tickets_sold
+                == (seats_taken or 0)
+                == sold_by_performance.get(performance_id, 0)
+            )
+        ]
+
+        self.stdout.write(f"Drifted performances: {len(drifted_ids)}")
+
+        if drifted_ids and not options["dry_run"]:
+            Performance.objects.filter(id__in=drifted_ids).rebuild_seat_maps()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Reconciled {len(drifted_ids)} performances"
+                )
+            )
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from theatre.load_data import DEFAULT_VOLUMES, seed_load_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate production-scale synthetic data for load tests and "
+        "benchmarks, deterministic for a given seed"
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(
+                f"--{name}",
+                type=int,
+                default=default,
+                help=f"Number of {name} to create (default {default})",
+            )
+        parser.add_argument(
+            "--max-tickets-per-reservation",
+            type=int,
+            default=4,
+            help="Reservations hold 1 to this many tickets",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed, the same seed generates the same data",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Rows per bulk_create batch",
+        )
+
+    def handle(self, *args, **options):
+        volumes = {name: options[name] for name in DEFAULT_VOLUMES}
+        if any(count < 0 for count in volumes.values()):
+            raise CommandError("Volumes must not be negative")
+        if volumes["performances"] and not (
+            volumes["halls"] and volumes["plays"]
+        ):
+            raise CommandError("Performances need halls and plays")
+        if volumes["tickets"] and not volumes["users"]:
+            raise CommandError("Tickets need users")
+        if options["max_tickets_per_reservation"] < 1:
+            raise CommandError("Reservations need at least one ticket")
+
+        start = time.perf_counter()
+        try:
+            counts = seed_load_data(
+                **volumes,
+                max_tickets_per_reservation=options[
+                    "max_tickets_per_reservation"
+                ],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                log=self.stdout.write,
+            )
+        except ValueError as error:
+            raise CommandError(error)
+
+        created = ", ".join(
+            f"{count} {name}" for name, count in counts.items()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} in {time.perf_counter() - start:.1f}s"
+            )
+        )
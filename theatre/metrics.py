@@ -0,0 +1,296 @@
+import bisect
+import hmac
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = {
+    "theatre_request_duration_seconds": (
+        "Total time of sampled requests",
+        DURATION_BUCKETS,
+    ),
+    "theatre_request_db_duration_seconds": (
+        "Time spent in SQL queries of sampled requests",
+        DURATION_BUCKETS,
+    ),
+    "theatre_request_serialize_duration_seconds": (
+        "Time spent building serializer representations of sampled "
+        "requests",
+        DURATION_BUCKETS,
+    ),
+    "theatre_request_render_duration_seconds": (
+        "Time spent rendering responses of sampled requests",
+        DURATION_BUCKETS,
+    ),
+    "theatre_request_queries": (
+        "Number of SQL queries of sampled requests",
+        QUERY_BUCKETS,
+    ),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        """Cumulative (le, count) pairs ending with +Inf"""
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield bound, cumulative
+
+
+class RequestMetrics:
+    """Histograms of sampled requests by view and action"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, view, action, **values):
+        with self._lock:
+            for name, value in values.items():
+                key = (name, view, action)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(HISTOGRAMS[name][1])
+                self._histograms[key].observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def to_prometheus(self):
+        """Histograms in the Prometheus text exposition format"""
+        with self._lock:
+            lines = []
+            for name, (description, _) in HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, view, action), histogram in sorted(
+                    self._histograms.items()
+                ):
+                    if metric != name:
+                        continue
+                    labels = f'view="{view}",action="{action}"'
+                    for bound, count in histogram.samples():
+                        lines.append(
+                            f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+                        )
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(
+                        f"{name}_count{{{labels}}} {histogram.count}"
+                    )
+            return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class _RequestTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db = 0
+        self.serialize = 0
+        self.render = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def serialization_timer(request):
+    """Count the block as serialization time of a sampled request"""
+    timer = getattr(request, "_metrics_timer", None)
+    if timer is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.serialize += time.perf_counter() - start
+
+
+class SerializationTimingMixin:
+    """
+    Count building the representation of get_serializer() serializers,
+    which DRF does inside the view, as serialization time
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if getattr(self.request, "_metrics_timer", None) is None:
+            return serializer
+
+        to_representation = serializer.to_representation
+
+        def timed_to_representation(instance):
+            with serialization_timer(self.request):
+                return to_representation(instance)
+
+        serializer.to_representation = timed_to_representation
+        return serializer
+
+
+def view_and_action(request, view_func):
+    """
+    Name of the view class and the router action serving the request,
+    the HTTP method for views without router actions
+    """
+    view = getattr(view_func, "cls", None)
+    view = view.__name__ if view else view_func.__name__
+    method = request.method.lower()
+    actions = getattr(view_func, "actions", None) or {}
+    return view, actions.get(method, method)
+
+
+def resolved_view(request):
+    """view_and_action() of the resolved URL, unresolved for 404s"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved", "unresolved"
+    return view_and_action(request, match.func)
+
+
+def wrap_connections(wrapper):
+    """
+    ExitStack installing an execute_wrapper on every connection of the
+    current thread, async code enters and closes it in the thread the
+    async ORM runs queries in
+    """
+    stack = ExitStack()
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(wrapper))
+    return stack
+
+
+class RequestMetricsMiddleware:
+    """
+    Record total, SQL, serialization and render time and the SQL query
+    count of a THEATRE_METRICS_SAMPLE_RATE share of requests, tagged by
+    view and action, into request_metrics and a Server-Timing header.
+    Requests that are not sampled only pay for one random() call
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _sampled():
+        sample_rate = settings.THEATRE_METRICS_SAMPLE_RATE
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not self._sampled():
+            return self.get_response(request)
+
+        timer = request._metrics_timer = _RequestTimer()
+        with wrap_connections(timer):
+            response = self.get_response(request)
+        return self._record(request, response, timer)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        timer = request._metrics_timer = _RequestTimer()
+        stack = await sync_to_async(wrap_connections)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._record(request, response, timer)
+
+    @staticmethod
+    def _record(request, response, timer):
+        total = time.perf_counter() - timer.start
+        view, action = resolved_view(request)
+        request_metrics.observe(
+            view,
+            action,
+            theatre_request_duration_seconds=total,
+            theatre_request_db_duration_seconds=timer.db,
+            theatre_request_serialize_duration_seconds=timer.serialize,
+            theatre_request_render_duration_seconds=timer.render,
+            theatre_request_queries=timer.queries,
+        )
+        response["Server-Timing"] = (
+            f'db;dur={timer.db * 1000:.2f};desc="{timer.queries} queries", '
+            f"serialize;dur={timer.serialize * 1000:.2f}, "
+            f"render;dur={timer.render * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        timer = getattr(request, "_metrics_timer", None)
+        if timer is not None:
+            start = time.perf_counter()
+
+            def rendered(response):
+                timer.render = time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+def metrics(request):
+    """
+    Request metrics in the Prometheus text format for scrapers sending
+    THEATRE_METRICS_TOKEN as a bearer token, hidden without a token
+    """
+    token = settings.THEATRE_METRICS_TOKEN
+    if not token:
+        raise Http404
+
+    authorization = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(
+        authorization.encode(), f"Bearer {token}".encode()
+    ):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+
+    return HttpResponse(
+        request_metrics.to_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
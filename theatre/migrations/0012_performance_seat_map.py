@@ -0,0 +1,65 @@
+# Generated by Django 5.0.3 on 2026-10-18 05:44
+
+from django.db import migrations, models
+
+
+def fill_seat_maps(apps, schema_editor):
+    """
+    Set one bit per taken seat, row by row, as theatre.seat_map.SeatMap
+    lays them out. Tickets outside of the current hall grid have no bit
+    and are skipped
+    """
+    Performance = apps.get_model("theatre", "Performance")
+    Ticket = apps.get_model("theatre", "Ticket")
+
+    performances = list(Performance.objects.select_related("theatre_hall"))
+    halls = {
+        performance.id: performance.theatre_hall
+        for performance in performances
+    }
+    bits = dict.fromkeys(halls, 0)
+    tickets = Ticket.objects.values_list("performance_id", "row", "seat")
+
+    for performance_id, row, seat in tickets.iterator():
+        hall = halls[performance_id]
+        if 1 <= row <= hall.rows and 1 <= seat <= hall.seats_in_row:
+            bits[performance_id] |= 1 << (
+                (row - 1) * hall.seats_in_row + (seat - 1)
+            )
+
+    for performance in performances:
+        hall = halls[performance.id]
+        performance.seat_map = bits[performance.id].to_bytes(
+            (hall.rows * hall.seats_in_row + 7) // 8, "little"
+        )
+
+    Performance.objects.bulk_update(
+        performances, ["seat_map"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0011_alter_performance_play_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="ticket",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="performance",
+            name="seat_map",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("performance", "row", "seat"),
+                name="unique_performance_row_seat",
+            ),
+        ),
+        migrations.RunPython(fill_seat_maps, migrations.RunPython.noop),
+    ]
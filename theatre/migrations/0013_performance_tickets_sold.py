@@ -0,0 +1,36 @@
+# Generated by Django 5.0.3 on 2026-10-18 05:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_tickets_sold(apps, schema_editor):
+    Performance = apps.get_model("theatre", "Performance")
+    Ticket = apps.get_model("theatre", "Ticket")
+
+    tickets_count = (
+        Ticket.objects.filter(performance_id=OuterRef("id"))
+        .values("performance_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Performance.objects.update(
+        tickets_sold=Coalesce(Subquery(tickets_count), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0012_performance_seat_map"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_tickets_sold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 05:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0014_seathold"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="genre",
+            index=models.Index(
+                fields=["name", "id"], name="theatre_gen_name_441b3d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["show_time", "id"], name="theatre_per_show_ti_32e341_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="theatre_res_user_id_1c2592_idx",
+            ),
+        ),
+    ]
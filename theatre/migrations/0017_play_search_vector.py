@@ -0,0 +1,39 @@
+# Generated by Django 5.0.3 on 2026-10-18 05:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from theatre.search import play_search_vector
+
+
+def fill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    Play = apps.get_model("theatre", "Play")
+    Play.objects.update(search_vector=play_search_vector(Play))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0016_play_updated_at_performance_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="play",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="play",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="theatre_pla_search__e0c061_gin"
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.0.3 on 2026-10-18 06:29
+
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations, models
+
+from theatre.search import ACTOR_NAME_TRIGRAM_INDEX, actor_full_name
+
+
+def add_trigram_index(apps, schema_editor):
+    """
+    Install pg_trgm and index actor names with it when the server ships
+    the extension, autocomplete falls back to prefix matching otherwise
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        if cursor.fetchone() is None:
+            return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.add_index(
+        apps.get_model("theatre", "Actor"),
+        GinIndex(
+            OpClass(actor_full_name(), name="gin_trgm_ops"),
+            name=ACTOR_NAME_TRIGRAM_INDEX,
+        ),
+    )
+
+
+def remove_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    index_name = schema_editor.quote_name(ACTOR_NAME_TRIGRAM_INDEX)
+    schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0017_play_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="actor",
+            index=models.Index(
+                django.db.models.functions.comparison.Collate(
+                    django.db.models.functions.text.Upper(
+                        django.db.models.functions.comparison.Cast(
+                            "first_name", models.TextField()
+                        )
+                    ),
+                    "C",
+                ),
+                name="theatre_actor_first_key",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="actor",
+            index=models.Index(
+                django.db.models.functions.comparison.Collate(
+                    django.db.models.functions.text.Upper(
+                        django.db.models.functions.comparison.Cast(
+                            "last_name", models.TextField()
+                        )
+                    ),
+                    "C",
+                ),
+                name="theatre_actor_last_key",
+            ),
+        ),
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.3 on 2026-10-18 07:41
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_ends_at(apps, schema_editor):
+    Performance = apps.get_model("theatre", "Performance")
+    Performance.objects.update(ends_at=F("show_time") + F("duration"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0018_actor_autocomplete_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performance",
+            name="duration",
+            field=models.DurationField(
+                default=datetime.timedelta(seconds=7200)
+            ),
+        ),
+        migrations.AddField(
+            model_name="performance",
+            name="ends_at",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="performance",
+            name="ends_at",
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="theatre_per_theatre_2b9613_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:20
+
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields.ranges import (
+    BigIntegerRangeField,
+    DateTimeRangeField,
+)
+from django.db import migrations, models
+
+from theatre.scheduling import HALL_OVERLAP_CONSTRAINT
+
+HALL_OVERLAP = ExclusionConstraint(
+    expressions=[
+        (
+            models.Func(
+                models.F("theatre_hall"),
+                models.F("theatre_hall"),
+                models.Value("[]"),
+                function="int8range",
+                output_field=BigIntegerRangeField(),
+            ),
+            "&&",
+        ),
+        (
+            models.Func(
+                models.F("show_time"),
+                models.F("ends_at"),
+                function="tstzrange",
+                output_field=DateTimeRangeField(),
+            ),
+            "&&",
+        ),
+    ],
+    name=HALL_OVERLAP_CONSTRAINT,
+)
+
+OVERLAPPING_PERFORMANCES = """
+    SELECT performance.id, other.id, performance.theatre_hall_id
+    FROM theatre_performance performance
+    JOIN theatre_performance other
+        ON other.theatre_hall_id = performance.theatre_hall_id
+        AND other.id > performance.id
+        AND other.show_time < performance.ends_at
+        AND other.ends_at > performance.show_time
+    ORDER BY performance.id, other.id
+    LIMIT 20
+"""
+
+
+def check_no_overlaps(apps, schema_editor):
+    """Fail listing double-booked performances the constraint rejects"""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(OVERLAPPING_PERFORMANCES)
+        overlaps = cursor.fetchall()
+
+    if overlaps:
+        raise RuntimeError(
+            "Reschedule overlapping performances before migrating: "
+            + ", ".join(
+                f"{performance_id} and {other_id} in hall {hall_id}"
+                for performance_id, other_id, hall_id in overlaps
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0019_performance_duration_ends_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_no_overlaps, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="performance", constraint=HALL_OVERLAP
+        ),
+    ]
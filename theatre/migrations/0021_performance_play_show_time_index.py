@@ -0,0 +1,20 @@
+# Generated by Django 5.0.3 on 2026-10-18 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0020_performance_hall_overlap_constraint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["play", "show_time", "id"],
+                name="theatre_per_play_id_8615cf_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0021_performance_play_show_time_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="theatrehall",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -1,22 +1,81 @@
 import os
 import uuid
+from collections import defaultdict
+from datetime import timedelta
 
 from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+    TrigramWordSimilarity,
+)
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import UniqueConstraint
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    OuterRef,
+    Q,
+    UniqueConstraint,
+    Value,
+)
+from django.utils import timezone
 from django.utils.text import slugify
 
+from theatre.search import (
+    SEARCH_CONFIG,
+    actor_full_name,
+    name_key,
+    name_key_startswith,
+    play_search_vector,
+    trigram_enabled,
+)
+from theatre.scheduling import (
+    HALL_OVERLAP_CONSTRAINT,
+    hall_span,
+    show_span,
+    start_of_day,
+)
+from theatre.seat_map import SeatMap
+
 
 class TheatreHall(models.Model):
     name = models.CharField(max_length=255)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def capacity(self) -> int:
         return self.rows * self.seats_in_row
 
+    @staticmethod
+    def validate_grid(theatre_hall_id, rows, seats_in_row, error_to_raise):
+        """Reject a grid leaving sold tickets of the hall without a seat"""
+        outside = Ticket.objects.filter(
+            Q(row__gt=rows) | Q(seat__gt=seats_in_row),
+            performance__theatre_hall_id=theatre_hall_id,
+        )
+        if outside.exists():
+            raise error_to_raise(
+                {
+                    "rows": "Sold tickets are outside of the hall range: "
+                    f"({rows}, {seats_in_row})"
+                }
+            )
+
+    def clean(self):
+        if self.pk is not None:
+            TheatreHall.validate_grid(
+                self.pk, self.rows, self.seats_in_row, ValidationError
+            )
+
     def __str__(self):
         return self.name
 
@@ -26,15 +85,76 @@ class Genre(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["name", "id"])]
 
     def __str__(self):
         return self.name
 
 
+class ActorQuerySet(models.QuerySet):
+
+    def autocomplete(self, text, limit=10):
+        """
+        Up to limit actors whose first or last name starts with every
+        word of text, last name matches first, topped up with names
+        resembling text when pg_trgm is installed
+        """
+        words = text.upper().split()
+        if not words:
+            return []
+
+        queryset = self.annotate(
+            first_key=name_key("first_name"),
+            last_key=name_key("last_name"),
+            full_name=actor_full_name(),
+        )
+        other_words = Q()
+        for word in words[1:]:
+            other_words &= (
+                name_key_startswith("first_key", word)
+                | name_key_startswith("last_key", word)
+            )
+        last_name_match = name_key_startswith("last_key", words[0])
+
+        actors = list(
+            queryset.filter(last_name_match, other_words)
+            .order_by("last_key", "first_key", "id")[:limit]
+        )
+        if len(actors) < limit:
+            actors += (
+                queryset.filter(
+                    name_key_startswith("first_key", words[0]), other_words
+                )
+                .exclude(last_name_match)
+                .order_by("first_key", "last_key", "id")[:limit - len(actors)]
+            )
+        if len(actors) < limit and trigram_enabled(self.db):
+            actors += (
+                queryset.filter(full_name__trigram_word_similar=text)
+                .exclude(id__in=[actor.id for actor in actors])
+                .annotate(similarity=TrigramWordSimilarity(text, "full_name"))
+                .order_by("-similarity", "id")[:limit - len(actors)]
+            )
+
+        return actors
+
+
 class Actor(models.Model):
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
 
+    objects = ActorQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                name_key("first_name"), name="theatre_actor_first_key"
+            ),
+            models.Index(
+                name_key("last_name"), name="theatre_actor_last_key"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -46,6 +166,70 @@ def movie_image_file_path(instance, filename):
     return os.path.join("uploads/plays/", filename)
 
 
+class PlayQuerySet(models.QuerySet):
+
+    def touch(self):
+        """Mark plays as changed and refresh their search vectors"""
+        return self.update(
+            updated_at=timezone.now(), search_vector=play_search_vector(Play)
+        )
+
+    def search(self, text):
+        """Full-text search ranked by relevance"""
+        query = SearchQuery(
+            text, search_type="websearch", config=SEARCH_CONFIG
+        )
+        return self.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+
+    def prefetch_names(self):
+        """Prefetch actors and genres in the order their names are listed"""
+        return self.prefetch_related(
+            models.Prefetch(
+                "genres", queryset=Genre.objects.order_by("name", "id")
+            ),
+            models.Prefetch("actors", queryset=Actor.objects.order_by("id")),
+        )
+
+    def with_names(self):
+        """Annotate actor_names and genre_names aggregated in SQL"""
+        return self.annotate(
+            actor_names=ArraySubquery(
+                Actor.objects.filter(plays=OuterRef("pk"))
+                .order_by("id")
+                .values(name=actor_full_name())
+            ),
+            genre_names=ArraySubquery(
+                Genre.objects.filter(plays=OuterRef("pk"))
+                .order_by("name", "id")
+                .values("name")
+            ),
+        )
+
+    def with_related(self, field_name, ids, match_all=False):
+        """
+        Plays linked through the many-to-many field to any of the ids,
+        or to all of them with match_all, filtered by semi-joins so no
+        row is duplicated and no distinct() is needed
+        """
+        field = self.model._meta.get_field(field_name)
+        play = field.m2m_field_name()
+        links = field.remote_field.through.objects.filter(
+            **{f"{field.m2m_reverse_field_name()}_id__in": set(ids)}
+        )
+
+        if not match_all:
+            return self.filter(Exists(links.filter(**{play: OuterRef("pk")})))
+
+        return self.filter(
+            pk__in=links.values(play)
+            .annotate(matches=Count("pk"))
+            .filter(matches=len(set(ids)))
+            .values(play)
+        )
+
+
 class Play(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -56,10 +240,161 @@ class Play(models.Model):
         Genre, related_name="plays", blank=True
     )
     image = models.ImageField(null=True, upload_to=movie_image_file_path)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PlayQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"])]
+
+
+DEFAULT_PERFORMANCE_DURATION = timedelta(hours=2)
+
+
+class PerformanceQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Create performances with ends_at derived as save() would do"""
+        objs = list(objs)
+        for performance in objs:
+            performance.set_ends_at()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def _locked_with_halls(self, performance_ids):
+        return (
+            self.select_for_update(of=("self",))
+            .select_related("theatre_hall")
+            .filter(id__in=performance_ids)
+        )
+
+    @staticmethod
+    def _group_places(places):
+        grouped = defaultdict(list)
+        for performance_id, row, seat in places:
+            grouped[performance_id].append((row, seat))
+        return grouped
+
+    def occupy_seats(self, places, error_to_raise):
+        """
+        Mark (performance_id, row, seat) places as taken in the seat maps,
+        raising error_to_raise if any of them is already taken
+        """
+        grouped = self._group_places(places)
+
+        with transaction.atomic():
+            for performance in self._locked_with_halls(grouped):
+                seats = performance.seats
+                for row, seat in grouped[performance.id]:
+                    if seats.is_taken(row, seat):
+                        raise error_to_raise(
+                            {
+                                "seat": f"Seat (row: {row}, seat: {seat}) "
+                                f"is already taken for performance: "
+                                f"{performance.id}"
+                            }
+                        )
+                    seats.take(row, seat)
+                self.filter(id=performance.id).update(
+                    seat_map=seats.to_bytes(),
+                    tickets_sold=seats.taken_count,
+                    updated_at=timezone.now(),
+                )
+
+    def release_seats(self, places):
+        """Mark (performance_id, row, seat) places as free in the seat maps"""
+        grouped = self._group_places(places)
+
+        with transaction.atomic():
+            for performance in self._locked_with_halls(grouped):
+                seats = performance.seats
+                for row, seat in grouped[performance.id]:
+                    seats.release(row, seat)
+                self.filter(id=performance.id).update(
+                    seat_map=seats.to_bytes(),
+                    tickets_sold=seats.taken_count,
+                    updated_at=timezone.now(),
+                )
+
+    def overlapping(self, theatre_hall_id, start, end):
+        """
+        Performances of a hall overlapping the half-open span start-end,
+        looked up through the GiST index of the exclusion constraint,
+        which makes the overlap guard PostgreSQL-only
+        """
+        return self.alias(
+            hall_span=hall_span(F("theatre_hall")),
+            show_span=show_span(F("show_time"), F("ends_at")),
+        ).filter(
+            hall_span__overlap=hall_span(Value(theatre_hall_id)),
+            show_span__overlap=show_span(Value(start), Value(end)),
+        )
+
+    def between_dates(self, date_from=None, date_to=None):
+        """
+        Performances from the start of date_from to the end of date_to in
+        the current time zone, as a half-open show_time range an index can
+        serve rather than a cast of every show_time
+        """
+        queryset = self
+        if date_from:
+            queryset = queryset.filter(show_time__gte=start_of_day(date_from))
+        if date_to:
+            queryset = queryset.filter(
+                show_time__lt=start_of_day(date_to + timedelta(days=1))
+            )
+        return queryset
+
+    def on_date(self, date):
+        return self.between_dates(date, date)
+
+    def upcoming(self):
+        return self.filter(show_time__gte=timezone.now())
+
+    def booked_in_hall(self, theatre_hall_id, start, end):
+        """(id, show_time, ends_at) of hall performances overlapping a span"""
+        return self.overlapping(theatre_hall_id, start, end).values_list(
+            "id", "show_time", "ends_at"
+        )
+
+    def rebuild_seat_maps(self):
+        """Recompute seat maps of the performances from their tickets"""
+        with transaction.atomic():
+            performances = list(
+                self.select_for_update(of=("self",)).select_related(
+                    "theatre_hall"
+                )
+            )
+            seat_maps = {
+                performance.id: SeatMap(
+                    performance.theatre_hall.rows,
+                    performance.theatre_hall.seats_in_row,
+                )
+                for performance in performances
+            }
+            tickets = Ticket.objects.filter(
+                performance_id__in=seat_maps
+            ).values_list("performance_id", "row", "seat")
+
+            for performance_id, row, seat in tickets.iterator():
+                seats = seat_maps[performance_id]
+                if 1 <= row <= seats.rows and 1 <= seat <= seats.seats_in_row:
+                    seats.take(row, seat)
+
+            now = timezone.now()
+            for performance in performances:
+                seats = seat_maps[performance.id]
+                performance.seat_map = seats.to_bytes()
+                performance.tickets_sold = seats.taken_count
+                performance.updated_at = now
+
+            Performance.objects.bulk_update(
+                performances, ["seat_map", "tickets_sold", "updated_at"]
+            )
+
 
 class Performance(models.Model):
     play = models.ForeignKey(
@@ -73,12 +408,61 @@ class Performance(models.Model):
         related_name="performances"
     )
     show_time = models.DateTimeField()
+    duration = models.DurationField(default=DEFAULT_PERFORMANCE_DURATION)
+    ends_at = models.DateTimeField(editable=False)
+    seat_map = models.BinaryField(default=b"")
+    tickets_sold = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PerformanceQuerySet.as_manager()
+
+    @property
+    def seats(self) -> SeatMap:
+        return SeatMap(
+            self.theatre_hall.rows,
+            self.theatre_hall.seats_in_row,
+            self.seat_map,
+        )
+
+    def set_ends_at(self):
+        """Derive ends_at from show_time and duration"""
+        show_time = self._meta.get_field("show_time").to_python(
+            self.show_time
+        )
+        duration = self._meta.get_field("duration").to_python(self.duration)
+        self.ends_at = show_time + duration
+
+    def save(self, *args, **kwargs):
+        self.set_ends_at()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"show_time", "duration"} & set(
+            update_fields
+        ):
+            kwargs["update_fields"] = {*update_fields, "ends_at"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.play.title} {str(self.show_time)}"
 
     class Meta:
         ordering = ["show_time"]
+        indexes = [
+            models.Index(fields=["show_time", "id"]),
+            models.Index(fields=["theatre_hall", "show_time"]),
+            models.Index(fields=["play", "show_time", "id"]),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name=HALL_OVERLAP_CONSTRAINT,
+                expressions=[
+                    (hall_span(F("theatre_hall")), RangeOperators.OVERLAPS),
+                    (
+                        show_span(F("show_time"), F("ends_at")),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+            ),
+        ]
 
 
 class Reservation(models.Model):
@@ -94,6 +478,7 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [models.Index(fields=["user", "created_at", "id"])]
 
 
 class Ticket(models.Model):
@@ -156,3 +541,32 @@ class Ticket(models.Model):
             )
         ]
         ordering = ["row", "seat"]
+
+
+class SeatHold(models.Model):
+    token = models.UUIDField(db_index=True)
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return (
+            f"{str(self.performance)} (row: {self.row}, seat: {self.seat}) "
+            f"until {self.expires_at}"
+        )
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["performance", "row", "seat"],
+                name="unique_performance_row_seat_hold"
+            )
+        ]
@@ -1,6 +1,42 @@
-from rest_framework.pagination import PageNumberPagination
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
 
 
-class ReservationPagination(PageNumberPagination):
+class AsyncCursorPagination(CursorPagination):
+    """Cursor pagination with apaginate_queryset() for async views"""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() run in a thread, where it fetches the page"""
+        return await sync_to_async(self.paginate_queryset)(
+            queryset, request, view
+        )
+
+
+class CatalogPagination(AsyncCursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "id"
+
+
+class PlayPagination(CatalogPagination):
+
+    def get_ordering(self, request, queryset, view):
+        if "rank" in queryset.query.annotations:
+            return ("-rank", "id")
+        return super().get_ordering(request, queryset, view)
+
+
+class GenrePagination(CatalogPagination):
+    ordering = ("name", "id")
+
+
+class PerformancePagination(CatalogPagination):
+    ordering = ("show_time", "id")
+
+
+class ReservationPagination(CursorPagination):
     page_size = 10
+    page_size_query_param = "page_size"
     max_page_size = 100
+    ordering = ("created_at", "id")
@@ -0,0 +1,158 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+
+from theatre.metrics import resolved_view, wrap_connections
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NPlusOneQueries(Exception):
+    """Raised in raise mode when one request repeats a query shape"""
+
+
+def fingerprint(sql):
+    """
+    Shape of a statement: literals and parameters become ?, IN lists
+    and multi-row VALUES collapse, so the same query for different
+    objects or batch sizes has the same fingerprint
+    """
+    sql = _WHITESPACE.sub(" ", sql.strip())
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _VALUES_ROWS.sub(r"\1, ...", sql)
+
+
+class QueryDetector:
+    """
+    execute_wrapper counting SELECT fingerprints to find N+1 queries and
+    logging statements slower than THEATRE_SLOW_QUERY_MS
+    """
+
+    def __init__(self, view="unresolved", request=None):
+        self._view = view
+        self.request = request
+        self.fingerprints = Counter()
+        self.slow_ms = settings.THEATRE_SLOW_QUERY_MS
+        self.repeat_threshold = settings.THEATRE_N_PLUS_ONE_THRESHOLD
+
+    @property
+    def view(self):
+        """The view and action serving the request once it is resolved"""
+        if getattr(self.request, "resolver_match", None) is None:
+            return self._view
+        return ".".join(resolved_view(self.request))
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if sql.lstrip()[:6].upper() == "SELECT":
+                self.fingerprints[fingerprint(sql)] += 1
+            if duration_ms >= self.slow_ms:
+                logger.warning(
+                    "Slow query %.1fms in %s: %s", duration_ms, self.view, sql
+                )
+
+    def repeated(self):
+        """Fingerprints executed at least repeat_threshold times"""
+        return {
+            sql: count
+            for sql, count in self.fingerprints.items()
+            if count >= self.repeat_threshold
+        }
+
+    def check(self, mode):
+        repeated = self.repeated()
+        if not repeated:
+            return
+
+        message = f"N+1 queries in {self.view}: " + "; ".join(
+            f"{count}x {sql}" for sql, count in repeated.items()
+        )
+        if mode == "raise":
+            raise NPlusOneQueries(message)
+        logger.warning(message)
+
+
+@contextmanager
+def detect_queries(view="unresolved", mode="raise"):
+    """Detect N+1 and slow queries on every connection inside the block"""
+    detector = QueryDetector(view)
+    with wrap_connections(detector):
+        yield detector
+    detector.check(mode)
+
+
+class QueryDetectorMiddleware:
+    """
+    Detect N+1 and slow queries of a THEATRE_QUERY_DETECTOR_SAMPLE_RATE
+    share of requests when THEATRE_QUERY_DETECTOR is "log" or "raise"
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _mode():
+        """The detector mode of this request, "off" when not sampled"""
+        mode = settings.THEATRE_QUERY_DETECTOR
+        if mode == "off" or (
+            random.random() >= settings.THEATRE_QUERY_DETECTOR_SAMPLE_RATE
+        ):
+            return "off"
+        return mode
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        mode = self._mode()
+        if mode == "off":
+            return self.get_response(request)
+
+        detector = QueryDetector(request=request)
+        with wrap_connections(detector):
+            response = self.get_response(request)
+        detector.check(mode)
+        return response
+
+    async def __acall__(self, request):
+        mode = self._mode()
+        if mode == "off":
+            return await self.get_response(request)
+
+        detector = QueryDetector(request=request)
+        stack = await sync_to_async(wrap_connections)(detector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        detector.check(mode)
+        return response
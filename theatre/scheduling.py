@@ -0,0 +1,161 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.postgres.fields import (
+    BigIntegerRangeField,
+    DateTimeRangeField,
+)
+from django.db.models import Func, Value
+from django.utils import timezone
+
+DAILY = "daily"
+WEEKLY = "weekly"
+HALL_OVERLAP_CONSTRAINT = "theatre_performance_hall_overlap"
+
+
+def start_of_day(date):
+    """
+    First instant of a date in the current time zone, also on days a DST
+    change skips or repeats midnight
+    """
+    return timezone.make_aware(datetime.combine(date, time.min))
+
+
+def hall_span(theatre_hall):
+    """
+    Single value int8range of a hall id, lets the GiST exclusion
+    constraint compare halls without the btree_gist extension
+    """
+    return Func(
+        theatre_hall,
+        theatre_hall,
+        Value("[]"),
+        function="int8range",
+        output_field=BigIntegerRangeField(),
+    )
+
+
+def show_span(start, end):
+    """Half-open tstzrange a performance occupies its hall for"""
+    return Func(
+        start, end, function="tstzrange", output_field=DateTimeRangeField()
+    )
+
+
+def recurring_show_times(
+    start, frequency, interval=1, weekdays=None, until=None, count=None,
+    limit=None,
+):
+    """
+    Show times repeating the wall clock time of start in the current time
+    zone, so they stay at the same local hour across DST changes; stops
+    at until, after count show times or after limit + 1 of them
+    """
+    local_start = timezone.localtime(start)
+    show_time_of_day = local_start.time()
+    if frequency == WEEKLY:
+        weekdays = sorted(set(weekdays or [local_start.weekday()]))
+        period_start = local_start.date() - timedelta(
+            days=local_start.weekday()
+        )
+        step = timedelta(weeks=interval)
+    else:
+        weekdays = None
+        period_start = local_start.date()
+        step = timedelta(days=interval)
+
+    if until is None and count is None:
+        raise ValueError("Either until or count must be given")
+
+    max_count = count
+    if limit is not None and (max_count is None or max_count > limit):
+        max_count = limit + 1
+
+    show_times = []
+    while True:
+        dates = (
+            [period_start + timedelta(days=day) for day in weekdays]
+            if weekdays is not None
+            else [period_start]
+        )
+        for date in dates:
+            if date < local_start.date():
+                continue
+            show_time = timezone.make_aware(
+                datetime.combine(date, show_time_of_day)
+            )
+            if until and show_time > until:
+                return show_times
+            show_times.append(show_time)
+            if max_count and len(show_times) >= max_count:
+                return show_times
+        period_start += step
+
+
+class IntervalTree:
+    """
+    Static interval tree over (key, start, end) items: sorted by start and
+    laid out as an implicit balanced tree whose nodes also keep the
+    latest end in their subtree
+    """
+
+    def __init__(self, items):
+        self._items = sorted(items, key=lambda item: item[1])
+        self._max_ends = [None] * len(self._items)
+        if self._items:
+            self._build(0, len(self._items) - 1)
+
+    def _build(self, low, high):
+        middle = (low + high) // 2
+        max_end = self._items[middle][2]
+        if low < middle:
+            max_end = max(max_end, self._build(low, middle - 1))
+        if middle < high:
+            max_end = max(max_end, self._build(middle + 1, high))
+        self._max_ends[middle] = max_end
+        return max_end
+
+    def find(self, start, end):
+        """Key of an item overlapping the half-open span, or None"""
+        spans = [(0, len(self._items) - 1)] if self._items else []
+        while spans:
+            low, high = spans.pop()
+            middle = (low + high) // 2
+            if self._max_ends[middle] <= start:
+                continue
+            key, item_start, item_end = self._items[middle]
+            if item_start < end and item_end > start:
+                return key
+            if low < middle:
+                spans.append((low, middle - 1))
+            if middle < high and item_start < end:
+                spans.append((middle + 1, high))
+        return None
+
+
+def find_overlaps(intervals, booked):
+    """
+    Map indexes of half-open (start, end) intervals to a description of
+    something they overlap: a booked (id, start, end) or another interval
+    """
+    overlaps = {}
+
+    booked = IntervalTree(booked)
+    for index, (start, end) in enumerate(intervals):
+        booked_id = booked.find(start, end)
+        if booked_id is not None:
+            overlaps[index] = f"performance {booked_id}"
+
+    order = sorted(range(len(intervals)), key=lambda index: intervals[index])
+    latest = None
+    for position, index in enumerate(order):
+        start, end = intervals[index]
+        if latest is not None and intervals[latest][1] > start:
+            overlaps.setdefault(index, f"show time #{latest}")
+        if position + 1 < len(order):
+            following = order[position + 1]
+            if intervals[following][0] < end:
+                overlaps.setdefault(index, f"show time #{following}")
+        if latest is None or end > intervals[latest][1]:
+            latest = index
+
+    return overlaps
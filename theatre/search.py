@@ -0,0 +1,92 @@
+from functools import lru_cache
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import connections
+from django.db.models import Func, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce, Collate, Concat, Upper
+
+SEARCH_CONFIG = "english"
+ACTOR_NAME_TRIGRAM_INDEX = "theatre_actor_name_trgm"
+# Sorts after any continuation of a name in "C" collation
+NAME_KEY_CEILING = "\U0010ffff"
+
+
+def _related_names(through_model, name_expression):
+    return Coalesce(
+        Subquery(
+            through_model.objects.filter(play_id=OuterRef("pk"))
+            .values("play_id")
+            .annotate(names=StringAgg(name_expression, delimiter=" "))
+            .values("names")
+        ),
+        Value(""),
+        output_field=TextField(),
+    )
+
+
+def play_search_vector(play_model):
+    """
+    Weighted search vector over title, actor names, genre names and
+    description of a play, usable in Play queryset update()
+    """
+    actor_names = _related_names(
+        play_model.actors.through,
+        Concat(
+            "actor__first_name",
+            Value(" "),
+            "actor__last_name",
+            output_field=TextField(),
+        ),
+    )
+    genre_names = _related_names(play_model.genres.through, "genre__name")
+
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(actor_names, weight="B", config=SEARCH_CONFIG)
+        + SearchVector(genre_names, weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def actor_full_name():
+    """
+    "First Last" name of an actor built with immutable operators only,
+    so the same expression can back an index
+    """
+    return Func(
+        Cast("first_name", TextField()),
+        Value(" "),
+        Cast("last_name", TextField()),
+        template="(%(expressions)s)",
+        arg_joiner=" || ",
+        output_field=TextField(),
+    )
+
+
+def name_key(field_name):
+    """
+    Upper-cased name in "C" collation, an index on it serves both prefix
+    ranges and ordering of the matches
+    """
+    return Collate(Upper(Cast(field_name, TextField())), "C")
+
+
+def name_key_startswith(key, prefix):
+    """Match a name_key annotation starting with an upper-cased prefix"""
+    return Q(**{
+        f"{key}__gte": prefix,
+        f"{key}__lt": prefix + NAME_KEY_CEILING,
+    })
+
+
+@lru_cache
+def trigram_enabled(using="default"):
+    """Whether the pg_trgm extension is installed in the database"""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
@@ -0,0 +1,219 @@
+import abc
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import IntegrityError, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from theatre.models import SeatHold
+
+
+class SeatHoldConflict(Exception):
+    def __init__(self, places):
+        super().__init__(f"Seats are not available: {places}")
+        self.places = places
+
+
+@dataclass(frozen=True)
+class Hold:
+    token: uuid.UUID
+    performance_id: int
+    user_id: int
+    places: tuple
+    expires_at: datetime
+
+    @property
+    def seats(self):
+        return [{"row": row, "seat": seat} for row, seat in self.places]
+
+
+class BaseSeatHoldStore(abc.ABC):
+    """Temporary locks on (row, seat) places of a performance"""
+
+    @abc.abstractmethod
+    def hold(self, performance_id, places, user_id, duration) -> Hold:
+        """Hold all places for the user or raise SeatHoldConflict"""
+
+    @abc.abstractmethod
+    def get(self, token):
+        """Return a not expired Hold by its token or None"""
+
+    @abc.abstractmethod
+    def release(self, token):
+        """Drop the hold, unknown tokens are ignored"""
+
+    @abc.abstractmethod
+    def held_by_others(self, performance_id, places, user_id):
+        """Return places which are held by other users"""
+
+
+class InMemorySeatHoldStore(BaseSeatHoldStore):
+    """Process-local store, suitable for a single worker and tests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._holds = {}
+        self._tokens_by_place = {}
+
+    def _active_hold(self, performance_id, place, now):
+        token = self._tokens_by_place.get((performance_id, *place))
+        hold = self._holds.get(token)
+        if hold is None or hold.expires_at <= now:
+            return None
+        return hold
+
+    def _discard(self, hold):
+        self._holds.pop(hold.token, None)
+        for place in hold.places:
+            key = (hold.performance_id, *place)
+            if self._tokens_by_place.get(key) == hold.token:
+                del self._tokens_by_place[key]
+
+    def hold(self, performance_id, places, user_id, duration):
+        places = tuple(places)
+        now = timezone.now()
+        with self._lock:
+            conflicts = [
+                place
+                for place in places
+                if self._active_hold(performance_id, place, now)
+            ]
+            if conflicts:
+                raise SeatHoldConflict(conflicts)
+
+            hold = Hold(
+                token=uuid.uuid4(),
+                performance_id=performance_id,
+                user_id=user_id,
+                places=places,
+                expires_at=now + duration,
+            )
+            self._holds[hold.token] = hold
+            for place in places:
+                self._tokens_by_place[(performance_id, *place)] = hold.token
+            return hold
+
+    def get(self, token):
+        with self._lock:
+            hold = self._holds.get(token)
+            if hold is None:
+                return None
+            if hold.expires_at <= timezone.now():
+                self._discard(hold)
+                return None
+            return hold
+
+    def release(self, token):
+        with self._lock:
+            hold = self._holds.get(token)
+            if hold is not None:
+                self._discard(hold)
+
+    def held_by_others(self, performance_id, places, user_id):
+        now = timezone.now()
+        with self._lock:
+            return [
+                place
+                for place in places
+                if (hold := self._active_hold(performance_id, place, now))
+                and hold.user_id != user_id
+            ]
+
+
+class DatabaseSeatHoldStore(BaseSeatHoldStore):
+    """Store shared by all workers, backed by the SeatHold table"""
+
+    @staticmethod
+    def _to_hold(seat_holds):
+        first = seat_holds[0]
+        return Hold(
+            token=first.token,
+            performance_id=first.performance_id,
+            user_id=first.user_id,
+            places=tuple((item.row, item.seat) for item in seat_holds),
+            expires_at=first.expires_at,
+        )
+
+    def hold(self, performance_id, places, user_id, duration):
+        places = tuple(places)
+        expires_at = timezone.now() + duration
+        token = uuid.uuid4()
+        seat_holds = [
+            SeatHold(
+                token=token,
+                performance_id=performance_id,
+                row=row,
+                seat=seat,
+                user_id=user_id,
+                expires_at=expires_at,
+            )
+            for row, seat in places
+        ]
+
+        with transaction.atomic():
+            for attempt in range(2):
+                now = timezone.now()
+                SeatHold.objects.filter(
+                    performance_id=performance_id, expires_at__lte=now
+                ).delete()
+                try:
+                    with transaction.atomic():
+                        SeatHold.objects.bulk_create(seat_holds)
+                    break
+                except IntegrityError:
+                    held = set(
+                        SeatHold.objects.filter(
+                            performance_id=performance_id, expires_at__gt=now
+                        ).values_list("row", "seat")
+                    )
+                    conflicting = [place for place in places if place in held]
+                    # The conflicting hold expired or was released since
+                    # the insert, which then gets one more try
+                    if conflicting or attempt:
+                        raise SeatHoldConflict(conflicting or list(places))
+
+        return self._to_hold(seat_holds)
+
+    def get(self, token):
+        seat_holds = list(
+            SeatHold.objects.filter(
+                token=token, expires_at__gt=timezone.now()
+            ).order_by("row", "seat")
+        )
+        return self._to_hold(seat_holds) if seat_holds else None
+
+    def release(self, token):
+        SeatHold.objects.filter(token=token).delete()
+
+    def held_by_others(self, performance_id, places, user_id):
+        held = set(
+            SeatHold.objects.filter(
+                performance_id=performance_id,
+                expires_at__gt=timezone.now(),
+            )
+            .exclude(user_id=user_id)
+            .values_list("row", "seat")
+        )
+        return [place for place in places if tuple(place) in held]
+
+
+@lru_cache(maxsize=None)
+def get_seat_hold_store() -> BaseSeatHoldStore:
+    return import_string(settings.THEATRE_SEAT_HOLD_STORE)()
+
+
+def get_seat_hold_duration() -> timedelta:
+    return timedelta(minutes=settings.THEATRE_SEAT_HOLD_MINUTES)
+
+
+@receiver(setting_changed)
+def reset_seat_hold_store(setting, **kwargs):
+    if setting == "THEATRE_SEAT_HOLD_STORE":
+        get_seat_hold_store.cache_clear()
@@ -0,0 +1,64 @@
+from django.db.models import Func, IntegerField
+
+
+class SeatMap:
+    """Bitset of the taken seats of a performance, one bit per seat"""
+
+    def __init__(self, rows, seats_in_row, data=b""):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self._bits = int.from_bytes(data or b"", "little")
+
+    @property
+    def capacity(self) -> int:
+        return self.rows * self.seats_in_row
+
+    @property
+    def taken_count(self) -> int:
+        return self._bits.bit_count()
+
+    @property
+    def available(self) -> int:
+        return self.capacity - self.taken_count
+
+    def _index(self, row, seat):
+        if not (1 <= row <= self.rows and 1 <= seat <= self.seats_in_row):
+            raise ValueError(
+                f"Seat (row: {row}, seat: {seat}) is out of "
+                f"hall range: ({self.rows}, {self.seats_in_row})"
+            )
+        return (row - 1) * self.seats_in_row + (seat - 1)
+
+    def is_taken(self, row, seat) -> bool:
+        return bool(self._bits >> self._index(row, seat) & 1)
+
+    def is_free(self, row, seat) -> bool:
+        return not self.is_taken(row, seat)
+
+    def take(self, row, seat):
+        self._bits |= 1 << self._index(row, seat)
+
+    def release(self, row, seat):
+        self._bits &= ~(1 << self._index(row, seat))
+
+    def taken_places(self):
+        """Return taken seats ordered by row and seat"""
+        places = []
+        bits = self._bits
+        while bits:
+            lowest_bit = bits & -bits
+            index = lowest_bit.bit_length() - 1
+            row, seat = divmod(index, self.seats_in_row)
+            places.append({"row": row + 1, "seat": seat + 1})
+            bits ^= lowest_bit
+        return places
+
+    def to_bytes(self) -> bytes:
+        return self._bits.to_bytes((self.capacity + 7) // 8, "little")
+
+
+class TakenSeatsCount(Func):
+    """Number of taken seats in a seat map column (PostgreSQL 14+)"""
+
+    function = "BIT_COUNT"
+    output_field = IntegerField()
@@ -1,8 +1,15 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from theatre.exports import EXPORT_OUTPUTS
 from theatre.models import (
+    DEFAULT_PERFORMANCE_DURATION,
     TheatreHall,
     Genre,
     Actor,
@@ -11,13 +18,34 @@ from theatre.models import (
     Reservation,
     Ticket
 )
+from theatre.scheduling import (
+    DAILY,
+    WEEKLY,
+    find_overlaps,
+    recurring_show_times,
+)
+from theatre.seat_holds import (
+    SeatHoldConflict,
+    get_seat_hold_store,
+    get_seat_hold_duration,
+)
 
 
 class TheatreHallSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TheatreHall
-        fields = "__all__"
+        fields = ("id", "name", "rows", "seats_in_row")
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            TheatreHall.validate_grid(
+                self.instance.pk,
+                attrs.get("rows", self.instance.rows),
+                attrs.get("seats_in_row", self.instance.seats_in_row),
+                ValidationError,
+            )
+        return attrs
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -34,6 +62,19 @@ class ActorSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class ActorAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=10)
+
+
+class ActorAutocompleteSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source="full_name")
+
+    class Meta:
+        model = Actor
+        fields = ("id", "name")
+
+
 class PlaySerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -64,23 +105,260 @@ class PlayImageSerializer(serializers.ModelSerializer):
 
 class PlayListSerializer(serializers.ModelSerializer):
 
-    actors = serializers.StringRelatedField(
-        many=True, read_only=True
-    )
-    genres = serializers.StringRelatedField(
-        many=True, read_only=True
-    )
+    actors = serializers.SerializerMethodField()
+    genres = serializers.SerializerMethodField()
+
+    values_fields = ("id", "title", "description")
 
     class Meta:
         model = Play
         fields = ("id", "title", "description", "actors", "genres")
 
+    @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    def get_actors(self, obj):
+        if hasattr(obj, "actor_names"):
+            return obj.actor_names
+        return [str(actor) for actor in obj.actors.all()]
+
+    @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    def get_genres(self, obj):
+        if hasattr(obj, "genre_names"):
+            return obj.genre_names
+        return [str(genre) for genre in obj.genres.all()]
+
+    @staticmethod
+    def _fetch_names(rows):
+        """Actor and genre names of values() rows, fetched for all at once"""
+        play_ids = [row["id"] for row in rows]
+        actors = defaultdict(list)
+        genres = defaultdict(list)
+
+        for play_id, first_name, last_name in (
+            Play.actors.through.objects.filter(play_id__in=play_ids)
+            .order_by("actor_id")
+            .values_list("play_id", "actor__first_name", "actor__last_name")
+        ):
+            actors[play_id].append(f"{first_name} {last_name}")
+
+        for play_id, name in (
+            Play.genres.through.objects.filter(play_id__in=play_ids)
+            .order_by("genre__name", "genre_id")
+            .values_list("play_id", "genre__name")
+        ):
+            genres[play_id].append(name)
+
+        return [
+            {
+                **row,
+                "actor_names": actors[row["id"]],
+                "genre_names": genres[row["id"]],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def values_to_representation(rows):
+        """Representation of values() rows, with_names() ones or not"""
+        rows = list(rows)
+        if rows and "actor_names" not in rows[0]:
+            rows = PlayListSerializer._fetch_names(rows)
+
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+                "actors": row["actor_names"],
+                "genres": row["genre_names"],
+            }
+            for row in rows
+        ]
+
+
+def _hall_overlaps(theatre_hall, intervals, exclude_id=None):
+    """
+    Lock the hall until the end of the transaction and map indexes of
+    (start, end) intervals to what they overlap in it
+    """
+    TheatreHall.objects.select_for_update().get(id=theatre_hall.id)
+
+    performances = Performance.objects.all()
+    if exclude_id is not None:
+        performances = performances.exclude(id=exclude_id)
+    return find_overlaps(
+        intervals,
+        performances.booked_in_hall(
+            theatre_hall.id,
+            min(start for start, _ in intervals),
+            max(end for _, end in intervals),
+        ),
+    )
+
 
 class PerformanceSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Performance
-        fields = ("id", "show_time", "play", "theatre_hall")
+        fields = ("id", "show_time", "duration", "play", "theatre_hall")
+        extra_kwargs = {"duration": {"min_value": timedelta(minutes=1)}}
+
+    def _check_hall_is_free(self, validated_data):
+        instance = self.instance
+        theatre_hall = validated_data.get(
+            "theatre_hall", instance and instance.theatre_hall
+        )
+        show_time = validated_data.get(
+            "show_time", instance and instance.show_time
+        )
+        duration = validated_data.get(
+            "duration",
+            instance.duration if instance else DEFAULT_PERFORMANCE_DURATION,
+        )
+
+        overlaps = _hall_overlaps(
+            theatre_hall,
+            [(show_time, show_time + duration)],
+            exclude_id=instance and instance.id,
+        )
+        if overlaps:
+            raise ValidationError(
+                {
+                    "show_time": [
+                        f"{show_time.isoformat()} overlaps {overlaps[0]} "
+                        f"in this hall"
+                    ]
+                }
+            )
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            self._check_hall_is_free(validated_data)
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            self._check_hall_is_free(validated_data)
+            return super().update(instance, validated_data)
+
+
+class PerformanceRecurrenceSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    frequency = serializers.ChoiceField(choices=[DAILY, WEEKLY])
+    interval = serializers.IntegerField(min_value=1, default=1)
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        required=False,
+        allow_empty=False,
+    )
+    until = serializers.DateTimeField(required=False)
+    count = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if ("until" in attrs) == ("count" in attrs):
+            raise ValidationError("Exactly one of until or count is required")
+        if "weekdays" in attrs and attrs["frequency"] != WEEKLY:
+            raise ValidationError(
+                {"weekdays": "Weekdays apply to weekly recurrence only"}
+            )
+        return attrs
+
+
+class PerformanceBulkSerializer(serializers.Serializer):
+    """
+    Schedule many performances of a play in a hall at once, from a list
+    of show times or a recurrence rule; all of them or none are created
+    """
+
+    play = serializers.PrimaryKeyRelatedField(queryset=Play.objects.all())
+    theatre_hall = serializers.PrimaryKeyRelatedField(
+        queryset=TheatreHall.objects.all()
+    )
+    duration = serializers.DurationField(
+        default=DEFAULT_PERFORMANCE_DURATION,
+        min_value=timedelta(minutes=1),
+    )
+    show_times = serializers.ListField(
+        child=serializers.DateTimeField(), required=False, allow_empty=False
+    )
+    recurrence = PerformanceRecurrenceSerializer(required=False)
+
+    def validate(self, attrs):
+        limit = settings.THEATRE_BULK_SCHEDULE_LIMIT
+        if ("show_times" in attrs) == ("recurrence" in attrs):
+            raise ValidationError(
+                "Exactly one of show_times or recurrence is required"
+            )
+
+        if "recurrence" in attrs:
+            attrs["show_times"] = recurring_show_times(
+                **attrs.pop("recurrence"), limit=limit
+            )
+        if not attrs["show_times"]:
+            raise ValidationError(
+                {"recurrence": "The recurrence yields no show times"}
+            )
+        if len(attrs["show_times"]) > limit:
+            raise ValidationError(
+                {"show_times": f"At most {limit} performances per request"}
+            )
+
+        return attrs
+
+    @staticmethod
+    def _check_overlaps(theatre_hall, intervals):
+        overlaps = _hall_overlaps(theatre_hall, intervals)
+        if overlaps:
+            raise ValidationError(
+                {
+                    "show_times": {
+                        index: [
+                            f"{intervals[index][0].isoformat()} overlaps "
+                            f"{overlapped} in this hall"
+                        ]
+                        for index, overlapped in sorted(overlaps.items())
+                    }
+                }
+            )
+
+    def create(self, validated_data):
+        theatre_hall = validated_data["theatre_hall"]
+        duration = validated_data["duration"]
+        intervals = [
+            (show_time, show_time + duration)
+            for show_time in validated_data["show_times"]
+        ]
+
+        with transaction.atomic():
+            # The hall stays locked until the rows are created
+            self._check_overlaps(theatre_hall, intervals)
+
+            return Performance.objects.bulk_create(
+                Performance(
+                    play=validated_data["play"],
+                    theatre_hall=theatre_hall,
+                    show_time=show_time,
+                    duration=duration,
+                )
+                for show_time, _ in intervals
+            )
+
+
+class PerformanceListQuerySerializer(serializers.Serializer):
+    date = serializers.DateField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    upcoming = serializers.BooleanField(default=False)
+    play = serializers.IntegerField(required=False)
+    fresh = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        date_from = attrs.get("date_from")
+        date_to = attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise ValidationError(
+                {"date_to": "date_to must not be before date_from"}
+            )
+        return attrs
 
 
 class PerformanceListSerializer(serializers.ModelSerializer):
@@ -90,6 +368,8 @@ class PerformanceListSerializer(serializers.ModelSerializer):
         source="theatre_hall.name", read_only=True
     )
 
+    values_fields = ("id", "show_time", "play__title", "theatre_hall__name")
+
     class Meta:
         model = Performance
         fields = (
@@ -99,6 +379,20 @@ class PerformanceListSerializer(serializers.ModelSerializer):
             "theatre_hall_name",
         )
 
+    @staticmethod
+    def values_to_representation(rows):
+        """Representation of values() rows"""
+        show_time = serializers.DateTimeField()
+        return [
+            {
+                "id": row["id"],
+                "show_time": show_time.to_representation(row["show_time"]),
+                "play_title": row["play__title"],
+                "theatre_hall_name": row["theatre_hall__name"],
+            }
+            for row in rows
+        ]
+
 
 class TicketSerializer(serializers.ModelSerializer):
 
@@ -129,27 +423,121 @@ class TicketSeatsSerializer(TicketSerializer):
         fields = ("row", "seat")
 
 
+class ReservationTicketSerializer(serializers.ModelSerializer):
+    """
+    Ticket of a new reservation, the performance is resolved and
+    validated for all tickets at once by ReservationSerializer
+    """
+
+    performance = serializers.IntegerField(source="performance_id")
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "performance")
+        validators = []
+
+
 class PerformanceDetailSerializer(serializers.ModelSerializer):
 
     play = PlayRetrieveSerializer(read_only=True)
     theatre_hall = TheatreHallSerializer(read_only=True)
-    taken_places = TicketSeatsSerializer(
-        source="tickets", many=True, read_only=True
-    )
+    taken_places = serializers.SerializerMethodField()
 
     class Meta:
         model = Performance
         fields = ("id", "show_time", "play", "theatre_hall", "taken_places")
 
+    @extend_schema_field(TicketSeatsSerializer(many=True))
+    def get_taken_places(self, obj):
+        return obj.seats.taken_places()
+
 
 class ReservationSerializer(serializers.ModelSerializer):
 
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = ReservationTicketSerializer(
+        many=True, read_only=False, allow_empty=False
+    )
 
     class Meta:
         model = Reservation
         fields = ("id", "tickets", "created_at")
 
+    def validate_tickets(self, tickets):
+        """Validate all tickets against their performances in one query"""
+        performances = Performance.objects.select_related(
+            "theatre_hall"
+        ).in_bulk({ticket["performance_id"] for ticket in tickets})
+        seat_maps = {
+            performance_id: performance.seats
+            for performance_id, performance in performances.items()
+        }
+        places = set()
+        errors = []
+
+        for ticket in tickets:
+            ticket_errors = {}
+            performance_id = ticket["performance_id"]
+            row, seat = ticket["row"], ticket["seat"]
+
+            if performance_id not in performances:
+                ticket_errors["performance"] = [
+                    f'Invalid pk "{performance_id}" - object does not exist.'
+                ]
+            else:
+                try:
+                    Ticket.validate_ticket(
+                        row,
+                        seat,
+                        performances[performance_id].theatre_hall,
+                        ValidationError,
+                    )
+                except ValidationError as error:
+                    ticket_errors.update(error.detail)
+                else:
+                    if (performance_id, row, seat) in places:
+                        ticket_errors["seat"] = [
+                            f"Seat (row: {row}, seat: {seat}) "
+                            f"is listed more than once"
+                        ]
+                    elif seat_maps[performance_id].is_taken(row, seat):
+                        ticket_errors["seat"] = [
+                            f"Seat (row: {row}, seat: {seat}) "
+                            f"is already taken for performance: "
+                            f"{performance_id}"
+                        ]
+                    places.add((performance_id, row, seat))
+
+            errors.append(ticket_errors)
+
+        if any(errors):
+            raise ValidationError(errors)
+
+        return tickets
+
+    @staticmethod
+    def _check_not_held_by_others(places, user_id):
+        store = get_seat_hold_store()
+        performance_ids = {performance_id for performance_id, _, _ in places}
+
+        for performance_id in performance_ids:
+            held = store.held_by_others(
+                performance_id,
+                [
+                    (row, seat)
+                    for place_performance_id, row, seat in places
+                    if place_performance_id == performance_id
+                ],
+                user_id,
+            )
+            if held:
+                row, seat = held[0]
+                raise ValidationError(
+                    {
+                        "seat": f"Seat (row: {row}, seat: {seat}) "
+                        f"is held for performance: {performance_id}"
+                    }
+                )
+
     def create(self, validated_data):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
@@ -158,6 +546,12 @@ class ReservationSerializer(serializers.ModelSerializer):
                 Ticket(reservation=reservation, **ticket_data)
                 for ticket_data in tickets_data
             ]
+            places = [
+                (ticket.performance_id, ticket.row, ticket.seat)
+                for ticket in ticket_instances
+            ]
+            self._check_not_held_by_others(places, reservation.user_id)
+            Performance.objects.occupy_seats(places, ValidationError)
             Ticket.objects.bulk_create(ticket_instances)
             return reservation
 
@@ -165,3 +559,107 @@ class ReservationSerializer(serializers.ModelSerializer):
 class ReservationListSerializer(ReservationSerializer):
 
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class ReservationExportQuerySerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=sorted(EXPORT_OUTPUTS), default="jsonl"
+    )
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        date_from = attrs.get("date_from")
+        date_to = attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise ValidationError(
+                {"date_to": "date_to must not be before date_from"}
+            )
+        return attrs
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    token = serializers.UUIDField(read_only=True)
+    performance = serializers.IntegerField(
+        source="performance_id", read_only=True
+    )
+    seats = SeatSerializer(many=True, allow_empty=False)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate_seats(self, seats):
+        theatre_hall = self.context["performance"].theatre_hall
+        places = set()
+
+        for seat_data in seats:
+            Ticket.validate_ticket(
+                seat_data["row"],
+                seat_data["seat"],
+                theatre_hall,
+                ValidationError
+            )
+            place = (seat_data["row"], seat_data["seat"])
+            if place in places:
+                raise ValidationError(
+                    f"Seat (row: {place[0]}, seat: {place[1]}) "
+                    f"is listed more than once"
+                )
+            places.add(place)
+
+        return seats
+
+    def create(self, validated_data):
+        performance = self.context["performance"]
+        places = [
+            (seat_data["row"], seat_data["seat"])
+            for seat_data in validated_data["seats"]
+        ]
+        seats = performance.seats
+        taken = [place for place in places if seats.is_taken(*place)]
+        if taken:
+            raise SeatHoldConflict(taken)
+
+        return get_seat_hold_store().hold(
+            performance.id,
+            places,
+            self.context["request"].user.id,
+            get_seat_hold_duration(),
+        )
+
+
+class SeatHoldTokenSerializer(serializers.Serializer):
+    token = serializers.UUIDField()
+
+    def validate(self, attrs):
+        hold = get_seat_hold_store().get(attrs["token"])
+        if hold is None or hold.user_id != self.context["request"].user.id:
+            raise ValidationError(
+                {"token": "Seat hold does not exist or has expired"}
+            )
+        attrs["hold"] = hold
+        return attrs
+
+
+class SeatHoldConfirmSerializer(SeatHoldTokenSerializer):
+
+    def create(self, validated_data):
+        hold = validated_data["hold"]
+        reservation_serializer = ReservationSerializer(
+            data={
+                "tickets": [
+                    {**seat, "performance": hold.performance_id}
+                    for seat in hold.seats
+                ]
+            },
+            context=self.context,
+        )
+        reservation_serializer.is_valid(raise_exception=True)
+        reservation = reservation_serializer.save(
+            user=self.context["request"].user
+        )
+        get_seat_hold_store().release(hold.token)
+        return reservation
@@ -0,0 +1,146 @@
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    pre_save,
+    post_save,
+    post_delete,
+    pre_delete,
+    m2m_changed,
+)
+from django.dispatch import receiver
+
+from theatre.cache import invalidate_catalog_cache
+from theatre.db_routers import pin_catalog_to_primary, pin_user_to_primary
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket
+)
+
+
+@receiver(post_save, sender=Ticket)
+def sync_seat_map_on_ticket_save(sender, instance, **kwargs):
+    Performance.objects.filter(
+        id=instance.performance_id
+    ).rebuild_seat_maps()
+
+
+@receiver(post_delete, sender=Ticket)
+def sync_seat_map_on_ticket_delete(sender, instance, origin=None, **kwargs):
+    origin_model = (
+        origin.model if isinstance(origin, QuerySet) else type(origin)
+    )
+    if origin_model in (Performance, Play, TheatreHall):
+        # the performance itself is being deleted
+        return
+
+    Performance.objects.release_seats(
+        [(instance.performance_id, instance.row, instance.seat)]
+    )
+
+
+@receiver(pre_save, sender=TheatreHall)
+def check_grid_on_hall_save(sender, instance, update_fields=None, **kwargs):
+    instance.grid_changed = False
+    if instance.pk is None or (
+        update_fields is not None
+        and not {"rows", "seats_in_row"} & set(update_fields)
+    ):
+        return
+
+    stored = sender.objects.filter(pk=instance.pk).values_list(
+        "rows", "seats_in_row"
+    ).first()
+    instance.grid_changed = stored not in (
+        None, (instance.rows, instance.seats_in_row)
+    )
+    if instance.grid_changed:
+        TheatreHall.validate_grid(
+            instance.pk, instance.rows, instance.seats_in_row, ValidationError
+        )
+
+
+@receiver(post_save, sender=TheatreHall)
+def sync_seat_maps_on_hall_save(sender, instance, created, **kwargs):
+    if not created and instance.grid_changed:
+        instance.performances.all().rebuild_seat_maps()
+
+
+@receiver(post_save, sender=Play)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=TheatreHall)
+@receiver(post_delete, sender=Play)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Actor)
+@receiver(post_delete, sender=TheatreHall)
+def invalidate_catalog_on_change(sender, **kwargs):
+    invalidate_catalog_cache()
+    pin_catalog_to_primary()
+
+
+@receiver(m2m_changed, sender=Play.actors.through)
+@receiver(m2m_changed, sender=Play.genres.through)
+def invalidate_catalog_on_relations_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_catalog_cache()
+        pin_catalog_to_primary()
+
+
+@receiver(post_save, sender=Reservation)
+def pin_user_on_reservation(sender, instance, created, **kwargs):
+    if created:
+        pin_user_to_primary(instance.user_id)
+
+
+@receiver(post_save, sender=Play)
+def touch_play_on_save(sender, instance, **kwargs):
+    Play.objects.filter(pk=instance.pk).touch()
+
+
+@receiver(m2m_changed, sender=Play.actors.through)
+@receiver(m2m_changed, sender=Play.genres.through)
+def touch_plays_on_relations_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if reverse and action == "pre_clear":
+        instance.cleared_play_ids = list(
+            instance.plays.values_list("id", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        plays = Play.objects.filter(pk=instance.pk)
+    elif action == "post_clear":
+        plays = Play.objects.filter(pk__in=instance.cleared_play_ids)
+    else:
+        plays = Play.objects.filter(pk__in=pk_set)
+
+    plays.touch()
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Actor)
+def touch_plays_on_related_save(sender, instance, **kwargs):
+    instance.plays.all().touch()
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Actor)
+def remember_plays_on_related_delete(sender, instance, **kwargs):
+    instance.deleted_play_ids = list(
+        instance.plays.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Actor)
+def touch_plays_on_related_delete(sender, instance, **kwargs):
+    Play.objects.filter(pk__in=instance.deleted_play_ids).touch()
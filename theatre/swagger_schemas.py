@@ -3,6 +3,12 @@ from drf_spectacular.utils import OpenApiParameter
 
 play_schema = {
     "parameters": [
+            OpenApiParameter(
+                "q",
+                type={"type": "string"},
+                description="Full-text search by title, description, "
+                            "actors and genres (ex. ?q=hamlet drama)"
+            ),
             OpenApiParameter(
                 "title",
                 type={"type": "string"},
@@ -13,10 +19,40 @@ play_schema = {
                 type={"type": "list", "items": {"type": "number"}},
                 description="Filter by genres ids (ex. ?genre=2,3)"
             ),
+            OpenApiParameter(
+                "genres_all",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by plays having all of the genres "
+                            "(ex. ?genres_all=2,3)"
+            ),
             OpenApiParameter(
                 "actors",
                 type={"type": "list", "items": {"type": "number"}},
                 description="Filter by actors ids (ex. ?actors=2,3)"
+            ),
+            OpenApiParameter(
+                "actors_all",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Filter by plays having all of the actors "
+                            "(ex. ?actors_all=2,3)"
+            )
+        ]
+}
+
+actor_autocomplete_schema = {
+    "parameters": [
+            OpenApiParameter(
+                "q",
+                type={"type": "string"},
+                required=True,
+                description="Beginning of or a typo in an actor name "
+                            "(ex. ?q=ian mck)"
+            ),
+            OpenApiParameter(
+                "limit",
+                type={"type": "number"},
+                description="Maximum number of suggestions, "
+                            "10 by default and 20 at most (ex. ?limit=5)"
             )
         ]
 }
@@ -27,10 +63,58 @@ performance_schema = {"parameters": [
                 type={"type": "string"},
                 description="Filter by date (ex. ?date=2024-10-09)"
             ),
+            OpenApiParameter(
+                "date_from",
+                type={"type": "string"},
+                description="Performances on or after the date "
+                            "(ex. ?date_from=2024-10-07)"
+            ),
+            OpenApiParameter(
+                "date_to",
+                type={"type": "string"},
+                description="Performances on or before the date "
+                            "(ex. ?date_to=2024-10-13)"
+            ),
+            OpenApiParameter(
+                "upcoming",
+                type={"type": "boolean"},
+                description="Only performances that have not started yet "
+                            "(ex. ?upcoming=true)"
+            ),
             OpenApiParameter(
                 "play_id_str",
                 type={"type": "list", "items": {"type": "number"}},
                 description="Filter by plays ids (ex. ?plays=2,3)"
+            ),
+            OpenApiParameter(
+                "fresh",
+                type={"type": "boolean"},
+                description="Read seat availability from the primary "
+                            "database, not a replica (ex. ?fresh=true)"
             )
         ]
 }
+
+reservation_export_schema = {
+    "parameters": [
+            OpenApiParameter(
+                "output",
+                type={"type": "string", "enum": ["csv", "jsonl"]},
+                description="Export format, jsonl by default "
+                            "(ex. ?output=csv)"
+            ),
+            OpenApiParameter(
+                "date_from",
+                type={"type": "string"},
+                description="Reservations created on or after the date "
+                            "(ex. ?date_from=2024-10-01)"
+            ),
+            OpenApiParameter(
+                "date_to",
+                type={"type": "string"},
+                description="Reservations created on or before the date "
+                            "(ex. ?date_to=2024-10-31)"
+            )
+        ],
+    "responses": {(200, "application/jsonl"): str, (200, "text/csv"): str},
+}
@@ -0,0 +1,55 @@
+import os
+import statistics
+import time
+from unittest import skipUnless
+
+from django.test import TestCase, TransactionTestCase
+
+BENCHMARKS_ENABLED = os.environ.get("THEATRE_BENCHMARKS") == "1"
+BENCHMARK_SCALE = float(os.environ.get("THEATRE_BENCHMARK_SCALE", "1"))
+
+skip_unless_benchmarks = skipUnless(
+    BENCHMARKS_ENABLED, "set THEATRE_BENCHMARKS=1 to run benchmarks"
+)
+
+
+def scaled(count):
+    """Scale a benchmark data volume by THEATRE_BENCHMARK_SCALE"""
+    return max(1, int(count * BENCHMARK_SCALE))
+
+
+class BenchmarkMixin:
+
+    @staticmethod
+    def measure(func, repeat=10):
+        """Return timings of func calls in milliseconds"""
+        func()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def report(self, name, timings=None, **values):
+        line = f"\n[benchmark] {self.__class__.__name__}.{name}:"
+        if timings:
+            timings = sorted(timings)
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            line += (
+                f" p50={statistics.median(timings):.2f}ms"
+                f" p95={p95:.2f}ms n={len(timings)}"
+            )
+        for key, value in values.items():
+            line += f" {key}={value}"
+        print(line)
+
+
+@skip_unless_benchmarks
+class BenchmarkTestCase(BenchmarkMixin, TestCase):
+    pass
+
+
+@skip_unless_benchmarks
+class BenchmarkTransactionTestCase(BenchmarkMixin, TransactionTestCase):
+    pass
@@ -0,0 +1,44 @@
+import random
+
+from django.db import connection
+
+from theatre.models import Actor
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+
+def random_name(rnd):
+    syllables = ("an", "ber", "cor", "da", "el", "fin", "gar", "hol", "is",
+                 "ken", "lo", "mar", "ni", "or", "per", "ros", "sten", "tor",
+                 "ul", "ven", "wil", "yen", "zo")
+    return "".join(rnd.choices(syllables, k=rnd.randint(2, 4))).title()
+
+
+class ActorAutocompleteBenchmark(BenchmarkTestCase):
+    """Prefix and trigram autocomplete over a large actor table"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rnd = random.Random(42)
+        first_names = [random_name(rnd) for _ in range(2000)]
+        Actor.objects.bulk_create(
+            (
+                Actor(
+                    first_name=rnd.choice(first_names),
+                    last_name=random_name(rnd),
+                )
+                for _ in range(scaled(1_000_000))
+            ),
+            batch_size=10000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE theatre_actor")
+
+    def test_autocomplete(self):
+        for text in ("k", "ke", "kenmar", "kenmar lo", "Zoulyen Perhol"):
+            self.report(
+                f"autocomplete_{text.replace(' ', '_')}",
+                self.measure(
+                    lambda: Actor.objects.autocomplete(text), repeat=20
+                ),
+                rows=len(Actor.objects.autocomplete(text)),
+            )
@@ -0,0 +1,151 @@
+import asyncio
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.load_data import LOAD_DATA_EMAIL_DOMAIN, seed_load_data
+from theatre.models import Performance, Play
+from theatre.tests.benchmarks.base import (
+    BenchmarkTransactionTestCase,
+    scaled,
+)
+from user.models import User
+
+REQUESTS = 400
+CONCURRENCY = (1, 8, 32)
+
+URLCONFS = {
+    "sync": "theatre_api_service.urls",
+    "async": "theatre.tests.test_async_reads",
+}
+
+# As deployed under ASGI: the toolbar middleware is sync only and would
+# put every view into a thread, the dummy cache makes every read query
+ASGI_SETTINGS = {
+    "MIDDLEWARE": [
+        middleware
+        for middleware in settings.MIDDLEWARE
+        if not middleware.startswith("debug_toolbar")
+    ],
+    "CACHES": {
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+        }
+    },
+}
+
+
+async def asgi_get(app, path, token):
+    """Status, body size and latency of a GET through the ASGI app"""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    requests = asyncio.Queue()
+    requests.put_nowait({"type": "http.request", "body": b""})
+    response = {"size": 0}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        else:
+            response["size"] += len(message.get("body", b""))
+
+    start = time.perf_counter()
+    await app(scope, requests.get, send)
+    return response, (time.perf_counter() - start) * 1000
+
+
+class AsyncReadsLoadBenchmark(BenchmarkTransactionTestCase):
+    """
+    Throughput of concurrent performance and play reads through one ASGI
+    application with the sync viewsets and with the async read path
+    """
+
+    def setUp(self):
+        seed_load_data(
+            halls=10,
+            genres=20,
+            actors=500,
+            plays=scaled(1000),
+            performances=scaled(5000),
+            users=10,
+            tickets=scaled(50_000),
+        )
+        self.token = str(
+            AccessToken.for_user(
+                User.objects.get(email=f"user1@{LOAD_DATA_EMAIL_DOMAIN}")
+            )
+        )
+        performance_ids = list(
+            Performance.objects.values_list("id", flat=True)
+        )
+        play_ids = list(Play.objects.values_list("id", flat=True))
+        rng = random.Random(0)
+        self.paths = [
+            rng.choice(
+                [
+                    "/api/theatre/performances/",
+                    "/api/theatre/performances/?date=2024-01-02",
+                    f"/api/theatre/performances/"
+                    f"{rng.choice(performance_ids)}/",
+                    "/api/theatre/plays/",
+                    f"/api/theatre/plays/{rng.choice(play_ids)}/",
+                ]
+            )
+            for _ in range(REQUESTS)
+        ]
+
+    async def _load(self, app, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request(path):
+            async with semaphore:
+                return await asgi_get(app, path, self.token)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(request(path) for path in self.paths)
+        )
+        return results, time.perf_counter() - start
+
+    def test_throughput(self):
+        for name, urlconf in URLCONFS.items():
+            with override_settings(ROOT_URLCONF=urlconf, **ASGI_SETTINGS):
+                app = get_asgi_application()
+                asyncio.run(self._load(app, 8))
+
+                for concurrency in CONCURRENCY:
+                    results, elapsed = asyncio.run(
+                        self._load(app, concurrency)
+                    )
+                    self.assertEqual(
+                        {response["status"] for response, _ in results},
+                        {200},
+                    )
+                    timings = sorted(timing for _, timing in results)
+                    self.report(
+                        f"{name}_concurrency_{concurrency}",
+                        timings,
+                        requests_per_second=round(REQUESTS / elapsed),
+                        mean_ms=round(statistics.mean(timings), 2),
+                    )
@@ -0,0 +1,109 @@
+import io
+import time
+from unittest import mock
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import Genre
+from theatre.tests.benchmarks.base import BenchmarkTransactionTestCase
+from user.models import User
+
+GENRE_URL = reverse("theatre:genre-list")
+
+REQUESTS = 200
+
+# name: (CONN_MAX_AGE, CONN_HEALTH_CHECKS)
+MODES = {
+    "per_request": (0, False),
+    "persistent": (60, False),
+    "persistent_health_checks": (60, True),
+}
+
+
+class ConnectionReuseBenchmark(BenchmarkTransactionTestCase):
+    """
+    Genre list through the WSGI handler, which closes obsolete
+    connections at the start and end of every request like a deployed
+    server, with and without persistent connections
+    """
+
+    def setUp(self):
+        Genre.objects.bulk_create(
+            Genre(name=f"Genre{number}") for number in range(20)
+        )
+        user = User.objects.create_user("test@test.com", "testpass")
+        self.token = str(AccessToken.for_user(user))
+        self.handler = WSGIHandler()
+        settings_dict = connection.settings_dict
+        self.addCleanup(
+            settings_dict.update,
+            CONN_MAX_AGE=settings_dict["CONN_MAX_AGE"],
+            CONN_HEALTH_CHECKS=settings_dict["CONN_HEALTH_CHECKS"],
+        )
+
+    def _get(self, path):
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": "testserver",
+            "HTTP_AUTHORIZATION": f"Bearer {self.token}",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": io.StringIO(),
+        }
+        statuses = []
+        response = self.handler(
+            environ, lambda status, headers: statuses.append(status)
+        )
+        response.close()
+        return statuses[0]
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+            }
+        }
+    )
+    def test_connection_reuse(self):
+        connect = connection.connect
+        connect_timings = []
+
+        def timed_connect():
+            start = time.perf_counter()
+            connect()
+            connect_timings.append((time.perf_counter() - start) * 1000)
+
+        for name, (max_age, health_checks) in MODES.items():
+            connection.close()
+            connection.settings_dict.update(
+                CONN_MAX_AGE=max_age, CONN_HEALTH_CHECKS=health_checks
+            )
+            self.assertEqual(self._get(GENRE_URL), "200 OK")
+
+            connect_timings.clear()
+            with mock.patch.object(connection, "connect", timed_connect):
+                timings = self.measure(
+                    lambda: self._get(GENRE_URL), repeat=REQUESTS
+                )
+
+            self.report(
+                name,
+                timings,
+                connections=len(connect_timings),
+                connect_ms=round(sum(connect_timings), 2),
+                connect_share=f"{sum(connect_timings) / sum(timings):.0%}",
+            )
+            if max_age:
+                self.assertLessEqual(len(connect_timings), 1)
+            else:
+                # measure() makes one warm-up call
+                self.assertEqual(len(connect_timings), REQUESTS + 1)
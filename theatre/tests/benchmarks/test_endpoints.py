@@ -0,0 +1,525 @@
+import io
+import json
+import math
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from theatre.load_data import (
+    LOAD_DATA_EMAIL_DOMAIN,
+    LOAD_DATA_PASSWORD,
+    seed_load_data,
+)
+from theatre.models import (
+    TheatreHall,
+    Genre,
+    Actor,
+    Play,
+    Performance,
+)
+from theatre.seat_holds import get_seat_hold_duration, get_seat_hold_store
+from theatre.tests.benchmarks.base import (
+    BENCHMARK_SCALE,
+    BenchmarkTestCase,
+    scaled,
+)
+from theatre.urls import router
+from user.urls import urlpatterns as user_urlpatterns
+
+BUDGETS_PATH = Path(__file__).with_name("endpoint_budgets.json")
+UPDATE_BUDGETS = os.environ.get("THEATRE_UPDATE_BUDGETS") == "1"
+# Latency budgets allow for machine noise: a relative tolerance plus a
+# few milliseconds of jitter that dominate the fastest endpoints
+LATENCY_TOLERANCE = float(
+    os.environ.get("THEATRE_BUDGET_LATENCY_TOLERANCE", "2")
+)
+LATENCY_SLACK_MS = 10
+BYTES_TOLERANCE = 1.1
+WARMUP = 2
+REPEAT = 50
+
+FUTURE = "2090-01-01T19:00:00Z"
+
+
+def _png():
+    image = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(image, "PNG")
+    image.name = "image.png"
+    image.seek(0)
+    return image
+
+
+def _hold(ctx):
+    performance = ctx["free_performance"]
+    hold = get_seat_hold_store().hold(
+        performance.id,
+        [ctx["free_place"]],
+        ctx["customer"].id,
+        get_seat_hold_duration(),
+    )
+    return {"data": {"token": str(hold.token)}}
+
+
+def _free_seat_data(ctx):
+    row, seat = ctx["free_place"]
+    return {"row": row, "seat": seat}
+
+
+def _detail(key):
+    return lambda ctx: {"args": [ctx[key].id]}
+
+
+def _new(model, **fields):
+    """A fresh row to delete, so deletes do not cascade into seeded data"""
+    return lambda ctx: {"args": [model.objects.create(**fields).id]}
+
+
+def _new_performance(ctx):
+    return {
+        "args": [
+            Performance.objects.create(
+                play=ctx["play"],
+                theatre_hall=ctx["hall"],
+                show_time=FUTURE,
+            ).id
+        ]
+    }
+
+
+# (method, url name, user, request kwargs built from the seeded context)
+ENDPOINT_CASES = [
+    ("GET", "theatre:api-root", "admin", lambda ctx: {}),
+    ("GET", "theatre:theatrehall-list", "admin", lambda ctx: {}),
+    (
+        "POST",
+        "theatre:theatrehall-list",
+        "admin",
+        lambda ctx: {"data": {"name": "New", "rows": 10, "seats_in_row": 10}},
+    ),
+    (
+        "GET",
+        "theatre:theatrehall-detail",
+        "admin",
+        _detail("hall"),
+    ),
+    (
+        "PATCH",
+        "theatre:theatrehall-detail",
+        "admin",
+        lambda ctx: {"args": [ctx["hall"].id], "data": {"name": "Renamed"}},
+    ),
+    (
+        "DELETE",
+        "theatre:theatrehall-detail",
+        "admin",
+        _new(TheatreHall, name="Deleted", rows=1, seats_in_row=1),
+    ),
+    ("GET", "theatre:genre-list", "admin", lambda ctx: {}),
+    (
+        "POST",
+        "theatre:genre-list",
+        "admin",
+        lambda ctx: {"data": {"name": "New genre"}},
+    ),
+    ("GET", "theatre:genre-detail", "admin", _detail("genre")),
+    (
+        "PATCH",
+        "theatre:genre-detail",
+        "admin",
+        lambda ctx: {"args": [ctx["genre"].id], "data": {"name": "Renamed"}},
+    ),
+    ("DELETE", "theatre:genre-detail", "admin", _new(Genre, name="Deleted")),
+    ("GET", "theatre:actor-list", "admin", lambda ctx: {}),
+    (
+        "POST",
+        "theatre:actor-list",
+        "admin",
+        lambda ctx: {"data": {"first_name": "New", "last_name": "Actor"}},
+    ),
+    ("GET", "theatre:actor-detail", "admin", _detail("actor")),
+    (
+        "PATCH",
+        "theatre:actor-detail",
+        "admin",
+        lambda ctx: {"args": [ctx["actor"].id], "data": {"last_name": "New"}},
+    ),
+    (
+        "DELETE",
+        "theatre:actor-detail",
+        "admin",
+        _new(Actor, first_name="Deleted", last_name="Actor"),
+    ),
+    (
+        "GET",
+        "theatre:actor-autocomplete",
+        "admin",
+        lambda ctx: {"data": {"q": "Shev"}},
+    ),
+    ("GET", "theatre:play-list", "admin", lambda ctx: {}),
+    (
+        "POST",
+        "theatre:play-list",
+        "admin",
+        lambda ctx: {
+            "data": {
+                "title": "New play",
+                "description": "Description",
+                "genres": [ctx["genre"].id],
+                "actors": [ctx["actor"].id],
+            }
+        },
+    ),
+    ("GET", "theatre:play-detail", "admin", _detail("play")),
+    (
+        "PATCH",
+        "theatre:play-detail",
+        "admin",
+        lambda ctx: {"args": [ctx["play"].id], "data": {"title": "Renamed"}},
+    ),
+    (
+        "DELETE",
+        "theatre:play-detail",
+        "admin",
+        _new(Play, title="Deleted", description="Play"),
+    ),
+    (
+        "POST",
+        "theatre:play-upload-image",
+        "admin",
+        lambda ctx: {
+            "args": [ctx["play"].id],
+            "data": {"image": _png()},
+            "format": "multipart",
+        },
+    ),
+    ("GET", "theatre:performance-list", "admin", lambda ctx: {}),
+    (
+        "POST",
+        "theatre:performance-list",
+        "admin",
+        lambda ctx: {
+            "data": {
+                "play": ctx["play"].id,
+                "theatre_hall": ctx["hall"].id,
+                "show_time": FUTURE,
+            }
+        },
+    ),
+    (
+        "GET",
+        "theatre:performance-detail",
+        "admin",
+        _detail("performance"),
+    ),
+    (
+        "PATCH",
+        "theatre:performance-detail",
+        "admin",
+        lambda ctx: {
+            "args": [ctx["performance"].id],
+            "data": {"duration": "01:45:00"},
+        },
+    ),
+    ("DELETE", "theatre:performance-detail", "admin", _new_performance),
+    (
+        "POST",
+        "theatre:performance-bulk",
+        "admin",
+        lambda ctx: {
+            "data": {
+                "play": ctx["play"].id,
+                "theatre_hall": ctx["hall"].id,
+                "recurrence": {
+                    "start": FUTURE,
+                    "frequency": "daily",
+                    "count": 100,
+                },
+            }
+        },
+    ),
+    (
+        "POST",
+        "theatre:performance-hold",
+        "customer",
+        lambda ctx: {
+            "args": [ctx["free_performance"].id],
+            "data": {"seats": [_free_seat_data(ctx)]},
+        },
+    ),
+    ("GET", "theatre:reservation-list", "customer", lambda ctx: {}),
+    (
+        "POST",
+        "theatre:reservation-list",
+        "customer",
+        lambda ctx: {
+            "data": {
+                "tickets": [
+                    {
+                        **_free_seat_data(ctx),
+                        "performance": ctx["free_performance"].id,
+                    }
+                ]
+            }
+        },
+    ),
+    (
+        "GET",
+        "theatre:reservation-export",
+        "admin",
+        lambda ctx: {
+            "data": {
+                "date_from": ctx["export_date"],
+                "date_to": ctx["export_date"],
+            }
+        },
+    ),
+    ("POST", "theatre:reservation-confirm-hold", "customer", _hold),
+    ("POST", "theatre:reservation-release-hold", "customer", _hold),
+    (
+        "POST",
+        "user:create",
+        None,
+        lambda ctx: {
+            "data": {"email": "new@user.com", "password": "password"}
+        },
+    ),
+    (
+        "POST",
+        "user:token_obtain_pair",
+        None,
+        lambda ctx: {
+            "data": {
+                "email": ctx["customer"].email,
+                "password": LOAD_DATA_PASSWORD,
+            }
+        },
+    ),
+    (
+        "POST",
+        "user:token_refresh",
+        None,
+        lambda ctx: {
+            "data": {"refresh": str(RefreshToken.for_user(ctx["customer"]))}
+        },
+    ),
+    (
+        "POST",
+        "user:token_verify",
+        None,
+        lambda ctx: {
+            "data": {
+                "token": str(
+                    RefreshToken.for_user(ctx["customer"]).access_token
+                )
+            }
+        },
+    ),
+    ("GET", "user:manage", "customer", lambda ctx: {}),
+    (
+        "PATCH",
+        "user:manage",
+        "admin",
+        lambda ctx: {"data": {"email": "renamed@user.com"}},
+    ),
+]
+
+
+def routed_url_names():
+    """Namespaced names of every router and user endpoint"""
+    return {
+        f"theatre:{pattern.name}" for pattern in router.urls
+    } | {f"user:{pattern.name}" for pattern in user_urlpatterns}
+
+
+def case_key(method, url_name):
+    return f"{method} {url_name}"
+
+
+def percentile(timings, fraction):
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+class EndpointCoverageTests(SimpleTestCase):
+    def test_every_endpoint_has_a_case(self):
+        covered = {url_name for _, url_name, _, _ in ENDPOINT_CASES}
+
+        self.assertEqual(routed_url_names() - covered, set())
+
+    def test_every_case_has_a_budget(self):
+        budgets = json.loads(BUDGETS_PATH.read_text())
+
+        self.assertEqual(
+            set(budgets),
+            {
+                case_key(method, url_name)
+                for method, url_name, _, _ in ENDPOINT_CASES
+            },
+        )
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class EndpointBudgetBenchmark(BenchmarkTestCase):
+    """
+    Latency, SQL query count and response size of every endpoint against
+    seeded data, compared with the budgets in endpoint_budgets.json;
+    THEATRE_UPDATE_BUDGETS=1 rewrites the budgets from this run
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_load_data(
+            halls=10,
+            genres=20,
+            actors=500,
+            plays=300,
+            performances=scaled(5_000),
+            users=200,
+            tickets=scaled(200_000),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        free_performance = next(
+            performance
+            for performance in Performance.objects.select_related(
+                "theatre_hall"
+            ).order_by("id")
+            if performance.seats.available
+        )
+        seats = free_performance.seats
+        cls.ctx = {
+            "admin": get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            ),
+            "customer": get_user_model().objects.get(
+                email=f"user1@{LOAD_DATA_EMAIL_DOMAIN}"
+            ),
+            "hall": TheatreHall.objects.order_by("id").first(),
+            "genre": Genre.objects.order_by("id").first(),
+            "actor": Actor.objects.order_by("id").first(),
+            "play": Play.objects.order_by("id").first(),
+            "performance": Performance.objects.order_by("id").first(),
+            "free_performance": free_performance,
+            "free_place": next(
+                (row, seat)
+                for row in range(1, seats.rows + 1)
+                for seat in range(1, seats.seats_in_row + 1)
+                if seats.is_free(row, seat)
+            ),
+            "export_date": Performance.objects.order_by("id")
+            .first()
+            .show_time.date()
+            .isoformat(),
+        }
+
+    def _request(self, client, method, url_name, request):
+        url = reverse(url_name, args=request.get("args"))
+        if method == "GET":
+            return client.get(url, request.get("data"))
+        return getattr(client, method.lower())(
+            url, request.get("data"), format=request.get("format", "json")
+        )
+
+    def _run(self, method, url_name, user, build):
+        """
+        Time the request in a rolled back transaction per run, so every
+        run sees the seeded data and the objects it needs, like a fresh
+        row to delete, are built before the clock starts
+        """
+        client = APIClient()
+        if user:
+            client.force_authenticate(self.ctx[user])
+
+        timings = []
+        for _ in range(WARMUP + REPEAT):
+            with transaction.atomic():
+                request = build(self.ctx)
+                cache.clear()
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    res = self._request(client, method, url_name, request)
+                    size = (
+                        sum(len(chunk) for chunk in res.streaming_content)
+                        if res.streaming
+                        else len(res.content)
+                    )
+                    timings.append((time.perf_counter() - start) * 1000)
+                transaction.set_rollback(True)
+            self.assertLess(res.status_code, 400, getattr(res, "data", None))
+
+        timings = timings[WARMUP:]
+        return {
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "queries": len(context.captured_queries),
+            "bytes": size,
+        }
+
+    def test_endpoint_budgets(self):
+        budgets = (
+            json.loads(BUDGETS_PATH.read_text())
+            if BUDGETS_PATH.exists()
+            else {}
+        )
+        measured = {}
+
+        for method, url_name, user, build in ENDPOINT_CASES:
+            key = case_key(method, url_name)
+            result = measured[key] = self._run(method, url_name, user, build)
+            self.report(key.replace(" ", "_"), **result)
+            if UPDATE_BUDGETS:
+                continue
+
+            budget = budgets.get(key)
+            with self.subTest(endpoint=key):
+                self.assertIsNotNone(
+                    budget, "no budget, run with THEATRE_UPDATE_BUDGETS=1"
+                )
+                self.assertLessEqual(
+                    result["queries"], budget["queries"], "queries"
+                )
+                # Sizes and latencies grow with the seeded volumes
+                if BENCHMARK_SCALE == 1:
+                    self.assertLessEqual(
+                        result["bytes"],
+                        math.ceil(budget["bytes"] * BYTES_TOLERANCE),
+                        "bytes",
+                    )
+                    for latency in ("p50_ms", "p95_ms"):
+                        self.assertLessEqual(
+                            result[latency],
+                            budget[latency] * LATENCY_TOLERANCE
+                            + LATENCY_SLACK_MS,
+                            latency,
+                        )
+
+        if UPDATE_BUDGETS:
+            BUDGETS_PATH.write_text(
+                json.dumps(
+                    {
+                        key: {
+                            "queries": result["queries"],
+                            "bytes": result["bytes"],
+                            "p50_ms": result["p50_ms"],
+                            "p95_ms": result["p95_ms"],
+                        }
+                        for key, result in measured.items()
+                    },
+                    indent=2,
+                    sort_keys=True,
+                )
+                + "\n"
+            )
@@ -0,0 +1,30 @@
+import time
+
+from theatre.load_data import seed_load_data
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+
+class SeedLoadDataBenchmark(BenchmarkTestCase):
+    """Generation rate of seed_load_data at 1M tickets"""
+
+    def test_seed_rate(self):
+        tickets = scaled(1_000_000)
+
+        start = time.perf_counter()
+        counts = seed_load_data(
+            performances=scaled(10_000),
+            users=scaled(10_000),
+            tickets=tickets,
+        )
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(counts["tickets"], tickets)
+        self.report(
+            "seed",
+            [elapsed * 1000],
+            tickets_per_second=int(tickets / elapsed),
+            minutes_per_10m_tickets=round(
+                10_000_000 / tickets * elapsed / 60, 1
+            ),
+            **counts,
+        )
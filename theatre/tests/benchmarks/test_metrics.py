@@ -0,0 +1,79 @@
+import statistics
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.metrics import request_metrics
+from theatre.models import Genre
+from theatre.tests.benchmarks.base import BenchmarkTestCase
+
+GENRE_URL = reverse("theatre:genre-list")
+
+OFF_OVERHEAD_BUDGET_MS = 0.1
+ROUNDS = 20
+
+WITHOUT_METRICS = [
+    middleware
+    for middleware in settings.MIDDLEWARE
+    if middleware != "theatre.metrics.RequestMetricsMiddleware"
+]
+
+
+class RequestMetricsBenchmark(BenchmarkTestCase):
+    """Overhead of the metrics middleware on the cached genre list"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Genre.objects.bulk_create(
+            Genre(name=f"Genre{number}") for number in range(20)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        request_metrics.reset()
+        user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.clients = {}
+        for name, middleware in (
+            ("without_middleware", WITHOUT_METRICS),
+            ("with_middleware", settings.MIDDLEWARE),
+        ):
+            # The test client builds its middleware chain on first use
+            with override_settings(MIDDLEWARE=middleware):
+                client = self.clients[name] = APIClient()
+                client.force_authenticate(user)
+                client.get(GENRE_URL)
+
+    def test_overhead(self):
+        """Interleave the configurations in rounds to spread out noise"""
+        configurations = {
+            "without_middleware_ms": ("without_middleware", 0),
+            "sampling_off_ms": ("with_middleware", 0),
+            "sampling_on_ms": ("with_middleware", 1),
+        }
+        timings = {name: [] for name in configurations}
+        for _ in range(ROUNDS):
+            for name, (client, sample_rate) in configurations.items():
+                client = self.clients[client]
+                with override_settings(
+                    THEATRE_METRICS_SAMPLE_RATE=sample_rate
+                ):
+                    timings[name] += self.measure(
+                        lambda: client.get(GENRE_URL), repeat=50
+                    )
+        medians = {
+            name: round(statistics.median(values), 3)
+            for name, values in timings.items()
+        }
+
+        self.report("genre_list", **medians)
+        self.assertLess(
+            medians["sampling_off_ms"] - medians["without_middleware_ms"],
+            OFF_OVERHEAD_BUDGET_MS,
+        )
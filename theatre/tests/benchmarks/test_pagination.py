@@ -0,0 +1,73 @@
+from base64 import b64encode
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.models import TheatreHall, Play, Performance
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+from theatre.views import PerformanceViewSet
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+PAGE_SIZE = 20
+
+
+def cursor_for(position):
+    query = urlencode({"p": str(position)})
+    return b64encode(query.encode("ascii")).decode("ascii")
+
+
+class PerformancePaginationBenchmark(BenchmarkTestCase):
+    """Per-page latency of deep pages: cursor vs OFFSET pagination"""
+
+    @classmethod
+    def setUpTestData(cls):
+        hall = TheatreHall.objects.create(
+            name="Main", rows=10, seats_in_row=10
+        )
+        play = Play.objects.create(title="Play", description="Description")
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        cls.total = scaled(500_000)
+        Performance.objects.bulk_create(
+            (
+                Performance(
+                    play=play,
+                    theatre_hall=hall,
+                    show_time=start + timedelta(minutes=30 * number),
+                    duration=timedelta(minutes=30),
+                )
+                for number in range(cls.total)
+            ),
+            batch_size=5000,
+        )
+        cls.user = get_user_model().objects.create_user(
+            "bench@test.com", "testpass"
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_deep_pages(self):
+        queryset = PerformanceViewSet.queryset.order_by("show_time", "id")
+
+        for fraction in (0, 0.5, 0.99):
+            offset = int(self.total * fraction)
+            position = queryset.values_list("show_time", flat=True)[offset]
+
+            self.report(
+                f"offset_page_at_{fraction:.0%}",
+                self.measure(
+                    lambda: list(queryset[offset:offset + PAGE_SIZE])
+                ),
+            )
+            self.report(
+                f"cursor_page_at_{fraction:.0%}",
+                self.measure(
+                    lambda: self.client.get(
+                        PERFORMANCE_URL, {"cursor": cursor_for(position)}
+                    )
+                ),
+            )
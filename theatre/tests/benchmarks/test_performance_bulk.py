@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.models import TheatreHall, Play, Performance
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+BULK_URL = reverse("theatre:performance-bulk")
+
+
+class PerformanceBulkBenchmark(BenchmarkTestCase):
+    """Scheduling a season one request per show time vs one bulk request"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        cls.play = Play.objects.create(title="Play", description="Text")
+        cls.hall = TheatreHall.objects.create(
+            name="Main", rows=20, seats_in_row=20
+        )
+        start = datetime(2020, 1, 1, 19, tzinfo=timezone.utc)
+        Performance.objects.bulk_create(
+            Performance(
+                play=cls.play,
+                theatre_hall=cls.hall,
+                show_time=start + timedelta(days=day),
+            )
+            for day in range(scaled(1000))
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.start = datetime(2030, 1, 1, 19, tzinfo=timezone.utc)
+
+    def _schedule_each(self, show_times):
+        for show_time in show_times:
+            self.client.post(
+                PERFORMANCE_URL,
+                {
+                    "play": self.play.id,
+                    "theatre_hall": self.hall.id,
+                    "show_time": show_time.isoformat(),
+                },
+            )
+
+    def _schedule_bulk(self, show_times):
+        res = self.client.post(
+            BULK_URL,
+            {
+                "play": self.play.id,
+                "theatre_hall": self.hall.id,
+                "show_times": [
+                    show_time.isoformat() for show_time in show_times
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201, res.data)
+
+    def test_bulk_schedule(self):
+        count = scaled(2000)
+        show_times = [
+            self.start + timedelta(hours=3 * index) for index in range(count)
+        ]
+
+        for name, schedule in (
+            ("per_request", self._schedule_each),
+            ("bulk", self._schedule_bulk),
+        ):
+            def run():
+                with transaction.atomic():
+                    schedule(show_times)
+                    transaction.set_rollback(True)
+
+            timings = self.measure(run, repeat=3)
+            self.report(
+                name,
+                timings,
+                performances=count,
+                per_second=int(count / (min(timings) / 1000)),
+            )
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+
+from theatre.models import TheatreHall, Play, Performance
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+HALLS = 50
+SHOW_SPACING = timedelta(hours=3)
+PAGE_SIZE = 21
+
+
+class PerformanceDateFilterBenchmark(BenchmarkTestCase):
+    """Date filters over 1M performances: show_time__date vs a range"""
+
+    @classmethod
+    def setUpTestData(cls):
+        halls = TheatreHall.objects.bulk_create(
+            TheatreHall(name=f"Hall{number}", rows=10, seats_in_row=10)
+            for number in range(HALLS)
+        )
+        play = Play.objects.create(title="Play", description="Description")
+        start = datetime(2020, 1, 1, 10, tzinfo=timezone.utc)
+        cls.total = scaled(1_000_000)
+        Performance.objects.bulk_create(
+            (
+                Performance(
+                    play=play,
+                    theatre_hall=halls[number % HALLS],
+                    show_time=start + SHOW_SPACING * (number // HALLS),
+                )
+                for number in range(cls.total)
+            ),
+            batch_size=10_000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE theatre_performance")
+        cls.date = (
+            start + SHOW_SPACING * (cls.total // HALLS // 2)
+        ).date()
+
+    def _compare(self, name, cast_filter, range_queryset):
+        performances = Performance.objects.order_by("show_time", "id")
+        for variant, queryset in (
+            ("cast", performances.filter(**cast_filter)),
+            ("range", range_queryset.order_by("show_time", "id")),
+        ):
+            self.assertEqual(
+                list(queryset.values_list("id", flat=True)[:PAGE_SIZE]),
+                list(
+                    performances.filter(**cast_filter).values_list(
+                        "id", flat=True
+                    )[:PAGE_SIZE]
+                ),
+            )
+            page = self.measure(
+                lambda: list(queryset.values_list("id")[:PAGE_SIZE])
+            )
+            count = self.measure(queryset.count, repeat=5)
+            self.report(
+                f"{name}_{variant}_page", page, performances=self.total
+            )
+            self.report(f"{name}_{variant}_count", count)
+
+    def test_single_date(self):
+        self._compare(
+            "date",
+            {"show_time__date": self.date},
+            Performance.objects.on_date(self.date),
+        )
+
+    def test_week(self):
+        date_to = self.date + timedelta(days=6)
+        self._compare(
+            "week",
+            {
+                "show_time__date__gte": self.date,
+                "show_time__date__lte": date_to,
+            },
+            Performance.objects.between_dates(self.date, date_to),
+        )
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, Count
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket
+)
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+from theatre.views import PerformanceViewSet
+
+ROWS = 40
+SEATS_IN_ROW = 50
+
+
+class PerformanceListTicketsAvailableBenchmark(BenchmarkTestCase):
+    """List latency with 1M sold tickets: Count("tickets") vs counter"""
+
+    @classmethod
+    def setUpTestData(cls):
+        hall = TheatreHall.objects.create(
+            name="Main", rows=ROWS, seats_in_row=SEATS_IN_ROW
+        )
+        play = Play.objects.create(title="Play", description="Description")
+        user = get_user_model().objects.create_user(
+            "bench@test.com", "testpass"
+        )
+        start = datetime(2024, 1, 1, 19, tzinfo=timezone.utc)
+        performances = Performance.objects.bulk_create(
+            Performance(
+                play=play,
+                theatre_hall=hall,
+                show_time=start + timedelta(days=day),
+            )
+            for day in range(scaled(500))
+        )
+
+        for performance in performances:
+            reservation = Reservation.objects.create(user=user)
+            Ticket.objects.bulk_create(
+                (
+                    Ticket(
+                        row=row,
+                        seat=seat,
+                        performance=performance,
+                        reservation=reservation,
+                    )
+                    for row in range(1, ROWS + 1)
+                    for seat in range(1, SEATS_IN_ROW + 1)
+                ),
+                batch_size=2000,
+            )
+
+        Performance.objects.all().rebuild_seat_maps()
+
+    def test_list_tickets_available(self):
+        count_queryset = Performance.objects.select_related(
+            "play", "theatre_hall"
+        ).annotate(
+            tickets_available=(
+                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+                - Count("tickets")
+            )
+        )
+        counter_queryset = PerformanceViewSet.queryset
+
+        self.assertEqual(
+            [p.tickets_available for p in count_queryset],
+            [p.tickets_available for p in counter_queryset],
+        )
+
+        self.report(
+            "count_tickets",
+            self.measure(lambda: list(count_queryset.all())),
+        )
+        self.report(
+            "tickets_sold_counter",
+            self.measure(lambda: list(counter_queryset.all())),
+        )
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+
+from theatre.models import TheatreHall, Play, Performance
+from theatre.scheduling import IntervalTree
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+HALLS = 10
+SHOW_SPACING = timedelta(hours=3)
+
+
+class PerformanceOverlapBenchmark(BenchmarkTestCase):
+    """Hall overlap checks against 100k existing performances"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.halls = TheatreHall.objects.bulk_create(
+            TheatreHall(name=f"Hall{number}", rows=10, seats_in_row=10)
+            for number in range(HALLS)
+        )
+        play = Play.objects.create(title="Play", description="Description")
+        cls.start = datetime(2020, 1, 1, 10, tzinfo=timezone.utc)
+        cls.total = scaled(100_000)
+        cls.per_hall = cls.total // HALLS
+        Performance.objects.bulk_create(
+            (
+                Performance(
+                    play=play,
+                    theatre_hall=cls.halls[number % HALLS],
+                    show_time=cls.start + SHOW_SPACING * (number // HALLS),
+                )
+                for number in range(cls.total)
+            ),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE theatre_performance")
+
+    def test_overlap_check(self):
+        hall_id = self.halls[0].id
+        spans = [
+            (
+                self.start + SHOW_SPACING * int(self.per_hall * fraction)
+                + timedelta(hours=1),
+                self.start + SHOW_SPACING * int(self.per_hall * fraction)
+                + timedelta(hours=4),
+            )
+            for fraction in (0.01, 0.5, 0.99)
+        ]
+
+        def check():
+            for start, end in spans:
+                assert Performance.objects.overlapping(
+                    hall_id, start, end
+                ).exists()
+
+        def check_with_btree():
+            for start, end in spans:
+                assert Performance.objects.filter(
+                    theatre_hall_id=hall_id,
+                    show_time__lt=end,
+                    ends_at__gt=start,
+                ).exists()
+
+        gist = self.measure(check, repeat=20)
+        btree = self.measure(check_with_btree, repeat=20)
+
+        def check_in_python():
+            tree = IntervalTree(
+                Performance.objects.filter(
+                    theatre_hall_id=hall_id
+                ).values_list("id", "show_time", "ends_at")
+            )
+            for start, end in spans:
+                assert tree.find(start, end) is not None
+
+        python = self.measure(check_in_python, repeat=5)
+
+        for name, timings in (
+            ("exclusion_constraint_gist", gist),
+            ("hall_show_time_btree", btree),
+            ("interval_tree_in_python", python),
+        ):
+            self.report(
+                name,
+                [timing / len(spans) for timing in timings],
+                performances=self.total,
+            )
@@ -0,0 +1,95 @@
+import random
+
+from django.db import connection
+
+from theatre.models import Actor, Genre, Play
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+
+class PlayFilterBenchmark(BenchmarkTestCase):
+    """Many-to-many joins with distinct() vs semi-joins"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rnd = random.Random(42)
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=f"First{number}", last_name=f"Last{number}")
+            for number in range(2000)
+        )
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"Genre{number}") for number in range(20)
+        )
+        plays = Play.objects.bulk_create(
+            (
+                Play(title=f"Play{number}", description="Description")
+                for number in range(scaled(50_000))
+            ),
+            batch_size=5000,
+        )
+        Play.actors.through.objects.bulk_create(
+            (
+                Play.actors.through(play=play, actor=actor)
+                for play in plays
+                for actor in rnd.sample(actors, 36)
+            ),
+            batch_size=20000,
+        )
+        Play.genres.through.objects.bulk_create(
+            (
+                Play.genres.through(play=play, genre=genre)
+                for play in plays
+                for genre in rnd.sample(genres, 4)
+            ),
+            batch_size=20000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.genre_ids = [genre.id for genre in genres[:5]]
+        cls.actor_ids = [actor.id for actor in actors[:40]]
+
+    def _compare(self, name, joined, semi_joined):
+        self.assertEqual(
+            list(joined.order_by("id").values_list("id", flat=True)),
+            list(semi_joined.order_by("id").values_list("id", flat=True)),
+        )
+        self.report(
+            f"{name}_distinct_page",
+            self.measure(lambda: list(joined.order_by("id")[:20])),
+        )
+        self.report(
+            f"{name}_semi_join_page",
+            self.measure(lambda: list(semi_joined.order_by("id")[:20])),
+        )
+        self.report(
+            f"{name}_distinct_count",
+            self.measure(joined.count, repeat=5),
+            rows=joined.count(),
+        )
+        self.report(
+            f"{name}_semi_join_count",
+            self.measure(semi_joined.count, repeat=5),
+        )
+
+    def test_any_genre_and_any_actor(self):
+        self._compare(
+            "any",
+            Play.objects.filter(genres__id__in=self.genre_ids)
+            .filter(actors__id__in=self.actor_ids)
+            .distinct(),
+            Play.objects.with_related("genres", self.genre_ids)
+            .with_related("actors", self.actor_ids),
+        )
+
+    def test_all_actors(self):
+        joined = Play.objects.all()
+        for actor_id in self.actor_ids[:2]:
+            joined = joined.filter(actors__id=actor_id)
+
+        self._compare(
+            "all",
+            joined.distinct(),
+            Play.objects.with_related(
+                "actors", self.actor_ids[:2], match_all=True
+            ),
+        )
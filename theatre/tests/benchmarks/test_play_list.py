@@ -0,0 +1,58 @@
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from theatre.models import Actor, Genre, Play
+from theatre.serializers import PlayListSerializer
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+
+class PlayListNamesBenchmark(BenchmarkTestCase):
+    """Prefetched actors and genres vs names aggregated in SQL"""
+
+    @classmethod
+    def setUpTestData(cls):
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=f"First{number}", last_name=f"Last{number}")
+            for number in range(500)
+        )
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"Genre{number}") for number in range(20)
+        )
+        plays = Play.objects.bulk_create(
+            Play(title=f"Play{number}", description="Description")
+            for number in range(scaled(5000))
+        )
+        Play.actors.through.objects.bulk_create(
+            (
+                Play.actors.through(
+                    play=play, actor=actors[(index * 7 + step) % 500]
+                )
+                for index, play in enumerate(plays)
+                for step in range(12)
+            ),
+            batch_size=10000,
+        )
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(play=play, genre=genres[(index + step) % 20])
+            for index, play in enumerate(plays)
+            for step in range(3)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_list_page(self):
+        renderer = JSONRenderer()
+
+        for name, queryset in (
+            ("prefetch", Play.objects.prefetch_names()),
+            ("aggregated", Play.objects.with_names()),
+        ):
+            for size in (20, 100):
+                page = queryset.order_by("id")
+
+                def render():
+                    return renderer.render(
+                        PlayListSerializer(page[:size], many=True).data
+                    )
+
+                self.report(f"{name}_page_{size}", self.measure(render))
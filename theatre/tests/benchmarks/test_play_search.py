@@ -0,0 +1,79 @@
+import random
+
+from theatre.models import Actor, Genre, Play
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+WORDS = (
+    "king queen prince ghost storm night summer winter dream tale "
+    "love war revenge comedy tragedy island forest castle sea merchant "
+    "twins sister brother father daughter crown sword letter fool "
+    "madness honour betrayal wedding funeral feast exile return"
+).split()
+
+
+class PlaySearchBenchmark(BenchmarkTestCase):
+    """title__icontains scan vs GIN-indexed full-text search"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rnd = random.Random(42)
+        vocabulary = [
+            "".join(rnd.choices("bcdfghklmnprstvz", k=3)) + suffix
+            for suffix in ("ia", "on", "ette", "ard", "ine")
+            for _ in range(1000)
+        ]
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=f"First{number}", last_name=f"Last{number}")
+            for number in range(1000)
+        )
+        genres = Genre.objects.bulk_create(
+            Genre(name=name)
+            for name in ("Drama", "Comedy", "Tragedy", "Musical", "Opera")
+        )
+        plays = Play.objects.bulk_create(
+            (
+                Play(
+                    title=" ".join(rnd.sample(WORDS, 3)).title(),
+                    description=" ".join(rnd.choices(vocabulary, k=30)),
+                )
+                for _ in range(scaled(200_000))
+            ),
+            batch_size=5000,
+        )
+        Play.actors.through.objects.bulk_create(
+            (
+                Play.actors.through(play=play, actor=actor)
+                for play in plays
+                for actor in rnd.sample(actors, 3)
+            ),
+            batch_size=10000,
+        )
+        Play.genres.through.objects.bulk_create(
+            (
+                Play.genres.through(play=play, genre=rnd.choice(genres))
+                for play in plays
+            ),
+            batch_size=10000,
+        )
+        Play.objects.all().touch()
+        cls.description_word = vocabulary[0]
+
+    def test_search(self):
+        for text in ("Last77", self.description_word, "ghost island"):
+            self.report(
+                f"icontains_{text.replace(' ', '_')}",
+                self.measure(
+                    lambda: list(
+                        Play.objects.filter(title__icontains=text)
+                        .order_by("id")[:20]
+                    )
+                ),
+            )
+            self.report(
+                f"full_text_{text.replace(' ', '_')}",
+                self.measure(
+                    lambda: list(
+                        Play.objects.search(text).order_by("-rank", "id")[:20]
+                    )
+                ),
+            )
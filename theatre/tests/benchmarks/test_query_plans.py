@@ -0,0 +1,19 @@
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+from theatre.tests.test_query_plans import QueryPlanMixin
+
+
+class LargeTableQueryPlanBenchmark(QueryPlanMixin, BenchmarkTestCase):
+    """List endpoint plans on large tables with the planner's defaults"""
+
+    enable_seqscan = True
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeded = cls.seed(
+            plays=scaled(2000),
+            performances_per_play=50,
+            reservations=scaled(400_000),
+        )
+
+    def test_list_endpoints_do_not_scan_tables(self):
+        self.check_list_endpoints(self.seeded)
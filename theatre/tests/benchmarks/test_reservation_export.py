@@ -0,0 +1,106 @@
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket
+)
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+
+EXPORT_URL = reverse("theatre:reservation-export")
+ROWS = 40
+SEATS_IN_ROW = 50
+TICKETS_PER_RESERVATION = 8
+PEAK_MEMORY_LIMIT = 32 * 1024 * 1024
+
+
+class ReservationExportBenchmark(BenchmarkTestCase):
+    """Peak memory of streaming 1M tickets as JSON Lines and CSV"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        hall = TheatreHall.objects.create(
+            name="Main", rows=ROWS, seats_in_row=SEATS_IN_ROW
+        )
+        play = Play.objects.create(title="Play", description="Description")
+        start = datetime(2024, 1, 1, 19, tzinfo=timezone.utc)
+        performances = Performance.objects.bulk_create(
+            Performance(
+                play=play,
+                theatre_hall=hall,
+                show_time=start + timedelta(days=day),
+            )
+            for day in range(scaled(500))
+        )
+        places = [
+            (row, seat)
+            for row in range(1, ROWS + 1)
+            for seat in range(1, SEATS_IN_ROW + 1)
+        ]
+
+        for performance in performances:
+            reservations = Reservation.objects.bulk_create(
+                Reservation(user=cls.admin)
+                for _ in range(len(places) // TICKETS_PER_RESERVATION)
+            )
+            Ticket.objects.bulk_create(
+                (
+                    Ticket(
+                        row=row,
+                        seat=seat,
+                        performance=performance,
+                        reservation=reservations[
+                            index // TICKETS_PER_RESERVATION
+                        ],
+                    )
+                    for index, (row, seat) in enumerate(places)
+                ),
+                batch_size=2000,
+            )
+
+        cls.tickets = len(performances) * len(places)
+
+    def test_export_memory(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        def export(output):
+            response = client.get(EXPORT_URL, {"output": output})
+            lines = 0
+            size = 0
+            for chunk in response.streaming_content:
+                lines += chunk.count(b"\n")
+                size += len(chunk)
+            return lines, size
+
+        for output in ("jsonl", "csv"):
+            start = time.perf_counter()
+            lines, size = export(output)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            export(output)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            self.report(
+                f"export_{output}",
+                [elapsed * 1000],
+                rows=self.tickets,
+                megabytes=size // 2 ** 20,
+                peak_memory_mb=round(peak / 2 ** 20, 1),
+                rows_per_second=int(self.tickets / elapsed),
+            )
+            self.assertGreaterEqual(lines, self.tickets)
+            self.assertLess(peak, PEAK_MEMORY_LIMIT)
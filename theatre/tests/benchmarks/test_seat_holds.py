@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+
+from theatre.seat_holds import InMemorySeatHoldStore, DatabaseSeatHoldStore
+from theatre.tests.benchmarks.base import (
+    BenchmarkTransactionTestCase,
+    scaled,
+)
+from theatre.tests.test_seat_holds import (
+    sample_performance,
+    hammer_seat_holds,
+)
+
+BUYERS = 16
+ATTEMPTS = 200
+
+
+class SeatHoldContentionBenchmark(BenchmarkTransactionTestCase):
+    """On-sale spike: many buyers racing for seats of one performance"""
+
+    def setUp(self):
+        self.performance = sample_performance()
+        self.users = [
+            get_user_model().objects.create_user(
+                f"buyer{number}@test.com", "testpass"
+            )
+            for number in range(BUYERS)
+        ]
+        self.places = [(1, seat) for seat in range(1, 11)] + [
+            (row, seat) for row in range(2, 11) for seat in range(1, 11)
+        ]
+
+    def _run(self, name, store):
+        attempts = scaled(ATTEMPTS)
+        holds_by_place, conflicts, elapsed = hammer_seat_holds(
+            store, self.performance, self.users, attempts, self.places
+        )
+        total = BUYERS * attempts
+        held = sum(len(tokens) for tokens in holds_by_place.values())
+
+        self.assertTrue(all(len(t) <= 1 for t in holds_by_place.values()))
+        self.report(
+            name,
+            attempts=total,
+            held=held,
+            throughput=f"{total / elapsed:.0f}/s",
+            conflict_rate=f"{conflicts / total:.1%}",
+        )
+
+    def test_in_memory_store(self):
+        self._run("in_memory_store", InMemorySeatHoldStore())
+
+    def test_database_store(self):
+        self._run("database_store", DatabaseSeatHoldStore())
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from rest_framework.renderers import JSONRenderer
+
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+from theatre.serializers import PerformanceListSerializer, PlayListSerializer
+from theatre.tests.benchmarks.base import BenchmarkTestCase, scaled
+from theatre.views import PerformanceViewSet, PlayViewSet
+
+
+class ValuesListBenchmark(BenchmarkTestCase):
+    """Rows per second of model serializers vs values() representation"""
+
+    @classmethod
+    def setUpTestData(cls):
+        hall = TheatreHall.objects.create(
+            name="Main", rows=20, seats_in_row=20
+        )
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=f"First{number}", last_name=f"Last{number}")
+            for number in range(100)
+        )
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"Genre{number}") for number in range(10)
+        )
+        plays = Play.objects.bulk_create(
+            Play(title=f"Play{number}", description="Description " * 20)
+            for number in range(scaled(1000))
+        )
+        Play.actors.through.objects.bulk_create(
+            Play.actors.through(play=play, actor=actors[(index + step) % 100])
+            for index, play in enumerate(plays)
+            for step in range(5)
+        )
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(play=play, genre=genres[index % 10])
+            for index, play in enumerate(plays)
+        )
+        start = datetime(2024, 1, 1, 19, tzinfo=timezone.utc)
+        Performance.objects.bulk_create(
+            (
+                Performance(
+                    play=plays[number % len(plays)],
+                    theatre_hall=hall,
+                    show_time=start + timedelta(hours=number),
+                    duration=timedelta(hours=1),
+                )
+                for number in range(scaled(10_000))
+            ),
+            batch_size=5000,
+        )
+
+    def _compare(self, name, queryset, serializer_class):
+        renderer = JSONRenderer()
+        rows = queryset.values(*serializer_class.values_fields)
+        count = queryset.count()
+
+        def serialize():
+            return renderer.render(
+                serializer_class(queryset.all(), many=True).data
+            )
+
+        def represent():
+            return renderer.render(
+                serializer_class.values_to_representation(rows.all())
+            )
+
+        self.assertEqual(serialize(), represent())
+        for path, func in (("serializer", serialize), ("values", represent)):
+            timings = self.measure(func, repeat=5)
+            self.report(
+                f"{name}_{path}",
+                timings,
+                rows=count,
+                rows_per_second=int(count / (min(timings) / 1000)),
+            )
+
+    def test_performance_list(self):
+        self._compare(
+            "performances",
+            PerformanceViewSet.queryset.order_by("show_time", "id"),
+            PerformanceListSerializer,
+        )
+
+    def test_play_list(self):
+        self._compare(
+            "plays",
+            PlayViewSet.queryset.order_by("id"),
+            PlayListSerializer,
+        )
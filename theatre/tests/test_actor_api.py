@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Actor
+from theatre.search import trigram_enabled
+
+AUTOCOMPLETE_URL = reverse("theatre:actor-autocomplete")
+
+
+def sample_actor(first_name, last_name):
+    return Actor.objects.create(first_name=first_name, last_name=last_name)
+
+
+class ActorAutocompleteApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "test@test.com",
+                "testpass",
+            )
+        )
+        self.mckellen = sample_actor("Ian", "McKellen")
+        self.mcdiarmid = sample_actor("Ian", "McDiarmid")
+        self.dench = sample_actor("Judi", "Dench")
+
+    def test_autocomplete_requires_authentication(self):
+        res = APIClient().get(AUTOCOMPLETE_URL, {"q": "ian"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_autocomplete_by_name_prefix(self):
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": "mC"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            [
+                {"id": self.mcdiarmid.id, "name": "Ian McDiarmid"},
+                {"id": self.mckellen.id, "name": "Ian McKellen"},
+            ],
+        )
+
+    def test_autocomplete_matches_every_word(self):
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": "ian mck"})
+
+        self.assertEqual(
+            [actor["id"] for actor in res.data], [self.mckellen.id]
+        )
+
+    def test_autocomplete_lists_last_name_matches_first(self):
+        dexter = sample_actor("Dexter", "Abbot")
+
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": "de"})
+
+        self.assertEqual(
+            [actor["id"] for actor in res.data], [self.dench.id, dexter.id]
+        )
+
+    def test_autocomplete_limit(self):
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": "ian", "limit": 1})
+        self.assertEqual(len(res.data), 1)
+
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": "ian", "limit": 21})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete_requires_query(self):
+        res = self.client.get(AUTOCOMPLETE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete_is_cacheable(self):
+        self.client.get(AUTOCOMPLETE_URL, {"q": "jud"})
+
+        with self.assertNumQueries(0):
+            res = self.client.get(AUTOCOMPLETE_URL, {"q": "jud"})
+
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertIn("max-age=60", res["Cache-Control"])
+        self.assertIn("private", res["Cache-Control"])
+
+    def test_actor_change_invalidates_autocomplete(self):
+        self.client.get(AUTOCOMPLETE_URL, {"q": "jud"})
+
+        self.dench.first_name = "Judith"
+        self.dench.save()
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": "jud"})
+
+        self.assertEqual(res.data[0]["name"], "Judith Dench")
+
+    def test_autocomplete_tolerates_typos(self):
+        if not trigram_enabled():
+            self.skipTest("pg_trgm extension is not installed")
+
+        res = self.client.get(AUTOCOMPLETE_URL, {"q": "mckelen"})
+
+        self.assertEqual(res.data[0]["id"], self.mckellen.id)
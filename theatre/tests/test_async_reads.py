@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta, timezone
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, resolve, reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.async_views import async_reads
+from theatre.models import TheatreHall, Play, Performance, Actor, Genre
+from theatre.urls import router
+
+# The project URLs with the async read path, as THEATRE_ASYNC_READS=1
+urlpatterns = [
+    path(
+        "api/theatre/",
+        include((async_reads(router.urls), "theatre"), namespace="theatre"),
+    ),
+    path("api/user/", include("user.urls", namespace="user")),
+]
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+PLAY_URL = reverse("theatre:play-list")
+
+
+def performance_detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+def play_detail_url(play_id):
+    return reverse("theatre:play-detail", args=[play_id])
+
+
+class AsyncReadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        hall = TheatreHall.objects.create(
+            name="TestHall", rows=10, seats_in_row=10
+        )
+        actors = [
+            Actor.objects.create(first_name="George", last_name="Clooney"),
+            Actor.objects.create(first_name="Brad", last_name="Pitt"),
+        ]
+        genres = [
+            Genre.objects.create(name="Drama"),
+            Genre.objects.create(name="Comedy"),
+        ]
+        self.plays = []
+        for number in range(25):
+            play = Play.objects.create(
+                title=f"Hamlet {number}", description="Description"
+            )
+            play.actors.set(actors[: number % 2 + 1])
+            play.genres.set(genres[number % 2:])
+            self.plays.append(play)
+        Play.objects.touch()
+        start = datetime(2024, 6, 1, 19, tzinfo=timezone.utc)
+        self.performances = [
+            Performance.objects.create(
+                play=self.plays[number % 5],
+                theatre_hall=hall,
+                show_time=start + timedelta(days=number),
+            )
+            for number in range(25)
+        ]
+
+    def _sync_get(self, url, data=None, **headers):
+        return self.client.get(url, data, headers={**self.headers, **headers})
+
+    def _async_get(self, url, data=None, **headers):
+        with override_settings(ROOT_URLCONF=__name__):
+            return async_to_sync(self.async_client.get)(
+                url, data, headers={**self.headers, **headers}
+            )
+
+    def assertSameResponse(self, url, data=None, **headers):
+        """Sync and async responses and query counts of a cold cache"""
+        with CaptureQueriesContext(connection) as sync_queries:
+            sync_res = self._sync_get(url, data, **headers)
+        cache.clear()
+        with CaptureQueriesContext(connection) as async_queries:
+            async_res = self._async_get(url, data, **headers)
+        cache.clear()
+
+        self.assertEqual(async_res.status_code, sync_res.status_code)
+        self.assertEqual(async_res.content, sync_res.content)
+        for header in ("Content-Type", "ETag", "Last-Modified", "X-Cache"):
+            self.assertEqual(async_res.get(header), sync_res.get(header))
+        self.assertEqual(len(async_queries), len(sync_queries))
+        return async_res
+
+    def test_routes_are_async(self):
+        for url in (
+            PERFORMANCE_URL,
+            PLAY_URL,
+            performance_detail_url(1),
+            play_detail_url(1),
+        ):
+            self.assertTrue(
+                iscoroutinefunction(resolve(url, urlconf=__name__).func)
+            )
+
+    def test_performance_list(self):
+        res = self.assertSameResponse(PERFORMANCE_URL)
+        self.assertEqual(len(res.json()["results"]), 20)
+
+        self.assertSameResponse(res.json()["next"])
+        self.assertSameResponse(PERFORMANCE_URL, {"date": "2024-06-03"})
+        self.assertSameResponse(
+            PERFORMANCE_URL,
+            {"date_from": "2024-06-03", "date_to": "2024-06-10"},
+        )
+        self.assertSameResponse(PERFORMANCE_URL, {"play": self.plays[1].id})
+        self.assertSameResponse(PERFORMANCE_URL, {"page_size": 5})
+
+    def test_performance_list_invalid_params(self):
+        res = self.assertSameResponse(
+            PERFORMANCE_URL,
+            {"date_from": "2024-06-10", "date_to": "2024-06-03"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_performance_detail(self):
+        url = performance_detail_url(self.performances[2].id)
+
+        res = self.assertSameResponse(url)
+        self.assertEqual(res.json()["play"]["actors"], ["George Clooney"])
+
+        self.assertSameResponse(url, If_None_Match=res["ETag"])
+        self.assertEqual(
+            self._async_get(url, If_None_Match=res["ETag"]).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+    def test_not_found(self):
+        for url in (
+            performance_detail_url(0),
+            play_detail_url(0),
+            PERFORMANCE_URL + "abc/",
+        ):
+            res = self.assertSameResponse(url)
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_play_list(self):
+        res = self.assertSameResponse(PLAY_URL)
+        self.assertEqual(len(res.json()["results"]), 20)
+
+        self.assertSameResponse(res.json()["next"])
+        self.assertSameResponse(PLAY_URL, {"q": "hamlet"})
+        self.assertSameResponse(PLAY_URL, {"title": "1"})
+        self.assertSameResponse(PLAY_URL, {"genres": "1,2"})
+
+    @override_settings(THEATRE_VALUES_LIST=True)
+    def test_values_list(self):
+        self.assertSameResponse(PLAY_URL)
+        self.assertSameResponse(PERFORMANCE_URL)
+
+    def test_play_detail(self):
+        res = self.assertSameResponse(play_detail_url(self.plays[1].id))
+
+        self.assertEqual(
+            res.json()["actors"], ["George Clooney", "Brad Pitt"]
+        )
+
+    def test_catalog_cache(self):
+        first = self._async_get(PLAY_URL)
+        second = self._async_get(PLAY_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.content, first.content)
+
+    @override_settings(
+        THEATRE_METRICS_SAMPLE_RATE=1, THEATRE_QUERY_DETECTOR="raise"
+    )
+    def test_async_middleware(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self._async_get(PLAY_URL)
+
+        self.assertIn(f'desc="{len(queries)} queries"', res["Server-Timing"])
+
+    def test_authentication(self):
+        self.headers = {}
+        res = self.assertSameResponse(PLAY_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        res = self.assertSameResponse(
+            PLAY_URL, Authorization="Bearer invalid"
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = False
+        self.user.save()
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        res = self.assertSameResponse(PLAY_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_writes_use_the_sync_view(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        with override_settings(ROOT_URLCONF=__name__):
+            res = async_to_sync(self.async_client.post)(
+                PERFORMANCE_URL,
+                {
+                    "play": self.plays[0].id,
+                    "theatre_hall": self.performances[0].theatre_hall_id,
+                    "show_time": "2030-01-01T19:00:00Z",
+                },
+                content_type="application/json",
+                headers=self.headers,
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.cache import catalog_cache_stats
+from theatre.models import Play, Genre, Actor
+
+PLAY_URL = reverse("theatre:play-list")
+GENRE_URL = reverse("theatre:genre-list")
+
+
+def detail_url(play_id):
+    return reverse("theatre:play-detail", args=[play_id])
+
+
+class CatalogCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        catalog_cache_stats.reset()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.genre = Genre.objects.create(name="Drama")
+        self.play = Play.objects.create(
+            title="Hamlet", description="Description"
+        )
+        self.play.genres.add(self.genre)
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get(PLAY_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(PLAY_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(catalog_cache_stats.hits, 1)
+        self.assertEqual(catalog_cache_stats.misses, 1)
+
+    def test_cache_key_depends_on_query_params_and_role(self):
+        self.client.get(PLAY_URL)
+
+        res = self.client.get(PLAY_URL, {"title": "Ham"})
+        self.assertEqual(res["X-Cache"], "MISS")
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+        res = admin_client.get(PLAY_URL)
+        self.assertEqual(res["X-Cache"], "MISS")
+
+    def test_genre_change_invalidates_play_list(self):
+        self.client.get(PLAY_URL)
+
+        self.genre.name = "Tragedy"
+        self.genre.save()
+        res = self.client.get(PLAY_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["genres"], ["Tragedy"])
+
+    def test_play_relations_change_invalidates_play_detail(self):
+        self.client.get(detail_url(self.play.id))
+
+        self.play.actors.add(
+            Actor.objects.create(first_name="Ian", last_name="McKellen")
+        )
+        res = self.client.get(detail_url(self.play.id))
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["actors"], ["Ian McKellen"])
+
+    def test_deleting_genre_invalidates_genre_list(self):
+        self.client.get(GENRE_URL)
+
+        self.genre.delete()
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_unauthenticated_request_is_not_served_from_cache(self):
+        self.client.get(PLAY_URL)
+
+        res = APIClient().get(PLAY_URL)
+
+        self.assertEqual(res.status_code, 401)
@@ -0,0 +1,180 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import generics, status
+from rest_framework.test import (
+    APIClient,
+    APIRequestFactory,
+    force_authenticate,
+)
+
+from theatre.conditional import ConditionalRetrieveMixin
+from theatre.models import TheatreHall, Play, Performance, Actor, Genre
+from theatre.serializers import PlaySerializer
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def play_detail_url(play_id):
+    return reverse("theatre:play-detail", args=[play_id])
+
+
+def performance_detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.play = Play.objects.create(
+            title="PlayTitle",
+            description="PlayDescription"
+        )
+        self.performance = Performance.objects.create(
+            play=self.play,
+            theatre_hall=TheatreHall.objects.create(
+                name="TestHall", rows=10, seats_in_row=10
+            ),
+            show_time="2024-06-07T00:00:00Z"
+        )
+
+    def _revalidate(self, url, res):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+
+    def test_performance_detail_200_304_200_after_purchase(self):
+        url = performance_detail_url(self.performance.id)
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", first)
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(1):
+            not_modified = self._revalidate(url, first)
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(not_modified.content, b"")
+
+        self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"row": 1, "seat": 1, "performance": self.performance.id}
+            ]},
+            format="json",
+        )
+        after_purchase = self._revalidate(url, first)
+
+        self.assertEqual(after_purchase.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(after_purchase["ETag"], first["ETag"])
+        self.assertEqual(
+            after_purchase.data["taken_places"], [{"row": 1, "seat": 1}]
+        )
+
+    def test_performance_detail_if_modified_since_alone_is_200(self):
+        url = performance_detail_url(self.performance.id)
+        first = self.client.get(url)
+
+        # A purchase within the second of Last-Modified
+        self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"row": 1, "seat": 1, "performance": self.performance.id}
+            ]},
+            format="json",
+        )
+        res = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_places"], [{"row": 1, "seat": 1}])
+        self.assertIn("ETag", res)
+
+    def test_play_change_invalidates_performance_etag(self):
+        url = performance_detail_url(self.performance.id)
+        first = self.client.get(url)
+
+        self.play.title = "Changed"
+        self.play.save()
+
+        self.assertEqual(
+            self._revalidate(url, first).status_code, status.HTTP_200_OK
+        )
+
+    def test_performance_detail_200_304_200_after_hall_rename(self):
+        url = performance_detail_url(self.performance.id)
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._revalidate(url, first).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        hall = self.performance.theatre_hall
+        hall.name = "Renamed"
+        hall.save()
+        res = self._revalidate(url, first)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["theatre_hall"]["name"], "Renamed")
+
+    def test_play_detail_200_304_200_after_relations_change(self):
+        url = play_detail_url(self.play.id)
+
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        not_modified = self._revalidate(url, first)
+        self.assertEqual(
+            not_modified.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+        actor = Actor.objects.create(first_name="Ian", last_name="McKellen")
+        self.play.actors.add(actor)
+        res = self._revalidate(url, first)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["actors"], ["Ian McKellen"])
+
+        actor.last_name = "Holm"
+        actor.save()
+        res = self._revalidate(url, res)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["actors"], ["Ian Holm"])
+
+    def test_genre_added_from_genre_side_changes_play_etag(self):
+        url = play_detail_url(self.play.id)
+        first = self.client.get(url)
+
+        Genre.objects.create(name="Drama").plays.add(self.play)
+
+        self.assertEqual(
+            self._revalidate(url, first).status_code, status.HTTP_200_OK
+        )
+
+    def test_missing_object_is_404(self):
+        res = self.client.get(performance_detail_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_without_last_modified_fields(self):
+        class PlayView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
+            queryset = Play.objects.all()
+            serializer_class = PlaySerializer
+
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, self.user)
+
+        with self.assertRaisesMessage(
+            ImproperlyConfigured, "PlayView must set last_modified_fields"
+        ):
+            PlayView.as_view()(request, pk=self.play.id)
@@ -0,0 +1,181 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    TheatreHall,
+)
+
+REPLICA = "replica"
+
+PLAY_URL = reverse("theatre:play-list")
+GENRE_URL = reverse("theatre:genre-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+CATALOG_URLS = (
+    PLAY_URL,
+    GENRE_URL,
+    PERFORMANCE_URL,
+    reverse("theatre:actor-list"),
+    reverse("theatre:theatrehall-list"),
+)
+
+
+def performance_detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+@override_settings(THEATRE_READ_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    A second connection to the test database stands in for a replica,
+    the tests check which connection each request queried. It is added
+    once the test databases are set up, so the test runner and the
+    flush between tests leave it alone
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        connections.settings[REPLICA] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(
+            name="TestHall", rows=10, seats_in_row=10
+        )
+        Actor.objects.create(first_name="George", last_name="Clooney")
+        Genre.objects.create(name="Drama")
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Text"),
+            theatre_hall=hall,
+            show_time="2030-06-01T19:00:00Z",
+        )
+        # Creating the catalog pinned it to the primary
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _get(self, url, data=None, client=None):
+        """Response and query counts of the primary and the replica"""
+        with CaptureQueriesContext(
+            connections[DEFAULT_DB_ALIAS]
+        ) as primary, CaptureQueriesContext(connections[REPLICA]) as replica:
+            res = (client or self.client).get(url, data)
+        cache.clear()
+        return res, len(primary), len(replica)
+
+    def test_catalog_reads_use_the_replica(self):
+        for url in (
+            *CATALOG_URLS,
+            performance_detail_url(self.performance.id),
+        ):
+            res, primary, replica = self._get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(primary, 0, url)
+            self.assertGreater(replica, 0, url)
+
+    def test_writes_use_the_primary(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            res = self.client.post(GENRE_URL, {"name": "Comedy"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(replica), 0)
+        self.assertEqual(router.db_for_write(Genre), DEFAULT_DB_ALIAS)
+
+    def test_reservation_pins_the_user_to_the_primary(self):
+        res = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "performance": self.performance.id}
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res, primary, replica = self._get(
+            performance_detail_url(self.performance.id)
+        )
+        self.assertEqual(res.data["taken_places"], [{"row": 1, "seat": 1}])
+        self.assertEqual(replica, 0)
+
+        other_client = APIClient()
+        other_client.force_authenticate(
+            get_user_model().objects.create_user("other@test.com", "pass")
+        )
+        _, primary, replica = self._get(PERFORMANCE_URL, client=other_client)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_catalog_change_pins_the_catalog_to_the_primary(self):
+        Genre.objects.create(name="Comedy")
+
+        _, primary, replica = self._get(PLAY_URL)
+
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_fresh_seat_availability_uses_the_primary(self):
+        for url in (
+            PERFORMANCE_URL,
+            performance_detail_url(self.performance.id),
+        ):
+            _, primary, replica = self._get(url, {"fresh": "true"})
+
+            self.assertGreater(primary, 0)
+            self.assertEqual(replica, 0)
+
+    @override_settings(THEATRE_READ_REPLICAS=[])
+    def test_without_replicas(self):
+        _, primary, replica = self._get(PLAY_URL)
+
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    @override_settings(ROOT_URLCONF="theatre.tests.test_async_reads")
+    def test_async_reads_use_the_replica(self):
+        token = AccessToken.for_user(self.user)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            res = async_to_sync(self.async_client.get)(
+                PERFORMANCE_URL, headers=headers
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(replica), 0)
+
+    def test_migrations_skip_replicas(self):
+        self.assertFalse(router.allow_migrate(REPLICA, "theatre"))
+        self.assertTrue(router.allow_migrate(DEFAULT_DB_ALIAS, "theatre"))
@@ -0,0 +1,118 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from theatre.models import (
+    TheatreHall,
+    Genre,
+    Actor,
+    Play,
+    Performance,
+    Reservation,
+    Ticket
+)
+
+VOLUMES = {
+    "halls": 3,
+    "genres": 4,
+    "actors": 20,
+    "plays": 10,
+    "performances": 30,
+    "users": 15,
+    "tickets": 2000,
+}
+
+
+def seed(**params):
+    options = {**VOLUMES, **params}
+    out = StringIO()
+    call_command(
+        "seed_load_data",
+        *(
+            f"--{name.replace('_', '-')}={value}"
+            for name, value in options.items()
+        ),
+        stdout=out,
+    )
+    return out.getvalue()
+
+
+def snapshot():
+    return (
+        list(
+            Performance.objects.order_by("id").values_list(
+                "play__title",
+                "theatre_hall__name",
+                "show_time",
+                "duration",
+                "seat_map",
+                "tickets_sold",
+            )
+        ),
+        list(
+            Ticket.objects.order_by("id").values_list(
+                "performance__show_time",
+                "performance__theatre_hall__name",
+                "row",
+                "seat",
+                "reservation__user__email",
+            )
+        ),
+    )
+
+
+class SeedLoadDataTests(TestCase):
+    def test_volumes(self):
+        out = seed()
+
+        self.assertEqual(TheatreHall.objects.count(), 3)
+        self.assertEqual(Genre.objects.count(), 4)
+        self.assertEqual(Actor.objects.count(), 20)
+        self.assertEqual(Play.objects.count(), 10)
+        self.assertEqual(Performance.objects.count(), 30)
+        self.assertEqual(get_user_model().objects.count(), 15)
+        self.assertEqual(Ticket.objects.count(), 2000)
+        self.assertEqual(
+            Reservation.objects.filter(tickets__isnull=True).count(), 0
+        )
+        self.assertFalse(
+            Play.objects.filter(search_vector__isnull=True).exists()
+        )
+        self.assertIn("2000 tickets", out)
+
+    def test_seat_maps_match_tickets(self):
+        seed(batch_size=7)
+
+        out = StringIO()
+        call_command("reconcile_tickets_sold", "--dry-run", stdout=out)
+
+        self.assertIn("Drifted performances: 0", out.getvalue())
+        self.assertFalse(
+            Reservation.objects.annotate(
+                performances=Count("tickets__performance", distinct=True)
+            )
+            .exclude(performances=1)
+            .exists()
+        )
+
+    def test_same_seed_same_data(self):
+        seed(seed=7)
+        first = snapshot()
+
+        for model in (TheatreHall, Genre, Actor, Play, get_user_model()):
+            model.objects.all().delete()
+        seed(seed=7)
+
+        self.assertEqual(snapshot(), first)
+
+    def test_invalid_volumes(self):
+        with self.assertRaises(CommandError):
+            seed(performances=1, tickets=10_000)
+
+        with self.assertRaises(CommandError):
+            seed(halls=0)
+
+        self.assertFalse(Performance.objects.exists())
@@ -0,0 +1,134 @@
+import re
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.metrics import RequestMetricsMiddleware, request_metrics
+from theatre.models import Actor, Genre
+from theatre.serializers import GenreSerializer
+
+GENRE_URL = reverse("theatre:genre-list")
+METRICS_URL = reverse("metrics")
+METRICS_TOKEN = "scraper-token"
+
+OFF_OVERHEAD_BUDGET_US = 50
+
+
+@override_settings(
+    THEATRE_METRICS_SAMPLE_RATE=1, THEATRE_METRICS_TOKEN=METRICS_TOKEN
+)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        request_metrics.reset()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        Genre.objects.create(name="Drama")
+
+    def _scrape(self):
+        res = self.client.get(
+            METRICS_URL, headers={"Authorization": f"Bearer {METRICS_TOKEN}"}
+        )
+        self.assertEqual(res.status_code, 200)
+        return res.content.decode()
+
+    def test_metrics_require_the_token(self):
+        self.client.get(GENRE_URL)
+
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, 401)
+        self.assertNotIn(b"GenreViewSet", res.content)
+
+        res = self.client.get(
+            METRICS_URL, headers={"Authorization": "Bearer wrong"}
+        )
+        self.assertEqual(res.status_code, 401)
+
+        with override_settings(THEATRE_METRICS_TOKEN=""):
+            self.assertEqual(self.client.get(METRICS_URL).status_code, 404)
+
+    def test_server_timing_header(self):
+        with self.assertNumQueries(1) as context:
+            res = self.client.get(GENRE_URL)
+
+        self.assertRegex(
+            res["Server-Timing"],
+            rf'^db;dur=[\d.]+;desc="{len(context.captured_queries)} '
+            rf'queries", serialize;dur=[\d.]+, render;dur=[\d.]+, '
+            rf"total;dur=[\d.]+$",
+        )
+
+    def test_serialization_time(self):
+        with mock.patch.object(
+            GenreSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=lambda serializer, genre: time.sleep(0.01) or {},
+        ):
+            res = self.client.get(GENRE_URL)
+
+        serialize_ms = float(
+            re.search(r"serialize;dur=([\d.]+)", res["Server-Timing"])[1]
+        )
+        self.assertGreaterEqual(serialize_ms, 10)
+        self.assertIn(
+            'theatre_request_serialize_duration_seconds_count{view="'
+            'GenreViewSet",action="list"} 1',
+            self._scrape(),
+        )
+
+    def test_metrics_are_tagged_by_view_and_action(self):
+        actor = Actor.objects.create(first_name="George", last_name="Clooney")
+        self.client.get(GENRE_URL)
+        self.client.get(GENRE_URL)
+        self.client.get(reverse("theatre:actor-detail", args=[actor.id]))
+        self.client.get(reverse("theatre:actor-autocomplete"), {"q": "Clo"})
+        self.client.get(reverse("user:manage"))
+
+        text = self._scrape()
+
+        self.assertIn(
+            "# TYPE theatre_request_duration_seconds histogram", text
+        )
+        labels = 'view="GenreViewSet",action="list"'
+        self.assertIn(
+            f"theatre_request_duration_seconds_count{{{labels}}} 2", text
+        )
+        self.assertIn(
+            f'theatre_request_queries_bucket{{{labels},le="+Inf"}} 2', text
+        )
+        self.assertIn('view="ActorViewSet",action="retrieve"', text)
+        self.assertIn('view="ActorViewSet",action="autocomplete"', text)
+        self.assertIn('view="ManageUserView",action="get"', text)
+
+    @override_settings(THEATRE_METRICS_SAMPLE_RATE=0)
+    def test_sampling_off(self):
+        res = self.client.get(GENRE_URL)
+
+        self.assertNotIn("Server-Timing", res)
+        self.assertNotIn("GenreViewSet", self._scrape())
+
+    @override_settings(THEATRE_METRICS_SAMPLE_RATE=0)
+    def test_overhead_when_sampling_is_off(self):
+        response = HttpResponse()
+        request = RequestFactory().get(GENRE_URL)
+        middleware = RequestMetricsMiddleware(lambda request: response)
+        calls = 10_000
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            middleware(request)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed / calls * 1e6, OFF_OVERHEAD_BUDGET_US)
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall
+)
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def _collect_pages(self, url, params=None):
+        pages = []
+        res = self.client.get(url, params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            pages.append(res.data["results"])
+            if not res.data["next"]:
+                return pages
+            res = self.client.get(res.data["next"])
+
+    def test_performances_are_paged_by_show_time(self):
+        theatre_halls = [
+            TheatreHall.objects.create(
+                name=f"TestHall{number}", rows=10, seats_in_row=10
+            )
+            for number in range(2)
+        ]
+        play = Play.objects.create(title="Play", description="Description")
+        start = datetime(2024, 6, 7, 19, tzinfo=timezone.utc)
+        Performance.objects.bulk_create(
+            Performance(
+                play=play,
+                theatre_hall=theatre_halls[day % 2],
+                show_time=start + timedelta(days=day // 2),
+            )
+            for day in reversed(range(45))
+        )
+
+        pages = self._collect_pages(PERFORMANCE_URL)
+
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        ids = [item["id"] for page in pages for item in page]
+        self.assertEqual(
+            ids,
+            list(
+                Performance.objects.order_by("show_time", "id")
+                .values_list("id", flat=True)
+            ),
+        )
+
+    def test_catalog_lists_are_bounded(self):
+        Actor.objects.bulk_create(
+            Actor(first_name=f"First{number}", last_name="Last")
+            for number in range(30)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f"Genre{number:02}") for number in range(30)
+        )
+        Play.objects.bulk_create(
+            Play(title=f"Play{number}", description="Description")
+            for number in range(30)
+        )
+
+        for name in ("actor", "genre", "play", "theatrehall"):
+            res = self.client.get(reverse(f"theatre:{name}-list"))
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data["results"]), 20)
+
+        genre_pages = self._collect_pages(reverse("theatre:genre-list"))
+        self.assertEqual(
+            [genre["name"] for page in genre_pages for genre in page],
+            [f"Genre{number:02}" for number in range(30)],
+        )
+
+    def test_page_size_is_capped(self):
+        Actor.objects.bulk_create(
+            Actor(first_name=f"First{number}", last_name="Last")
+            for number in range(120)
+        )
+
+        res = self.client.get(
+            reverse("theatre:actor-list"), {"page_size": 1000}
+        )
+
+        self.assertEqual(len(res.data["results"]), 100)
+
+    def test_reservations_are_paged_by_created_at(self):
+        Reservation.objects.bulk_create(
+            Reservation(user=self.user) for _ in range(25)
+        )
+
+        pages = self._collect_pages(RESERVATION_URL)
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
@@ -1,6 +1,9 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -65,7 +68,7 @@ class AuthenticatedPerformanceApiTests(TestCase):
         serializer = PerformanceListSerializer(performances, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        for obj in res.data:
+        for obj in res.data["results"]:
             self.assertIn(obj, serializer.data)
 
     def test_filter_performances_by_date(self):
@@ -77,8 +80,8 @@ class AuthenticatedPerformanceApiTests(TestCase):
         serializer1 = PerformanceListSerializer(performance1)
         serializer2 = PerformanceListSerializer(performance2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_filter_performances_by_play_id(self):
         play2 = Play.objects.create(
@@ -96,8 +99,101 @@ class AuthenticatedPerformanceApiTests(TestCase):
         serializer1 = PerformanceListSerializer(performance1)
         serializer2 = PerformanceListSerializer(performance2)
 
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer1.data, res.data)
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer1.data, res.data["results"])
+
+    def _listed_ids(self, params):
+        res = self.client.get(PERFORMANCE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {performance["id"] for performance in res.data["results"]}
+
+    def test_filter_performances_by_date_range(self):
+        performances = [
+            sample_performance(show_time=show_time)
+            for show_time in (
+                "2024-03-03T23:59:00Z",
+                "2024-03-04T00:00:00Z",
+                "2024-03-10T23:59:00Z",
+                "2024-03-11T00:00:00Z",
+            )
+        ]
+        ids = [performance.id for performance in performances]
+
+        self.assertEqual(
+            self._listed_ids(
+                {"date_from": "2024-03-04", "date_to": "2024-03-10"}
+            ),
+            set(ids[1:3]),
+        )
+        self.assertEqual(
+            self._listed_ids({"date_from": "2024-03-10"}), set(ids[2:])
+        )
+        self.assertEqual(
+            self._listed_ids({"date_to": "2024-03-03"}), {ids[0]}
+        )
+
+    def test_filter_upcoming_performances(self):
+        now = timezone.now()
+        past = sample_performance(show_time=now - timedelta(hours=1))
+        upcoming = sample_performance(show_time=now + timedelta(hours=1))
+
+        self.assertEqual(
+            self._listed_ids({"upcoming": "true"}), {upcoming.id}
+        )
+        self.assertEqual(
+            self._listed_ids({"upcoming": "false"}), {past.id, upcoming.id}
+        )
+
+    def test_filter_performances_invalid_params(self):
+        for params in (
+            {"date": "2024-13-01"},
+            {"date_from": "2024-03-10", "date_to": "2024-03-04"},
+            {"play": "first"},
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(PERFORMANCE_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TIME_ZONE="Europe/Kyiv")
+    def test_filter_performances_by_date_across_dst(self):
+        # 2024-03-31 lasts 23 hours in Kyiv and 2024-10-27 lasts 25
+        performances = [
+            sample_performance(show_time=show_time)
+            for show_time in (
+                "2024-03-30T21:59:00Z",
+                "2024-03-30T22:00:00Z",
+                "2024-03-31T20:59:00Z",
+                "2024-03-31T21:00:00Z",
+                "2024-10-26T21:00:00Z",
+                "2024-10-27T21:59:00Z",
+                "2024-10-27T22:00:00Z",
+            )
+        ]
+        ids = [performance.id for performance in performances]
+
+        self.assertEqual(
+            self._listed_ids({"date": "2024-03-31"}), set(ids[1:3])
+        )
+        self.assertEqual(
+            self._listed_ids({"date": "2024-10-27"}), set(ids[4:6])
+        )
+        self.assertEqual(
+            self._listed_ids(
+                {"date_from": "2024-03-31", "date_to": "2024-10-27"}
+            ),
+            set(ids[1:6]),
+        )
+
+    @override_settings(TIME_ZONE="America/Santiago")
+    def test_filter_performances_by_date_skipping_midnight(self):
+        # Clocks in Santiago jump from 00:00 to 01:00 on 2024-09-08
+        before = sample_performance(show_time="2024-09-08T03:59:00Z")
+        first = sample_performance(show_time="2024-09-08T04:00:00Z")
+
+        self.assertEqual(self._listed_ids({"date": "2024-09-08"}), {first.id})
+        self.assertEqual(
+            self._listed_ids({"date": "2024-09-07"}), {before.id}
+        )
 
     def test_retrieve_performance(self):
         performance = sample_performance()
@@ -110,6 +206,16 @@ class AuthenticatedPerformanceApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_retrieve_performance_ignores_list_filters(self):
+        performance = sample_performance()
+
+        res = self.client.get(
+            detail_url(performance.id), {"date_from": "x", "play": "first"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["id"], performance.id)
+
     def test_create_performance_forbidden(self):
         theatre_hall = TheatreHall.objects.create(
             name="TestHall", rows=10, seats_in_row=10
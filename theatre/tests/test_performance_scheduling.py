@@ -0,0 +1,380 @@
+from datetime import datetime, timedelta
+from importlib import import_module
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.apps import apps
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import TheatreHall, Performance, Play
+from theatre.scheduling import (
+    HALL_OVERLAP_CONSTRAINT,
+    IntervalTree,
+    find_overlaps,
+    recurring_show_times,
+)
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+BULK_URL = reverse("theatre:performance-bulk")
+UTC = ZoneInfo("UTC")
+KYIV = ZoneInfo("Europe/Kyiv")
+
+
+def at(day, hour, minute=0, tz=UTC):
+    return datetime(2024, 3, day, hour, minute, tzinfo=tz)
+
+
+def detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+class IntervalTreeTests(TestCase):
+    def test_find(self):
+        tree = IntervalTree(
+            (number, at(1, number), at(1, number) + timedelta(minutes=30))
+            for number in range(0, 24, 2)
+        )
+
+        self.assertEqual(tree.find(at(1, 3), at(1, 4, 1)), 4)
+        self.assertEqual(tree.find(at(1, 22, 29), at(1, 23)), 22)
+        self.assertIsNone(tree.find(at(1, 0, 30), at(1, 2)))
+        self.assertIsNone(IntervalTree([]).find(at(1, 0), at(1, 1)))
+
+    def test_find_long_interval_ending_late(self):
+        tree = IntervalTree(
+            [
+                (1, at(1, 1), at(2, 1)),
+                (2, at(1, 2), at(1, 3)),
+                (3, at(1, 4), at(1, 5)),
+            ]
+        )
+
+        self.assertEqual(tree.find(at(1, 20), at(1, 21)), 1)
+
+
+class FindOverlapsTests(TestCase):
+    def test_overlapping_booked_performances(self):
+        hours = timedelta(hours=2)
+        booked = [(7, at(1, 18), at(1, 20)), (8, at(2, 10), at(2, 22))]
+
+        overlaps = find_overlaps(
+            [
+                (at(1, 17), at(1, 17) + hours),
+                (at(1, 20), at(1, 20) + hours),
+                (at(2, 20), at(2, 20) + hours),
+                (at(1, 12), at(1, 12) + hours),
+            ],
+            booked,
+        )
+
+        self.assertEqual(
+            overlaps, {0: "performance 7", 2: "performance 8"}
+        )
+
+    def test_overlapping_show_times(self):
+        overlaps = find_overlaps(
+            [
+                (at(1, 19), at(1, 21)),
+                (at(1, 12), at(1, 14)),
+                (at(1, 10), at(1, 20)),
+                (at(1, 21), at(1, 23)),
+            ],
+            [],
+        )
+
+        self.assertEqual(
+            overlaps,
+            {0: "show time #2", 1: "show time #2", 2: "show time #1"},
+        )
+
+
+class RecurringShowTimesTests(TestCase):
+    def test_daily_count(self):
+        show_times = recurring_show_times(
+            at(1, 19), "daily", interval=2, count=3
+        )
+
+        self.assertEqual(show_times, [at(1, 19), at(3, 19), at(5, 19)])
+
+    def test_weekly_weekdays_until(self):
+        show_times = recurring_show_times(
+            at(6, 19),
+            "weekly",
+            weekdays=[4, 2],
+            until=at(15, 19),
+        )
+
+        self.assertEqual(
+            show_times, [at(6, 19), at(8, 19), at(13, 19), at(15, 19)]
+        )
+
+    def test_limit(self):
+        show_times = recurring_show_times(
+            at(1, 19), "daily", count=100, limit=5
+        )
+
+        self.assertEqual(len(show_times), 6)
+
+    def test_local_time_kept_across_dst(self):
+        with timezone.override(KYIV):
+            show_times = recurring_show_times(
+                at(30, 19, tz=KYIV), "daily", count=2
+            )
+
+        self.assertEqual(
+            [show_time.astimezone(UTC) for show_time in show_times],
+            [at(30, 17), at(31, 16)],
+        )
+
+
+class PerformanceBulkApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+        self.play = Play.objects.create(
+            title="PlayTitle", description="PlayDescription"
+        )
+        self.hall = TheatreHall.objects.create(
+            name="TestHall", rows=10, seats_in_row=10
+        )
+
+    def _schedule(self, **payload):
+        return self.client.post(
+            BULK_URL,
+            {"play": self.play.id, "theatre_hall": self.hall.id, **payload},
+            format="json",
+        )
+
+    def test_bulk_requires_admin(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user("test@test.com", "testpass")
+        )
+
+        res = client.post(BULK_URL, {}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_show_times(self):
+        res = self._schedule(
+            show_times=["2024-03-01T19:00:00Z", "2024-03-01T14:00:00Z"],
+            duration="01:30:00",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        performance = Performance.objects.get(id=res.data[0]["id"])
+        self.assertEqual(performance.ends_at, at(1, 20, 30))
+        self.assertEqual(res.data[1]["duration"], "01:30:00")
+
+    def test_bulk_recurrence(self):
+        res = self._schedule(
+            recurrence={
+                "start": "2024-03-01T19:00:00Z",
+                "frequency": "weekly",
+                "weekdays": [4, 5],
+                "until": "2024-03-31T23:00:00Z",
+            }
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Performance.objects.count(), 10)
+
+    def test_bulk_reports_every_overlap_and_creates_nothing(self):
+        booked = Performance.objects.create(
+            play=self.play, theatre_hall=self.hall, show_time=at(1, 18)
+        )
+
+        res = self._schedule(
+            show_times=[
+                "2024-03-01T12:00:00Z",
+                "2024-03-01T19:00:00Z",
+                "2024-03-02T19:00:00Z",
+                "2024-03-02T20:00:00Z",
+            ]
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.data["show_times"]
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        self.assertIn(f"performance {booked.id}", errors[1][0])
+        self.assertIn("show time #3", errors[2][0])
+        self.assertEqual(Performance.objects.count(), 1)
+
+    def test_other_hall_does_not_overlap(self):
+        Performance.objects.create(
+            play=self.play,
+            theatre_hall=TheatreHall.objects.create(
+                name="OtherHall", rows=10, seats_in_row=10
+            ),
+            show_time=at(1, 19),
+        )
+
+        res = self._schedule(show_times=["2024-03-01T19:00:00Z"])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_invalid_payloads(self):
+        res = self._schedule()
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self._schedule(
+            recurrence={
+                "start": "2024-03-01T19:00:00Z",
+                "frequency": "daily",
+                "count": 2,
+                "until": "2024-03-31T23:00:00Z",
+            }
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with override_settings(THEATRE_BULK_SCHEDULE_LIMIT=3):
+            res = self._schedule(
+                recurrence={
+                    "start": "2024-03-01T19:00:00Z",
+                    "frequency": "daily",
+                    "count": 4,
+                }
+            )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Performance.objects.exists())
+
+    def test_bulk_query_count_does_not_depend_on_size(self):
+        with self.assertNumQueries(7):
+            self._schedule(
+                recurrence={
+                    "start": "2024-03-01T19:00:00Z",
+                    "frequency": "daily",
+                    "count": 2,
+                }
+            )
+
+        with self.assertNumQueries(7):
+            self._schedule(
+                recurrence={
+                    "start": "2024-04-01T19:00:00Z",
+                    "frequency": "daily",
+                    "count": 300,
+                }
+            )
+
+
+class PerformanceOverlapTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@admin.com", "testpass", is_staff=True
+            )
+        )
+        self.play = Play.objects.create(
+            title="PlayTitle", description="PlayDescription"
+        )
+        self.hall = TheatreHall.objects.create(
+            name="TestHall", rows=10, seats_in_row=10
+        )
+        self.booked = Performance.objects.create(
+            play=self.play, theatre_hall=self.hall, show_time=at(1, 18)
+        )
+
+    def _create(self, show_time, **payload):
+        return self.client.post(
+            PERFORMANCE_URL,
+            {
+                "play": self.play.id,
+                "theatre_hall": self.hall.id,
+                "show_time": show_time,
+                **payload,
+            },
+        )
+
+    def test_constraint_is_installed(self):
+        with self.assertRaises(IntegrityError):
+            Performance.objects.create(
+                play=self.play, theatre_hall=self.hall, show_time=at(1, 19)
+            )
+
+    def test_migration_fails_on_overlapping_performances(self):
+        migration = import_module(
+            "theatre.migrations.0020_performance_hall_overlap_constraint"
+        )
+        with connection.cursor() as cursor:
+            # ALTER TABLE refuses to run with deferred checks pending
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        with connection.schema_editor() as schema_editor:
+            schema_editor.remove_constraint(
+                Performance, migration.HALL_OVERLAP
+            )
+        other = Performance.objects.create(
+            play=self.play, theatre_hall=self.hall, show_time=at(1, 19)
+        )
+
+        with self.assertRaisesRegex(
+            RuntimeError, f"{self.booked.id} and {other.id} in hall"
+        ):
+            with connection.schema_editor() as schema_editor:
+                migration.check_no_overlaps(apps, schema_editor)
+
+        other.delete()
+        with connection.schema_editor() as schema_editor:
+            migration.check_no_overlaps(apps, schema_editor)
+            schema_editor.add_constraint(Performance, migration.HALL_OVERLAP)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_constraint WHERE conname = %s",
+                [HALL_OVERLAP_CONSTRAINT],
+            )
+            self.assertIsNotNone(cursor.fetchone())
+
+    def test_overlapping_span(self):
+        self.assertEqual(
+            list(
+                Performance.objects.overlapping(
+                    self.hall.id, at(1, 19), at(1, 21)
+                )
+            ),
+            [self.booked],
+        )
+        self.assertFalse(
+            Performance.objects.overlapping(
+                self.hall.id, at(1, 20), at(1, 21)
+            ).exists()
+        )
+
+    def _check_create_and_update(self):
+        res = self._create("2024-03-01T19:00:00Z")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(
+            f"performance {self.booked.id}", res.data["show_time"][0]
+        )
+
+        res = self._create("2024-03-01T16:00:00Z", duration="01:00:00")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.patch(
+            detail_url(self.booked.id), {"show_time": "2024-03-01T18:30:00Z"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.patch(
+            detail_url(res.data["id"]), {"duration": "04:00:00"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.patch(
+            detail_url(self.booked.id), {"show_time": "2024-03-01T16:30:00Z"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Performance.objects.count(), 2)
+
+    def test_create_and_update_reject_overlaps(self):
+        self._check_create_and_update()
@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -85,7 +87,30 @@ class AuthenticatedPlayApiTests(TestCase):
         serializer = PlayListSerializer(plays, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    def test_list_plays_in_one_query(self):
+        for number in range(3):
+            play = sample_play(title=f"Play{number}")
+            play.actors.add(
+                sample_actor(first_name=f"First{number}"), sample_actor()
+            )
+            play.genres.add(sample_genre(name=f"Genre{number}"))
+
+        with self.assertNumQueries(1):
+            res = self.client.get(PLAY_URL)
+
+        self.assertEqual(
+            [play["actors"] for play in res.data["results"]],
+            [
+                [f"First{number} Clooney", "George Clooney"]
+                for number in range(3)
+            ],
+        )
+        self.assertEqual(
+            [play["genres"] for play in res.data["results"]],
+            [[f"Genre{number}"] for number in range(3)],
+        )
 
     def test_filter_plays_by_title(self):
         play1 = sample_play(title="Play1")
@@ -96,8 +121,8 @@ class AuthenticatedPlayApiTests(TestCase):
         serializer1 = PlayListSerializer(play1)
         serializer2 = PlayListSerializer(play2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_filter_plays_by_actors(self):
         play1 = sample_play(title="Play1")
@@ -123,9 +148,9 @@ class AuthenticatedPlayApiTests(TestCase):
         serializer2 = PlayListSerializer(play2)
         serializer3 = PlayListSerializer(play_with_out_actors)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
 
     def test_filter_plays_by_genres(self):
         play1 = sample_play(title="Play1")
@@ -145,9 +170,69 @@ class AuthenticatedPlayApiTests(TestCase):
         serializer2 = PlayListSerializer(play2)
         serializer3 = PlayListSerializer(play_with_out_genres)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
+
+    def test_filter_plays_by_genres_and_actors_without_duplicates(self):
+        play = sample_play(title="Play1")
+        genre1 = sample_genre(name="genre1")
+        genre2 = sample_genre(name="genre2")
+        actor1 = sample_actor(first_name="Actor1")
+        actor2 = sample_actor(first_name="Actor2")
+        play.genres.add(genre1, genre2)
+        play.actors.add(actor1, actor2)
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(
+                PLAY_URL,
+                {
+                    "genres": f"{genre1.id},{genre2.id}",
+                    "actors": f"{actor1.id},{actor2.id}",
+                },
+            )
+
+        for query in context.captured_queries:
+            self.assertNotIn("DISTINCT", query["sql"])
+        self.assertEqual(
+            [result["id"] for result in res.data["results"]], [play.id]
+        )
+
+    def test_filter_plays_by_all_genres(self):
+        genre1 = sample_genre(name="genre1")
+        genre2 = sample_genre(name="genre2")
+        play_with_both = sample_play(title="Play1")
+        play_with_both.genres.add(genre1, genre2)
+        play_with_one = sample_play(title="Play2")
+        play_with_one.genres.add(genre1)
+
+        res = self.client.get(
+            PLAY_URL, {"genres_all": f"{genre1.id},{genre2.id}"}
+        )
+
+        self.assertEqual(
+            [result["id"] for result in res.data["results"]],
+            [play_with_both.id],
+        )
+
+    def test_filter_plays_by_all_actors_and_any_genre(self):
+        actor1 = sample_actor(first_name="Actor1")
+        actor2 = sample_actor(first_name="Actor2")
+        genre = sample_genre()
+        play = sample_play(title="Play1")
+        play.actors.add(actor1, actor2)
+        play.genres.add(genre)
+        play_without_genre = sample_play(title="Play2")
+        play_without_genre.actors.add(actor1, actor2)
+
+        res = self.client.get(
+            PLAY_URL,
+            {"actors_all": f"{actor1.id},{actor2.id}", "genres": genre.id},
+        )
+
+        self.assertEqual(
+            [result["id"] for result in res.data["results"]], [play.id]
+        )
 
     def test_retrieve_play(self):
         play = sample_play()
@@ -242,3 +327,62 @@ class AdminPlayApiTest(TestCase):
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class PlaySearchApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.hamlet = sample_play(
+            title="Hamlet", description="The prince of Denmark"
+        )
+        self.lear = sample_play(
+            title="King Lear", description="An old king divides his kingdom"
+        )
+        self.comedy = sample_play(
+            title="Twelfth Night", description="Shipwrecked twins in Illyria"
+        )
+        self.hamlet.actors.add(
+            sample_actor(first_name="Kenneth", last_name="Branagh")
+        )
+        self.comedy.genres.add(sample_genre(name="Comedy"))
+
+    def _search(self, text):
+        res = self.client.get(PLAY_URL, {"q": text})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [play["id"] for play in res.data["results"]]
+
+    def test_search_by_title_description_actor_and_genre(self):
+        self.assertEqual(self._search("hamlet"), [self.hamlet.id])
+        self.assertEqual(self._search("denmark"), [self.hamlet.id])
+        self.assertEqual(self._search("branagh"), [self.hamlet.id])
+        self.assertEqual(self._search("comedy"), [self.comedy.id])
+        self.assertEqual(self._search("opera"), [])
+
+    def test_search_ranks_title_matches_first(self):
+        lear_in_description = sample_play(
+            title="Retelling", description="Lear and Lear again"
+        )
+
+        self.assertEqual(
+            self._search("lear"), [self.lear.id, lear_in_description.id]
+        )
+
+    def test_search_follows_related_changes(self):
+        actor = self.hamlet.actors.get()
+        actor.last_name = "Olivier"
+        actor.save()
+
+        self.assertEqual(self._search("branagh"), [])
+        self.assertEqual(self._search("olivier"), [self.hamlet.id])
+
+        actor.delete()
+        self.assertEqual(self._search("olivier"), [])
+
+        Genre.objects.get(name="Comedy").plays.clear()
+        self.assertEqual(self._search("comedy"), [])
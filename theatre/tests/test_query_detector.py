@@ -0,0 +1,116 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    Reservation,
+    TheatreHall,
+    Play,
+    Performance,
+    Ticket
+)
+from theatre.query_detector import (
+    NPlusOneQueries,
+    detect_queries,
+    fingerprint,
+)
+from theatre.views import ReservationViewSet
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_literals_and_parameters(self):
+        self.assertEqual(
+            fingerprint(
+                "SELECT * FROM t WHERE a = %s AND b = 'x''y'\n  LIMIT 21"
+            ),
+            "SELECT * FROM t WHERE a = ? AND b = ? LIMIT ?",
+        )
+
+    def test_in_lists_and_values_collapse(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id IN (%s)"),
+        )
+        self.assertEqual(
+            fingerprint("INSERT INTO t VALUES (%s, %s), (%s, %s)"),
+            "INSERT INTO t VALUES (?, ?), ...",
+        )
+
+    def test_identifiers_are_kept(self):
+        self.assertEqual(
+            fingerprint('SELECT U0."id" FROM "t2" U0'),
+            'SELECT U0."id" FROM "t2" U0',
+        )
+
+
+@override_settings(THEATRE_QUERY_DETECTOR="raise")
+class ReservationListDetectorTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        hall = TheatreHall.objects.create(
+            name="TestHall", rows=10, seats_in_row=10
+        )
+        for number in range(5):
+            performance = Performance.objects.create(
+                play=Play.objects.create(
+                    title=f"Play{number}", description="PlayDescription"
+                ),
+                theatre_hall=hall,
+                show_time=f"2024-06-0{number + 1}T19:00:00Z",
+            )
+            Ticket.objects.create(
+                row=1,
+                seat=1,
+                performance=performance,
+                reservation=Reservation.objects.create(user=self.user),
+            )
+
+    def test_reservation_list_has_no_n_plus_one(self):
+        res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(len(res.data["results"]), 5)
+
+    def test_catches_n_plus_one_without_prefetch(self):
+        with mock.patch.object(
+            ReservationViewSet, "queryset", Reservation.objects.all()
+        ):
+            with self.assertRaisesRegex(
+                NPlusOneQueries,
+                r"N\+1 queries in ReservationViewSet\.list: 5x SELECT",
+            ):
+                self.client.get(RESERVATION_URL)
+
+    @override_settings(THEATRE_QUERY_DETECTOR="log")
+    def test_log_mode(self):
+        with mock.patch.object(
+            ReservationViewSet, "queryset", Reservation.objects.all()
+        ):
+            with self.assertLogs("theatre.query_detector", "WARNING") as logs:
+                res = self.client.get(RESERVATION_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("ReservationViewSet.list", logs.output[0])
+
+    @override_settings(THEATRE_SLOW_QUERY_MS=0)
+    def test_slow_queries_are_logged_with_the_view(self):
+        with self.assertLogs("theatre.query_detector", "WARNING") as logs:
+            self.client.get(RESERVATION_URL)
+
+        self.assertIn("Slow query", logs.output[0])
+        self.assertIn("ReservationViewSet.list", logs.output[0])
+
+    def test_detect_queries_outside_requests(self):
+        with self.assertRaises(NPlusOneQueries):
+            with detect_queries():
+                for reservation in Reservation.objects.all():
+                    list(reservation.tickets.all())
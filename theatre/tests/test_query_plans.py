@@ -0,0 +1,231 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    TheatreHall,
+    Genre,
+    Actor,
+    Play,
+    Performance,
+    Reservation,
+    Ticket
+)
+from theatre.urls import router
+
+
+INDEX_SCANS = ("Index Scan", "Index Only Scan")
+LARGE_TABLE_ROWS = 10_000
+
+
+def full_scans(plan):
+    """
+    Names of the tables an EXPLAIN (FORMAT JSON) plan reads in full:
+    sequential scans and index scans that filter rows without any index
+    condition, walking the whole index to find them
+    """
+    tables = []
+    if plan["Node Type"] == "Seq Scan" or (
+        plan["Node Type"] in INDEX_SCANS
+        and "Filter" in plan
+        and "Index Cond" not in plan
+    ):
+        tables.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables.extend(full_scans(child))
+    return tables
+
+
+def routed_list_names():
+    """Namespaced names of the router's list endpoints"""
+    return sorted(
+        {
+            f"theatre:{pattern.name}"
+            for pattern in router.urls
+            if pattern.name.endswith("-list")
+        }
+    )
+
+
+class QueryPlanMixin:
+    """
+    Runs list endpoints and EXPLAINs every SELECT they issue, failing on
+    full scans of the app tables. With enable_seqscan off the planner
+    only picks one when no index can serve the query, which makes the
+    check independent of how much data is seeded; with the planner's
+    defaults only scans of large tables count
+    """
+
+    enable_seqscan = False
+
+    @staticmethod
+    def seed(plays, performances_per_play, reservations):
+        user = get_user_model().objects.create_user(
+            "plans@test.com", "testpass"
+        )
+        halls = TheatreHall.objects.bulk_create(
+            TheatreHall(name=f"Hall{number}", rows=20, seats_in_row=20)
+            for number in range(5)
+        )
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"Genre{number}") for number in range(10)
+        )
+        actors = Actor.objects.bulk_create(
+            Actor(first_name=f"First{number}", last_name=f"Last{number}")
+            for number in range(50)
+        )
+        plays = Play.objects.bulk_create(
+            Play(title=f"Play{number}", description="Description")
+            for number in range(plays)
+        )
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(play=play, genre=genres[index % 10])
+            for index, play in enumerate(plays)
+        )
+        Play.actors.through.objects.bulk_create(
+            Play.actors.through(play=play, actor=actors[(index + step) % 50])
+            for index, play in enumerate(plays)
+            for step in range(3)
+        )
+
+        start = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+        performances = Performance.objects.bulk_create(
+            (
+                Performance(
+                    play=plays[number % len(plays)],
+                    theatre_hall=halls[number % len(halls)],
+                    show_time=start + timedelta(hours=3 * number),
+                )
+                for number in range(len(plays) * performances_per_play)
+            ),
+            batch_size=5000,
+        )
+        reservations = Reservation.objects.bulk_create(
+            (Reservation(user=user) for _ in range(reservations)),
+            batch_size=5000,
+        )
+        Ticket.objects.bulk_create(
+            (
+                Ticket(
+                    row=1 + index // 20 % 20,
+                    seat=1 + index % 20,
+                    performance=performances[index // 400],
+                    reservation=reservation,
+                )
+                for index, reservation in enumerate(reservations)
+            ),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        return {
+            "user": user,
+            "play": plays[len(plays) // 2],
+            "genre": genres[3],
+            "actors": actors[:2],
+            "date": performances[len(performances) // 2].show_time.date(),
+        }
+
+    @classmethod
+    def list_endpoints(cls, seeded):
+        actor_ids = ",".join(str(actor.id) for actor in seeded["actors"])
+        return [
+            *((name, {}) for name in routed_list_names()),
+            ("theatre:play-list", {"genres": str(seeded["genre"].id)}),
+            ("theatre:play-list", {"actors_all": actor_ids}),
+            ("theatre:performance-list", {"play": str(seeded["play"].id)}),
+            (
+                "theatre:performance-list",
+                {"date": seeded["date"].isoformat()},
+            ),
+        ]
+
+    def full_scans_of(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        scanned = set()
+        with connection.cursor() as cursor:
+            if self.enable_seqscan:
+                cursor.execute(
+                    "SELECT relname FROM pg_class WHERE reltuples >= %s",
+                    [LARGE_TABLE_ROWS],
+                )
+                checked = {table for table, in cursor.fetchall()}
+            cursor.execute(
+                f"SET LOCAL enable_seqscan = "
+                f"{'on' if self.enable_seqscan else 'off'}"
+            )
+            for query in context.captured_queries:
+                if not query["sql"].lstrip().upper().startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {query['sql']}")
+                (plan,), = cursor.fetchone()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scanned.update(
+                    table
+                    for table in full_scans(plan["Plan"])
+                    if table.startswith("theatre_")
+                    and (not self.enable_seqscan or table in checked)
+                )
+            cursor.execute("RESET enable_seqscan")
+        return scanned
+
+    def check_list_endpoints(self, seeded):
+        self.client = APIClient()
+        self.client.force_authenticate(seeded["user"])
+
+        for name, params in self.list_endpoints(seeded):
+            with self.subTest(endpoint=name, params=params):
+                self.assertEqual(
+                    self.full_scans_of(reverse(name), params), set()
+                )
+
+
+class ListQueryPlanTests(QueryPlanMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeded = cls.seed(
+            plays=40, performances_per_play=5, reservations=400
+        )
+
+    def test_list_endpoints_do_not_scan_tables(self):
+        self.check_list_endpoints(self.seeded)
+
+    def test_full_scans(self):
+        plan = {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "theatre_play"},
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "theatre_genre",
+                    "Index Cond": "(id = theatre_play_genres.genre_id)",
+                },
+                {
+                    "Node Type": "Limit",
+                    "Plans": [
+                        {
+                            "Node Type": "Index Scan",
+                            "Relation Name": "theatre_performance",
+                            "Filter": "((show_time)::date = '2024-01-01')",
+                        }
+                    ],
+                },
+            ],
+        }
+
+        self.assertEqual(
+            full_scans(plan), ["theatre_play", "theatre_performance"]
+        )
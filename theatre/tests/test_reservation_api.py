@@ -1,10 +1,18 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from theatre.models import Reservation, TheatreHall, Play, Performance
+from theatre.models import (
+    Reservation,
+    TheatreHall,
+    Play,
+    Performance,
+    Ticket
+)
 from theatre.serializers import ReservationListSerializer
 
 
@@ -66,3 +74,107 @@ class AuthenticatedReservationApiTests(TestCase):
 
         res = self.client.post(RESERVATION_URL, payload, format="json")
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def _create_reservations(self, count, tickets_per_reservation):
+        for number in range(count):
+            reservation = Reservation.objects.create(user=self.user)
+            for seat in range(1, tickets_per_reservation + 1):
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    reservation=reservation,
+                    performance=Performance.objects.create(
+                        play=Play.objects.create(
+                            title=f"Play{number}-{seat}",
+                            description="PlayDescription",
+                        ),
+                        theatre_hall=TheatreHall.objects.create(
+                            name=f"Hall{number}-{seat}",
+                            rows=10,
+                            seats_in_row=10,
+                        ),
+                        show_time="2024-06-07T00:00:00Z",
+                    ),
+                )
+
+    def test_list_query_count_does_not_depend_on_page_size(self):
+        self._create_reservations(2, 1)
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(RESERVATION_URL)
+
+        self._create_reservations(8, 8)
+        with CaptureQueriesContext(connection) as full_page:
+            res = self.client.get(RESERVATION_URL, {"page_size": 10})
+
+        self.assertEqual(len(res.data["results"]), 10)
+        self.assertEqual(
+            sum(len(result["tickets"]) for result in res.data["results"]),
+            66,
+        )
+        self.assertEqual(len(small_page), 2)
+        self.assertEqual(len(full_page), len(small_page))
+
+
+class ReservationTicketsValidationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        theatre_hall = TheatreHall.objects.create(
+            name="TestHall", rows=10, seats_in_row=10
+        )
+        play = Play.objects.create(
+            title="PlayTitle",
+            description="PlayDescription"
+        )
+        self.performance = Performance.objects.create(
+            play=play,
+            theatre_hall=theatre_hall,
+            show_time="2024-06-07T00:00:00Z"
+        )
+
+    def _reserve(self, tickets):
+        return self.client.post(
+            RESERVATION_URL, {"tickets": tickets}, format="json"
+        )
+
+    def _tickets(self, places):
+        return [
+            {"row": row, "seat": seat, "performance": self.performance.id}
+            for row, seat in places
+        ]
+
+    def test_reservation_query_count_does_not_depend_on_tickets(self):
+        with CaptureQueriesContext(connection) as one_ticket:
+            res = self._reserve(self._tickets([(1, 1)]))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        places = [(row, seat) for row in range(2, 7) for seat in range(1, 11)]
+        with CaptureQueriesContext(connection) as fifty_tickets:
+            res = self._reserve(self._tickets(places))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(len(one_ticket), 11)
+        self.assertEqual(len(fifty_tickets), len(one_ticket))
+        self.assertEqual(Ticket.objects.count(), 51)
+
+    def test_reservation_reports_all_ticket_errors(self):
+        self._reserve(self._tickets([(1, 1)]))
+
+        res = self._reserve(
+            self._tickets([(1, 1), (2, 2), (11, 1), (2, 2)])
+            + [{"row": 1, "seat": 1, "performance": 0}]
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.data["tickets"]
+        self.assertEqual(len(errors), 5)
+        self.assertIn("already taken", errors[0]["seat"][0])
+        self.assertEqual(errors[1], {})
+        self.assertIn("row", errors[2])
+        self.assertIn("more than once", errors[3]["seat"][0])
+        self.assertIn("performance", errors[4])
+        self.assertEqual(Ticket.objects.count(), 1)
@@ -0,0 +1,132 @@
+import csv
+import json
+from datetime import datetime, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket
+)
+
+EXPORT_URL = reverse("theatre:reservation-export")
+
+
+class ReservationExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(
+                title="Hamlet, Prince", description="Description"
+            ),
+            theatre_hall=TheatreHall.objects.create(
+                name="Blue", rows=10, seats_in_row=10
+            ),
+            show_time="2024-06-07T19:00:00Z",
+        )
+        self.reservations = []
+        for day, seats in ((1, (1, 2)), (2, (3,)), (3, (4,))):
+            reservation = Reservation.objects.create(user=self.user)
+            Reservation.objects.filter(id=reservation.id).update(
+                created_at=datetime(2024, 5, day, 23, tzinfo=timezone.utc)
+            )
+            for seat in seats:
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    performance=self.performance,
+                    reservation=reservation,
+                )
+            self.reservations.append(reservation)
+
+    def _export(self, **params):
+        res = self.client.get(EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        return b"".join(res.streaming_content).decode()
+
+    def test_export_requires_admin(self):
+        client = APIClient()
+        self.assertEqual(
+            client.get(EXPORT_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+        client.force_authenticate(self.user)
+        self.assertEqual(
+            client.get(EXPORT_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    def test_export_json_lines(self):
+        lines = self._export().splitlines()
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(
+            json.loads(lines[0]),
+            {
+                "reservation_id": self.reservations[0].id,
+                "created_at": "2024-05-01T23:00:00Z",
+                "user_email": "test@test.com",
+                "ticket_id": Ticket.objects.get(seat=1).id,
+                "row": 1,
+                "seat": 1,
+                "performance_id": self.performance.id,
+                "show_time": "2024-06-07T19:00:00Z",
+                "play_title": "Hamlet, Prince",
+                "theatre_hall_name": "Blue",
+            },
+        )
+
+    def test_export_csv(self):
+        res = self.client.get(EXPORT_URL, {"output": "csv"})
+        rows = list(
+            csv.DictReader(
+                StringIO(b"".join(res.streaming_content).decode())
+            )
+        )
+
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn("reservations.csv", res["Content-Disposition"])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[3]["seat"], "4")
+        self.assertEqual(rows[0]["play_title"], "Hamlet, Prince")
+        self.assertEqual(rows[0]["created_at"], "2024-05-01T23:00:00+00:00")
+
+    def test_export_date_range(self):
+        lines = self._export(date_from="2024-05-02", date_to="2024-05-02")
+
+        reservation_ids = [
+            json.loads(line)["reservation_id"] for line in lines.splitlines()
+        ]
+        self.assertEqual(reservation_ids, [self.reservations[1].id])
+
+    def test_export_invalid_params(self):
+        res = self.client.get(EXPORT_URL, {"output": "xml"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(
+            EXPORT_URL, {"date_from": "2024-05-02", "date_to": "2024-05-01"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_uses_one_query_across_chunks(self):
+        with mock.patch("theatre.exports.EXPORT_CHUNK_SIZE", 2):
+            with self.assertNumQueries(1):
+                lines = self._export().splitlines()
+
+        self.assertEqual(len(lines), 4)
@@ -0,0 +1,386 @@
+import random
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    SeatHold,
+)
+from theatre.seat_holds import (
+    BaseSeatHoldStore,
+    InMemorySeatHoldStore,
+    DatabaseSeatHoldStore,
+    SeatHoldConflict,
+    get_seat_hold_store,
+)
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+CONFIRM_HOLD_URL = reverse("theatre:reservation-confirm-hold")
+RELEASE_HOLD_URL = reverse("theatre:reservation-release-hold")
+HOLD_DURATION = timedelta(minutes=10)
+
+
+def sample_performance(**params):
+    theatre_hall = TheatreHall.objects.create(
+        name="TestHall", rows=10, seats_in_row=10
+    )
+
+    play = Play.objects.create(
+        title="PlayTitle",
+        description="PlayDescription"
+    )
+
+    defaults = {
+        "play": play,
+        "theatre_hall": theatre_hall,
+        "show_time": "2024-06-07T00:00:00Z"
+    }
+
+    defaults.update(params)
+
+    return Performance.objects.create(**defaults)
+
+
+def hold_url(performance_id):
+    return reverse("theatre:performance-hold", args=[performance_id])
+
+
+def hammer_seat_holds(store, performance, users, attempts, places):
+    """
+    Hold random single seats of the performance from a thread per user,
+    return holds per seat, number of conflicts and elapsed seconds
+    """
+    holds_by_place = {place: [] for place in places}
+    conflicts = []
+    lock = threading.Lock()
+
+    def buyer(user_id, seed):
+        rnd = random.Random(seed)
+        try:
+            for _ in range(attempts):
+                place = rnd.choice(places)
+                try:
+                    hold = store.hold(
+                        performance.id, [place], user_id, HOLD_DURATION
+                    )
+                except SeatHoldConflict:
+                    with lock:
+                        conflicts.append(place)
+                else:
+                    with lock:
+                        holds_by_place[place].append(hold.token)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=buyer, args=(user.id, seed))
+        for seed, user in enumerate(users)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return holds_by_place, len(conflicts), time.perf_counter() - start
+
+
+class BaseSeatHoldStoreTests(SimpleTestCase):
+    def test_incomplete_store_cannot_be_created(self):
+        class HoldOnlyStore(BaseSeatHoldStore):
+            def hold(self, performance_id, places, user_id, duration):
+                pass
+
+        with self.assertRaisesRegex(TypeError, "held_by_others"):
+            HoldOnlyStore()
+
+
+class InMemorySeatHoldStoreTests(TestCase):
+    store_class = InMemorySeatHoldStore
+
+    def setUp(self):
+        self.store = self.store_class()
+        self.performance = sample_performance()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpass"
+        )
+
+    def test_hold_and_get(self):
+        hold = self.store.hold(
+            self.performance.id, [(1, 1), (1, 2)], self.user.id, HOLD_DURATION
+        )
+
+        self.assertEqual(self.store.get(hold.token), hold)
+        self.assertEqual(hold.seats, [
+            {"row": 1, "seat": 1}, {"row": 1, "seat": 2}
+        ])
+
+    def test_conflicting_hold(self):
+        self.store.hold(
+            self.performance.id, [(1, 1)], self.user.id, HOLD_DURATION
+        )
+
+        with self.assertRaises(SeatHoldConflict) as context:
+            self.store.hold(
+                self.performance.id,
+                [(1, 2), (1, 1)],
+                self.other_user.id,
+                HOLD_DURATION,
+            )
+
+        self.assertEqual(context.exception.places, [(1, 1)])
+        self.assertEqual(
+            self.store.held_by_others(
+                self.performance.id, [(1, 1), (1, 2)], self.other_user.id
+            ),
+            [(1, 1)],
+        )
+
+    def test_expired_hold_frees_seats(self):
+        hold = self.store.hold(
+            self.performance.id,
+            [(1, 1)],
+            self.user.id,
+            timedelta(seconds=-1),
+        )
+
+        self.assertIsNone(self.store.get(hold.token))
+        self.store.hold(
+            self.performance.id, [(1, 1)], self.other_user.id, HOLD_DURATION
+        )
+
+    def test_release(self):
+        hold = self.store.hold(
+            self.performance.id, [(1, 1)], self.user.id, HOLD_DURATION
+        )
+
+        self.store.release(hold.token)
+
+        self.assertIsNone(self.store.get(hold.token))
+        self.assertEqual(
+            self.store.held_by_others(
+                self.performance.id, [(1, 1)], self.other_user.id
+            ),
+            [],
+        )
+
+
+class DatabaseSeatHoldStoreTests(InMemorySeatHoldStoreTests):
+    store_class = DatabaseSeatHoldStore
+
+    def test_conflicting_hold_creates_nothing(self):
+        self.store.hold(
+            self.performance.id, [(1, 1)], self.user.id, HOLD_DURATION
+        )
+
+        with self.assertRaises(SeatHoldConflict):
+            self.store.hold(
+                self.performance.id,
+                [(1, 2), (1, 1)],
+                self.other_user.id,
+                HOLD_DURATION,
+            )
+
+        self.assertEqual(SeatHold.objects.count(), 1)
+
+    def _hold_with_vanishing_conflicts(self, conflicts):
+        """Hold (1, 1) with the first inserts failing on a gone hold"""
+        bulk_create = SeatHold.objects.bulk_create
+        calls = []
+
+        def conflicting_bulk_create(seat_holds):
+            calls.append(seat_holds)
+            if len(calls) <= conflicts:
+                raise IntegrityError
+            return bulk_create(seat_holds)
+
+        with mock.patch.object(
+            SeatHold.objects, "bulk_create", conflicting_bulk_create
+        ):
+            hold = self.store.hold(
+                self.performance.id, [(1, 1)], self.user.id, HOLD_DURATION
+            )
+        return hold, len(calls)
+
+    def test_hold_retries_when_the_conflicting_hold_is_gone(self):
+        hold, calls = self._hold_with_vanishing_conflicts(1)
+
+        self.assertEqual(calls, 2)
+        self.assertEqual(self.store.get(hold.token), hold)
+
+    def test_repeated_conflict_reports_requested_places(self):
+        with self.assertRaises(SeatHoldConflict) as conflict:
+            self._hold_with_vanishing_conflicts(2)
+
+        self.assertEqual(conflict.exception.places, [(1, 1)])
+        self.assertEqual(SeatHold.objects.count(), 0)
+
+
+@override_settings(
+    THEATRE_SEAT_HOLD_STORE="theatre.seat_holds.InMemorySeatHoldStore"
+)
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.other_client = APIClient()
+        self.other_client.force_authenticate(
+            get_user_model().objects.create_user(
+                "other@test.com",
+                "testpass",
+            )
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance()
+        get_seat_hold_store.cache_clear()
+
+    def _hold(self, client, *places):
+        return client.post(
+            hold_url(self.performance.id),
+            {"seats": [{"row": row, "seat": seat} for row, seat in places]},
+            format="json",
+        )
+
+    def test_hold_seats(self):
+        res = self._hold(self.client, (1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["performance"], self.performance.id)
+        self.assertEqual(
+            res.data["seats"],
+            [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+        )
+
+    def test_hold_held_seats_conflict(self):
+        self._hold(self.client, (1, 1))
+
+        res = self._hold(self.other_client, (1, 2), (1, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["seats"], [{"row": 1, "seat": 1}])
+
+    def test_hold_taken_seats_conflict(self):
+        self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"row": 2, "seat": 2, "performance": self.performance.id}
+            ]},
+            format="json",
+        )
+
+        res = self._hold(self.other_client, (2, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_hold_invalid_seats(self):
+        res = self._hold(self.client, (11, 1))
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self._hold(self.client, (1, 1), (1, 1))
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_confirm_hold_creates_reservation(self):
+        token = self._hold(self.client, (3, 1), (3, 2)).data["token"]
+
+        res = self.client.post(
+            CONFIRM_HOLD_URL, {"token": token}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        reservation = Reservation.objects.get(id=res.data["id"])
+        self.assertEqual(reservation.user, self.user)
+        self.assertEqual(
+            list(reservation.tickets.values_list("row", "seat")),
+            [(3, 1), (3, 2)],
+        )
+
+        res = self.client.post(
+            CONFIRM_HOLD_URL, {"token": token}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_confirm_other_users_hold_forbidden(self):
+        token = self._hold(self.client, (3, 1)).data["token"]
+
+        res = self.other_client.post(
+            CONFIRM_HOLD_URL, {"token": token}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_reserve_seat_held_by_other_user_rejected(self):
+        self._hold(self.client, (4, 4))
+
+        res = self.other_client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"row": 4, "seat": 4, "performance": self.performance.id}
+            ]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_release_hold(self):
+        token = self._hold(self.client, (5, 5)).data["token"]
+
+        res = self.client.post(
+            RELEASE_HOLD_URL, {"token": token}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        res = self._hold(self.other_client, (5, 5))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+
+class SeatHoldConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        self.performance = sample_performance()
+        self.users = [
+            get_user_model().objects.create_user(
+                f"buyer{number}@test.com", "testpass"
+            )
+            for number in range(8)
+        ]
+        self.places = [(1, seat) for seat in range(1, 11)]
+
+    def _assert_no_seat_held_twice(self, store):
+        holds_by_place, conflicts, _ = hammer_seat_holds(
+            store, self.performance, self.users, 20, self.places
+        )
+
+        for place, tokens in holds_by_place.items():
+            self.assertLessEqual(len(tokens), 1, place)
+        held = sum(len(tokens) for tokens in holds_by_place.values())
+        self.assertEqual(held + conflicts, len(self.users) * 20)
+
+    def test_in_memory_store_under_contention(self):
+        self._assert_no_seat_held_twice(InMemorySeatHoldStore())
+
+    def test_database_store_under_contention(self):
+        self._assert_no_seat_held_twice(DatabaseSeatHoldStore())
+        self.assertLessEqual(SeatHold.objects.count(), len(self.places))
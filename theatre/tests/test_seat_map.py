@@ -0,0 +1,328 @@
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    TheatreHall,
+    Play,
+    Performance,
+    Reservation,
+    Ticket
+)
+from theatre.seat_map import SeatMap
+from theatre.views import PerformanceViewSet
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def sample_performance(**params):
+    theatre_hall = TheatreHall.objects.create(
+        name="TestHall", rows=10, seats_in_row=10
+    )
+
+    play = Play.objects.create(
+        title="PlayTitle",
+        description="PlayDescription"
+    )
+
+    defaults = {
+        "play": play,
+        "theatre_hall": theatre_hall,
+        "show_time": "2024-06-07T00:00:00Z"
+    }
+
+    defaults.update(params)
+
+    return Performance.objects.create(**defaults)
+
+
+def detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+class SeatMapTests(TestCase):
+    def test_empty_seat_map(self):
+        seats = SeatMap(3, 4)
+
+        self.assertEqual(seats.capacity, 12)
+        self.assertEqual(seats.available, 12)
+        self.assertEqual(seats.taken_places(), [])
+        self.assertTrue(seats.is_free(3, 4))
+
+    def test_take_and_release_seats(self):
+        seats = SeatMap(3, 4)
+
+        seats.take(2, 3)
+        seats.take(1, 4)
+        seats.take(3, 1)
+
+        self.assertTrue(seats.is_taken(2, 3))
+        self.assertEqual(seats.available, 9)
+        self.assertEqual(
+            seats.taken_places(),
+            [
+                {"row": 1, "seat": 4},
+                {"row": 2, "seat": 3},
+                {"row": 3, "seat": 1},
+            ],
+        )
+
+        seats.release(2, 3)
+
+        self.assertTrue(seats.is_free(2, 3))
+        self.assertEqual(seats.available, 10)
+
+    def test_seat_map_round_trips_through_bytes(self):
+        seats = SeatMap(40, 50)
+        seats.take(40, 50)
+        seats.take(1, 1)
+
+        restored = SeatMap(40, 50, seats.to_bytes())
+
+        self.assertEqual(restored.taken_places(), seats.taken_places())
+        self.assertEqual(len(seats.to_bytes()), 250)
+
+    def test_seat_out_of_range(self):
+        seats = SeatMap(3, 4)
+
+        with self.assertRaises(ValueError):
+            seats.take(4, 1)
+
+        with self.assertRaises(ValueError):
+            seats.is_taken(1, 0)
+
+
+class PerformanceSeatMapSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance()
+
+    def _reserve(self, *places):
+        payload = {
+            "tickets": [
+                {"row": row, "seat": seat, "performance": self.performance.pk}
+                for row, seat in places
+            ]
+        }
+        return self.client.post(RESERVATION_URL, payload, format="json")
+
+    def test_reservation_takes_seats(self):
+        res = self._reserve((1, 2), (3, 4))
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.performance.refresh_from_db()
+        seats = self.performance.seats
+
+        self.assertTrue(seats.is_taken(1, 2))
+        self.assertTrue(seats.is_taken(3, 4))
+        self.assertEqual(seats.available, 98)
+
+    def test_reserving_taken_seat_is_rejected(self):
+        self._reserve((1, 2))
+
+        res = self._reserve((5, 5), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.performance.refresh_from_db()
+        self.assertTrue(self.performance.seats.is_free(5, 5))
+
+    def test_deleting_reservation_releases_seats(self):
+        self._reserve((1, 2), (3, 4))
+
+        Reservation.objects.get().delete()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats.taken_places(), [])
+
+    def test_saving_ticket_takes_seat(self):
+        reservation = Reservation.objects.create(user=self.user)
+
+        Ticket.objects.create(
+            row=7, seat=8, performance=self.performance,
+            reservation=reservation
+        )
+
+        self.performance.refresh_from_db()
+        self.assertTrue(self.performance.seats.is_taken(7, 8))
+
+    def test_changing_hall_rebuilds_seat_map(self):
+        self._reserve((2, 2))
+        hall = self.performance.theatre_hall
+
+        hall.seats_in_row = 20
+        hall.save()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            self.performance.seats.taken_places(), [{"row": 2, "seat": 2}]
+        )
+
+    def test_renaming_hall_keeps_seat_maps(self):
+        self._reserve((2, 2))
+        hall = self.performance.theatre_hall
+        self.performance.refresh_from_db()
+        updated_at = self.performance.updated_at
+
+        hall.name = "Renamed"
+        with CaptureQueriesContext(connection) as context:
+            hall.save()
+
+        for query in context.captured_queries:
+            self.assertNotIn("theatre_ticket", query["sql"])
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.updated_at, updated_at)
+
+    def test_shrinking_hall_below_sold_tickets_is_rejected(self):
+        self.user.is_staff = True
+        self.user.save()
+        self._reserve((9, 2))
+        hall = self.performance.theatre_hall
+
+        res = self.client.patch(
+            reverse("theatre:theatrehall-detail", args=[hall.id]),
+            {"rows": 8},
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        hall.rows = 8
+        with self.assertRaises(ValidationError):
+            hall.save()
+
+        hall.refresh_from_db()
+        self.assertEqual(hall.rows, 10)
+
+    def test_shrinking_hall_around_sold_tickets(self):
+        self._reserve((2, 2))
+        hall = self.performance.theatre_hall
+
+        hall.rows = 5
+        hall.save()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.seats.capacity, 50)
+        self.assertEqual(self.performance.tickets_sold, 1)
+
+    def test_migration_skips_tickets_outside_of_the_hall(self):
+        migration = import_module(
+            "theatre.migrations.0012_performance_seat_map"
+        )
+        self._reserve((2, 2), (9, 10))
+        # Halls could be shrunk below sold tickets before the grid check
+        TheatreHall.objects.update(rows=5)
+        Performance.objects.update(seat_map=b"")
+
+        migration.fill_seat_maps(apps, None)
+
+        expected = SeatMap(5, 10)
+        expected.take(2, 2)
+        self.performance.refresh_from_db()
+        self.assertEqual(bytes(self.performance.seat_map), expected.to_bytes())
+
+    def test_detail_taken_places_without_ticket_query(self):
+        self._reserve((2, 1), (1, 2))
+
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(detail_url(self.performance.id))
+
+        for query in context.captured_queries:
+            self.assertNotIn("theatre_ticket", query["sql"])
+        self.assertEqual(
+            res.data["taken_places"],
+            [{"row": 1, "seat": 2}, {"row": 2, "seat": 1}],
+        )
+
+    def test_tickets_available_uses_seat_map(self):
+        self._reserve((1, 1), (1, 2), (1, 3))
+
+        performance = PerformanceViewSet.queryset.get(
+            id=self.performance.id
+        )
+
+        self.assertEqual(performance.tickets_available, 97)
+
+
+class TicketsSoldCounterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.performance = sample_performance()
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def _create_tickets(self, *places):
+        Ticket.objects.bulk_create(
+            Ticket(
+                row=row,
+                seat=seat,
+                performance=self.performance,
+                reservation=self.reservation,
+            )
+            for row, seat in places
+        )
+
+    def test_occupy_and_release_update_counter(self):
+        places = [(self.performance.id, 1, 1), (self.performance.id, 1, 2)]
+
+        Performance.objects.occupy_seats(places, ValidationError)
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 2)
+
+        Performance.objects.release_seats(places[:1])
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 1)
+
+    def test_deleting_performance_tickets_updates_counter(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": 1, "performance": self.performance.id},
+                    {"row": 1, "seat": 2, "performance": self.performance.id},
+                ]
+            },
+            format="json",
+        )
+
+        Ticket.objects.filter(seat=1).delete()
+
+        performance = PerformanceViewSet.queryset.get(id=self.performance.id)
+        self.assertEqual(performance.tickets_sold, 1)
+        self.assertEqual(performance.tickets_available, 99)
+
+    def test_reconcile_tickets_sold_fixes_drift(self):
+        self._create_tickets((1, 1), (2, 2), (3, 3))
+        out = StringIO()
+
+        call_command("reconcile_tickets_sold", stdout=out)
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 3)
+        self.assertTrue(self.performance.seats.is_taken(2, 2))
+        self.assertIn("Reconciled 1 performances", out.getvalue())
+
+    def test_reconcile_tickets_sold_dry_run(self):
+        self._create_tickets((1, 1))
+
+        call_command("reconcile_tickets_sold", "--dry-run", stdout=StringIO())
+
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.tickets_sold, 0)
@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+PLAY_URL = reverse("theatre:play-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+
+
+class ValuesListParityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "test@test.com",
+                "testpass",
+            )
+        )
+        hall = TheatreHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        actors = [
+            Actor.objects.create(first_name=f"First{number}", last_name="Ü")
+            for number in range(3)
+        ]
+        genres = [
+            Genre.objects.create(name=name)
+            for name in ("Tragedy", "Drama", "Comedy")
+        ]
+        for number in range(5):
+            play = Play.objects.create(
+                title=f"Hamlet {number}",
+                description=f"Prince of Denmark, \"act\" {number}",
+            )
+            play.actors.add(*reversed(actors[:number]))
+            play.genres.add(*genres[number % 3:])
+            Performance.objects.create(
+                play=play,
+                theatre_hall=hall,
+                show_time=f"2024-06-0{number + 1}T19:30:00.250000Z",
+            )
+
+    def _get_pages(self, url, params):
+        pages = []
+        while url:
+            cache.clear()
+            res = self.client.get(url, params)
+            pages.append(res.content)
+            url, params = res.data["next"], None
+        return pages
+
+    def _assert_same_pages(self, url, params=None):
+        params = {"page_size": 2, **(params or {})}
+        with override_settings(THEATRE_VALUES_LIST=False):
+            expected = self._get_pages(url, params)
+        with override_settings(THEATRE_VALUES_LIST=True):
+            pages = self._get_pages(url, params)
+
+        self.assertEqual(len(expected), 3)
+        self.assertEqual(pages, expected)
+
+    def test_play_list_parity(self):
+        self._assert_same_pages(PLAY_URL)
+
+    def test_play_search_parity(self):
+        self._assert_same_pages(PLAY_URL, {"q": "denmark"})
+
+    def test_performance_list_parity(self):
+        self._assert_same_pages(PERFORMANCE_URL)
+
+    @override_settings(THEATRE_VALUES_LIST=True)
+    def test_values_list_issues_one_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(PLAY_URL, {"title": "Hamlet"})
+
+        with self.assertNumQueries(1):
+            self.client.get(PERFORMANCE_URL)
@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 
+from theatre.async_views import async_reads
 from theatre.views import (
     TheatreHallViewSet,
     PerformanceViewSet,
@@ -20,6 +22,10 @@ router.register("actors", ActorViewSet)
 router.register("genres", GenreViewSet)
 
 
-urlpatterns = [path("", include(router.urls))]
+router_urls = router.urls
+if settings.THEATRE_ASYNC_READS:
+    router_urls = async_reads(router_urls)
+
+urlpatterns = [path("", include(router_urls))]
 
 app_name = "theatre"
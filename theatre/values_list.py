@@ -0,0 +1,62 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.response import Response
+
+from theatre.metrics import serialization_timer
+
+
+class ValuesListMixin:
+    """
+    Serve list requests from values() rows when THEATRE_VALUES_LIST is
+    on, the list serializer builds the same representation from the rows
+    through its values_fields and values_to_representation()
+    """
+
+    def _values_to_representation(self, serializer_class, rows):
+        with serialization_timer(self.request):
+            return serializer_class.values_to_representation(rows)
+
+    def list(self, request, *args, **kwargs):
+        if not settings.THEATRE_VALUES_LIST:
+            return super().list(request, *args, **kwargs)
+
+        serializer_class = self.get_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+        # Annotations stay selected, the pagination may order by them
+        rows = queryset.values(
+            *serializer_class.values_fields, *queryset.query.annotations
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                self._values_to_representation(serializer_class, page)
+            )
+
+        return Response(self._values_to_representation(serializer_class, rows))
+
+    async def alist(self, request, *args, **kwargs):
+        if not settings.THEATRE_VALUES_LIST:
+            return await super().alist(request, *args, **kwargs)
+
+        serializer_class = self.get_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(
+            *serializer_class.values_fields, *queryset.query.annotations
+        )
+        # The representation may query related names of the rows
+        to_representation = sync_to_async(
+            partial(self._values_to_representation, serializer_class)
+        )
+
+        page = await self.paginator.apaginate_queryset(
+            rows, request, view=self
+        )
+        if page is not None:
+            return self.get_paginated_response(
+                await to_representation(page)
+            )
+
+        return Response(await to_representation([row async for row in rows]))
@@ -1,55 +1,145 @@
-from datetime import datetime
-
-from django.db.models import F, Count
+from django.conf import settings
+from django.db.models import F, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_cache_control
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
+from rest_framework.fields import BooleanField
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from theatre.async_views import AsyncReadMixin
+from theatre.cache import CatalogCacheMixin
+from theatre.conditional import ConditionalRetrieveMixin
+from theatre.db_routers import ReplicaReadMixin
+from theatre.exports import (
+    EXPORT_OUTPUTS,
+    batched,
+    reservation_export_rows,
+)
+from theatre.metrics import SerializationTimingMixin
 from theatre.models import (
     TheatreHall,
     Genre,
     Actor,
     Play,
     Performance,
-    Reservation
+    Reservation,
+    Ticket,
 )
-from theatre.pagination import ReservationPagination
+from theatre.pagination import (
+    CatalogPagination,
+    GenrePagination,
+    PerformancePagination,
+    PlayPagination,
+    ReservationPagination,
+)
+from theatre.seat_holds import SeatHoldConflict, get_seat_hold_store
 from theatre.serializers import (
     TheatreHallSerializer,
     GenreSerializer,
     ActorSerializer,
+    ActorAutocompleteQuerySerializer,
+    ActorAutocompleteSerializer,
     PlaySerializer,
     PerformanceSerializer,
+    PerformanceBulkSerializer,
     ReservationSerializer,
     ReservationListSerializer,
+    ReservationExportQuerySerializer,
     PlayListSerializer,
+    PerformanceListQuerySerializer,
     PerformanceListSerializer,
-    PerformanceDetailSerializer, PlayImageSerializer, PlayRetrieveSerializer
+    PerformanceDetailSerializer, PlayImageSerializer, PlayRetrieveSerializer,
+    SeatHoldSerializer,
+    SeatHoldTokenSerializer,
+    SeatHoldConfirmSerializer,
+)
+from theatre.swagger_schemas import (
+    actor_autocomplete_schema,
+    play_schema,
+    performance_schema,
+    reservation_export_schema,
 )
-from theatre.swagger_schemas import play_schema, performance_schema
+from theatre.values_list import ValuesListMixin
 
 
-class TheatreHallViewSet(viewsets.ModelViewSet):
+class TheatreHallViewSet(
+    SerializationTimingMixin,
+    CatalogCacheMixin,
+    ReplicaReadMixin,
+    viewsets.ModelViewSet,
+):
     queryset = TheatreHall.objects.all()
     serializer_class = TheatreHallSerializer
+    pagination_class = CatalogPagination
 
 
-class GenreViewSet(viewsets.ModelViewSet):
+class GenreViewSet(
+    SerializationTimingMixin,
+    CatalogCacheMixin,
+    ReplicaReadMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    pagination_class = GenrePagination
 
 
-class ActorViewSet(viewsets.ModelViewSet):
+class ActorViewSet(
+    SerializationTimingMixin,
+    CatalogCacheMixin,
+    ReplicaReadMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
+    pagination_class = CatalogPagination
+
+    def get_serializer_class(self):
+        if self.action == "autocomplete":
+            return ActorAutocompleteSerializer
+
+        return self.serializer_class
+
+    def _autocomplete(self, request):
+        params = ActorAutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        actors = Actor.objects.autocomplete(
+            params.validated_data["q"], params.validated_data["limit"]
+        )
+
+        return Response(self.get_serializer(actors, many=True).data)
+
+    @extend_schema(**actor_autocomplete_schema)
+    @action(methods=["GET"], detail=False)
+    def autocomplete(self, request):
+        """Endpoint for suggesting actors while their name is typed"""
+        response = self._cached_response(self._autocomplete, request)
+        patch_cache_control(
+            response,
+            private=True,
+            max_age=settings.THEATRE_AUTOCOMPLETE_MAX_AGE,
+        )
+        return response
 
 
-class PlayViewSet(viewsets.ModelViewSet):
-    queryset = Play.objects.prefetch_related("genres", "actors")
+class PlayViewSet(
+    SerializationTimingMixin,
+    ConditionalRetrieveMixin,
+    CatalogCacheMixin,
+    ValuesListMixin,
+    AsyncReadMixin,
+    ReplicaReadMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Play.objects.prefetch_names()
     serializer_class = PlaySerializer
+    pagination_class = PlayPagination
+    last_modified_fields = ("updated_at",)
 
     @staticmethod
     def _params_to_ints(qs):
@@ -58,24 +148,34 @@ class PlayViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Retrieve the movies with filters"""
+        search = self.request.query_params.get("q")
         title = self.request.query_params.get("title")
-        genres = self.request.query_params.get("genres")
-        actors = self.request.query_params.get("actors")
 
         queryset = self.queryset
+        if self.action == "list":
+            queryset = Play.objects.with_names().defer("search_vector")
+
+        if search:
+            queryset = queryset.search(search)
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
-        if genres:
-            genres_ids = self._params_to_ints(genres)
-            queryset = queryset.filter(genres__id__in=genres_ids)
+        for field_name in ("genres", "actors"):
+            any_ids = self.request.query_params.get(field_name)
+            all_ids = self.request.query_params.get(f"{field_name}_all")
 
-        if actors:
-            actors_ids = self._params_to_ints(actors)
-            queryset = queryset.filter(actors__id__in=actors_ids)
+            if any_ids:
+                queryset = queryset.with_related(
+                    field_name, self._params_to_ints(any_ids)
+                )
 
-        return queryset.distinct()
+            if all_ids:
+                queryset = queryset.with_related(
+                    field_name, self._params_to_ints(all_ids), match_all=True
+                )
+
+        return queryset
 
     def get_serializer_class(self):
 
@@ -112,33 +212,80 @@ class PlayViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+class PerformanceViewSet(
+    SerializationTimingMixin,
+    ConditionalRetrieveMixin,
+    ValuesListMixin,
+    AsyncReadMixin,
+    ReplicaReadMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Performance.objects.select_related("play", "theatre_hall")
         .annotate(
             tickets_available=(
                     F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
-                    - Count("tickets")
+                    - F("tickets_sold")
             )
         )
     )
     serializer_class = PerformanceSerializer
+    pagination_class = PerformancePagination
+    last_modified_fields = (
+        "updated_at",
+        "play__updated_at",
+        "theatre_hall__updated_at",
+    )
+
+    _list_filters = None
+
+    def get_list_filters(self):
+        """Query params of the list action, validated once per request"""
+        if self._list_filters is None:
+            params = PerformanceListQuerySerializer(
+                data=self.request.query_params
+            )
+            params.is_valid(raise_exception=True)
+            self._list_filters = params.validated_data
+        return self._list_filters
 
     def get_queryset(self):
         queryset = self.queryset
 
-        date = self.request.query_params.get("date")
-        play_id_str = self.request.query_params.get("play")
+        if self.action == "list":
+            filters = self.get_list_filters()
+
+            if "date" in filters:
+                queryset = queryset.on_date(filters["date"])
+
+            queryset = queryset.between_dates(
+                filters.get("date_from"), filters.get("date_to")
+            )
+
+            if filters["upcoming"]:
+                queryset = queryset.upcoming()
 
-        if date:
-            date = datetime.strptime(date, "%Y-%m-%d").date()
-            queryset = queryset.filter(show_time__date=date)
+            if "play" in filters:
+                queryset = queryset.filter(play_id=filters["play"])
 
-        if play_id_str:
-            queryset = queryset.filter(play_id=int(play_id_str))
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                "play__actors", "play__genres"
+            )
 
         return queryset
 
+    def read_from_replica(self, request):
+        """Seat availability of ?fresh=true requests comes from the primary"""
+        if self.action == "list":
+            fresh = self.get_list_filters()["fresh"]
+        else:
+            fresh = (
+                request.query_params.get("fresh")
+                in BooleanField.TRUE_VALUES
+            )
+        return super().read_from_replica(request) and not fresh
+
     def get_serializer_class(self):
         if self.action == "list":
             return PerformanceListSerializer
@@ -146,19 +293,86 @@ class PerformanceViewSet(viewsets.ModelViewSet):
         if self.action == "retrieve":
             return PerformanceDetailSerializer
 
+        if self.action == "hold":
+            return SeatHoldSerializer
+
+        if self.action == "bulk":
+            return PerformanceBulkSerializer
+
         return self.serializer_class
 
     @extend_schema(**performance_schema)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(responses={201: PerformanceSerializer(many=True)})
+    @action(methods=["POST"], detail=False)
+    def bulk(self, request):
+        """Endpoint for scheduling many performances in one request"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        performances = serializer.save()
+
+        return Response(
+            PerformanceSerializer(performances, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        methods=["POST"],
+        detail=True,
+        permission_classes=[IsAuthenticated],
+    )
+    def hold(self, request, pk=None):
+        """Endpoint for temporary holding seats of specific performance"""
+        performance = self.get_object()
+        serializer = self.get_serializer(
+            data=request.data,
+            context={
+                **self.get_serializer_context(),
+                "performance": performance,
+            },
+        )
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            serializer.save()
+        except SeatHoldConflict as error:
+            return Response(
+                {
+                    "detail": "Some of the seats are not available",
+                    "seats": [
+                        {"row": row, "seat": seat}
+                        for row, seat in error.places
+                    ],
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 class ReservationViewSet(
+    SerializationTimingMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
 ):
-    queryset = Reservation.objects.prefetch_related("tickets")
+    queryset = Reservation.objects.prefetch_related(
+        Prefetch(
+            "tickets",
+            queryset=Ticket.objects.select_related(
+                "performance__play", "performance__theatre_hall"
+            ).only(
+                "row",
+                "seat",
+                "reservation",
+                "performance__show_time",
+                "performance__play__title",
+                "performance__theatre_hall__name",
+            ),
+        )
+    )
     serializer_class = ReservationSerializer
     pagination_class = ReservationPagination
     permission_classes = (IsAuthenticated, )
@@ -170,7 +384,57 @@ class ReservationViewSet(
         if self.action == "list":
             return ReservationListSerializer
 
+        if self.action == "confirm_hold":
+            return SeatHoldConfirmSerializer
+
+        if self.action == "release_hold":
+            return SeatHoldTokenSerializer
+
         return self.serializer_class
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @extend_schema(**reservation_export_schema)
+    @action(methods=["GET"], detail=False, permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        Endpoint for streaming tickets of all reservations as JSON Lines
+        or CSV, with memory use independent of the number of rows
+        """
+        params = ReservationExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data.pop("output")
+        render_lines, content_type = EXPORT_OUTPUTS[output]
+
+        response = StreamingHttpResponse(
+            batched(
+                render_lines(reservation_export_rows(**params.validated_data))
+            ),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="reservations.{output}"'
+        )
+        return response
+
+    @action(methods=["POST"], detail=False, url_path="confirm-hold")
+    def confirm_hold(self, request):
+        """Endpoint for turning held seats into a reservation"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reservation = serializer.save()
+
+        return Response(
+            ReservationSerializer(reservation).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(methods=["POST"], detail=False, url_path="release-hold")
+    def release_hold(self, request):
+        """Endpoint for releasing held seats before the hold expires"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        get_seat_hold_store().release(serializer.validated_data["token"])
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
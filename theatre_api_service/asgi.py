@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theatre_api_service.settings")
+os.environ.setdefault("THEATRE_DEBUG_TOOLBAR", "0")
+# Every ASGI request runs its sync code in a new thread, a persistent
+# connection per thread would never be reused
+os.environ.setdefault("POSTGRES_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
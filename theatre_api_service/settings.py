@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "drf_spectacular",
@@ -48,9 +49,19 @@ INSTALLED_APPS = [
 
 AUTH_USER_MODEL = "user.User"
 
+# The toolbar middleware is sync only, it makes Django run every view of
+# an ASGI deployment in a thread
+THEATRE_DEBUG_TOOLBAR = os.environ.get("THEATRE_DEBUG_TOOLBAR", "1") == "1"
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "theatre.metrics.RequestMetricsMiddleware",
+    "theatre.query_detector.QueryDetectorMiddleware",
+    *(
+        ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+        if THEATRE_DEBUG_TOOLBAR
+        else []
+    ),
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -90,7 +101,35 @@ DATABASES = {
         "USER": os.environ["POSTGRES_USER"],
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
-        "PORT": os.environ["POSTGRES_PORT"]
+        "PORT": os.environ["POSTGRES_PORT"],
+        # Seconds a connection is reused across requests, 0 closes it
+        # after every request
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 60)),
+        # Check a reused connection once per request before using it
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("POSTGRES_CONN_HEALTH_CHECKS", "1") == "1"
+        ),
+    }
+}
+
+# Streaming replicas of the default database, comma separated hosts
+for number, host in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")),
+    start=1,
+):
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["theatre.db_routers.ReplicaRouter"]
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "theatre",
     }
 }
 
@@ -172,3 +211,53 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
+
+THEATRE_SEAT_HOLD_STORE = os.environ.get(
+    "THEATRE_SEAT_HOLD_STORE", "theatre.seat_holds.DatabaseSeatHoldStore"
+)
+THEATRE_SEAT_HOLD_MINUTES = int(
+    os.environ.get("THEATRE_SEAT_HOLD_MINUTES", 10)
+)
+
+THEATRE_CATALOG_CACHE_TIMEOUT = int(
+    os.environ.get("THEATRE_CATALOG_CACHE_TIMEOUT", 300)
+)
+
+THEATRE_AUTOCOMPLETE_MAX_AGE = int(
+    os.environ.get("THEATRE_AUTOCOMPLETE_MAX_AGE", 60)
+)
+
+THEATRE_VALUES_LIST = os.environ.get("THEATRE_VALUES_LIST") == "1"
+
+THEATRE_BULK_SCHEDULE_LIMIT = int(
+    os.environ.get("THEATRE_BULK_SCHEDULE_LIMIT", 5000)
+)
+
+THEATRE_METRICS_SAMPLE_RATE = float(
+    os.environ.get("THEATRE_METRICS_SAMPLE_RATE", 0)
+)
+# Bearer token of the /metrics/ scraper, the endpoint is off without it
+THEATRE_METRICS_TOKEN = os.environ.get("THEATRE_METRICS_TOKEN", "")
+
+# "off", "log" or "raise" on N+1 queries in sampled requests
+THEATRE_QUERY_DETECTOR = os.environ.get("THEATRE_QUERY_DETECTOR", "off")
+THEATRE_QUERY_DETECTOR_SAMPLE_RATE = float(
+    os.environ.get("THEATRE_QUERY_DETECTOR_SAMPLE_RATE", 1)
+)
+THEATRE_SLOW_QUERY_MS = float(os.environ.get("THEATRE_SLOW_QUERY_MS", 100))
+THEATRE_N_PLUS_ONE_THRESHOLD = int(
+    os.environ.get("THEATRE_N_PLUS_ONE_THRESHOLD", 5)
+)
+
+# Serve performance and play list/retrieve with async views under ASGI,
+# off by default: with the thread-bound async ORM of Django 5.0 they are
+# not faster than the sync viewsets (see the async reads benchmark)
+THEATRE_ASYNC_READS = os.environ.get("THEATRE_ASYNC_READS") == "1"
+
+# Safe-method catalog requests read from these databases, a user who
+# created a reservation and the catalog after a change read from the
+# primary for THEATRE_REPLICA_PIN_SECONDS
+THEATRE_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+THEATRE_REPLICA_PIN_SECONDS = int(
+    os.environ.get("THEATRE_REPLICA_PIN_SECONDS", 5)
+)
@@ -2,10 +2,11 @@ from rest_framework import generics
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
+from theatre.metrics import SerializationTimingMixin
 from user.serializers import UserSerializer, AuthTokenSerializer
 
 
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(SerializationTimingMixin, generics.CreateAPIView):
     serializer_class = UserSerializer
     permission_classes = ()
 
@@ -15,7 +16,9 @@ class CreateTokenView(ObtainAuthToken):
     serializer_class = AuthTokenSerializer
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(
+    SerializationTimingMixin, generics.RetrieveUpdateAPIView
+):
     serializer_class = UserSerializer
 
     def get_object(self):